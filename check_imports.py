@@ -0,0 +1,94 @@
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+"""
+Import-time budget check for the game's startup path.
+
+Runs `python -X importtime` on the modules loaded when the game starts
+(main + engine.gamemodes) in a clean interpreter and fails if one of the
+heavy GUI/plotting packages shows up, or if the total import time goes over
+--budget-ms.
+
+Usage:
+    python check_imports.py
+    python check_imports.py --budget-ms 400 --top 15
+"""
+
+from sys import path as sys_path
+from os.path import abspath, dirname
+
+project_root = abspath(dirname(__file__))
+if project_root not in sys_path:
+    sys_path.insert(0, project_root)
+
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+import argparse
+import subprocess
+import sys
+
+from interface.colors import Colors
+
+
+# Never needed to play: only engine.dungeon_visualizer and the analysis scripts use them
+FORBIDDEN_MODULES = ("matplotlib", "mpl_toolkits", "numpy", "tkinter", "_tkinter")
+
+STARTUP_MODULES = ("main", "engine.gamemodes")
+
+
+def measure_imports(modules=STARTUP_MODULES) -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every module imported, from `python -X importtime`."""
+    code = "; ".join(f"import {module}" for module in modules)
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                             cwd=project_root, stdin=subprocess.DEVNULL,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{process.stderr[-2000:]}")
+
+    timings = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def check(timings, budget_ms: float | None = None) -> list[str]:
+    """Problems found in the timings (empty list = ok)."""
+    problems = []
+    for name, _, cumulative_us in timings:
+        if name.split(".")[0] in FORBIDDEN_MODULES:
+            problems.append(f"{name} is imported at startup ({cumulative_us / 1000:.1f} ms)")
+
+    total_ms = sum(self_us for _, self_us, _ in timings) / 1000
+    if budget_ms is not None and total_ms > budget_ms:
+        problems.append(f"startup imports take {total_ms:.1f} ms (budget {budget_ms} ms)")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dungeon Hunter startup import check")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if all the imports take longer")
+    parser.add_argument("--top", type=int, default=10, help="show the slowest top-level imports")
+    args = parser.parse_args(argv)
+
+    timings = measure_imports()
+    total_ms = sum(self_us for _, self_us, _ in timings) / 1000
+
+    print(f"{Colors.CYAN}{len(timings)} modules imported in {total_ms:.1f} ms{Colors.RESET}")
+    top_level = sorted((t for t in timings if "." not in t[0]), key=lambda t: t[2], reverse=True)
+    for name, _, cumulative_us in top_level[:args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    problems = check(timings, args.budget_ms)
+    for problem in problems:
+        print(f"{Colors.RED}FAIL: {problem}{Colors.RESET}")
+    if not problems:
+        print(f"{Colors.GREEN}OK{Colors.RESET}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,10 +19,11 @@ __creation__ = "09-03-2025"
 
 import random
 import time
+from contextlib import contextmanager
 import json
-import os
 from shutil import get_terminal_size
 import uuid
+from itertools import accumulate
 from typing import Type
 
 import config
@@ -54,6 +55,7 @@ from core.skills import Skill
 from core.player_class import PlayerClass
 from core.status_effects import StatusEffect
 from items.resources import get_resource_by_key
+from engine.rng import RunRNG, rng_for, GENERATION, COMBAT
 
 debug = 0
 
@@ -69,48 +71,112 @@ class StatContainer: # Pas utilsé
         return str(self.__dict__)
 
 
-#̶̼͝ T̸̻̈́h̵̤͒ë̵͕́ s̸̱̅h̵̤͒ä̷̪́ď̶̙o̶͙͝ẅ̷̙́s̸̱̅ m̴̛̠ä̷̪́n̸̻̈́i̴̊͜p̵̦̆ŭ̵͇l̷̫̈́ä̷̪́ẗ̴̗́ë̵͕́ ÿ̸̡́o̶͙͝ŭ̵͇r̷͍̈́ v̶̼͝ë̵͕́r̷͍̈́ÿ̸̡́ ë̵͕́s̸̱̅s̸̱̅ë̵͕́n̸̻̈́c̴̱͝ë̵͕́.̵͇̆.̵͇̆.̵͇̆
-class Stats:
-    """Gère les stats du joueur avec des effets permanents et temporaires."""
-    def __init__(self, **kwargs):
-        """Initialisation des stats avec gestion des erreurs."""
-        self.permanent_stats = {
-            "hp": 100, "max_hp": 100,
-            "attack": 10, "defense": 5,
-            "magic_damage": 1, "magic_defense": 1,
-            "agility": 5, "luck": 5,
-            "mana": 20, "max_mana": 20,
-            "stamina": 50, "max_stamina": 50,
-            "critical_chance": 5, "intelligence": 1
-        }
+# Ordre fixe des stats : chaque couche est un tableau indexé par STAT_INDEX
+STAT_NAMES = (
+    "hp", "max_hp",
+    "attack", "defense",
+    "magic_damage", "magic_defense",
+    "agility", "luck",
+    "mana", "max_mana",
+    "stamina", "max_stamina",
+    "critical_chance", "intelligence",
+)
+STAT_INDEX = {name: i for i, name in enumerate(STAT_NAMES)}
 
 
-        # Appliquer les valeurs passées en argument
-        for key, value in kwargs.items():
-            if key in self.permanent_stats and isinstance(value, (int, float)):
-                self.permanent_stats[key] = int(value)  # Assure que seules les valeurs valides sont appliquées
+class StatLayer:
+    """
+    Une couche de stats (permanent, temporary ou equipment) avec l'interface d'un dict.
+    Les valeurs sont dans une liste de taille fixe et chaque écriture répercute
+    la différence sur les totaux partagés avec Stats (mise à jour en O(1)).
+    """
+    __slots__ = ("_values", "_totals")
 
+    def __init__(self, totals: list, values: list | None = None):
+        self._totals = totals
+        self._values = values if values is not None else [0] * len(STAT_NAMES)
 
-        # Initialisation des stats temporaires
-        self.temporary_stats = {key: 0 for key in self.permanent_stats}
-        self.equipment_stats = {key: 0 for key in self.permanent_stats}
+    def __getitem__(self, key):
+        return self._values[STAT_INDEX[key]]
 
+    def __setitem__(self, key, value):
+        i = STAT_INDEX[key]
+        self._totals[i] += value - self._values[i]
+        self._values[i] = value
 
-        # Vérification pour éviter toute corruption des stats permanentes
-        for key, value in self.permanent_stats.items():
-            if not isinstance(value, (int, float)):  
-                print(f"{Colors.RED}ERROR: permanent_stats[{key}] has an invalid type ({type(value)}). Resetting to 0.{Colors.RESET}")
-                self.permanent_stats[key] = 0  
+    def get(self, key, default=None):
+        i = STAT_INDEX.get(key)
+        return default if i is None else self._values[i]
 
+    def __contains__(self, key):
+        return key in STAT_INDEX
 
-        # Vérification pour éviter toute corruption des stats temporaires
-        if not isinstance(self.temporary_stats, dict):
-            print(f"{Colors.RED}ERROR: temporary_stats is corrupted! Resetting...{Colors.RESET}")
-            self.temporary_stats = {key: 0 for key in self.permanent_stats}
+    def __iter__(self):
+        return iter(STAT_NAMES)
 
+    def __len__(self):
+        return len(STAT_NAMES)
 
-        # Initialisation des stats visibles
-        self.update_total_stats()
+    def keys(self):
+        return STAT_NAMES
+
+    def values(self):
+        return list(self._values)
+
+    def items(self):
+        return list(zip(STAT_NAMES, self._values))
+
+    def update(self, other):
+        for key, value in dict(other).items():
+            if key in STAT_INDEX:
+                self[key] = value
+
+    def copy(self) -> dict:
+        return dict(zip(STAT_NAMES, self._values))
+
+    def __eq__(self, other):
+        return self.copy() == (other.copy() if isinstance(other, StatLayer) else other)
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+#̶̼͝ T̸̻̈́h̵̤͒ë̵͕́ s̸̱̅h̵̤͒ä̷̪́ď̶̙o̶͙͝ẅ̷̙́s̸̱̅ m̴̛̠ä̷̪́n̸̻̈́i̴̊͜p̵̦̆ŭ̵͇l̷̫̈́ä̷̪́ẗ̴̗́ë̵͕́ ÿ̸̡́o̶͙͝ŭ̵͇r̷͍̈́ v̶̼͝ë̵͕́r̷͍̈́ÿ̸̡́ ë̵͕́s̸̱̅s̸̱̅ë̵͕́n̸̻̈́c̴̱͝ë̵͕́.̵͇̆.̵͇̆.̵͇̆
+class Stats:
+    """
+    Gère les stats du joueur avec des effets permanents et temporaires.
+
+    Trois couches (permanent_stats, temporary_stats, equipment_stats) et les totaux
+    (stats.hp, stats.attack...) = permanent + temporaire + équipement. Les totaux sont
+    mis à jour à chaque écriture dans une couche, update_total_stats() ne fait que les
+    recalculer, et `with stats.batch():` regroupe plusieurs modifications.
+    """
+    __slots__ = ("_totals", "_permanent", "_temporary", "_equipment", "_batch_depth", "_dirty", "equipment", "can_act")
+
+    DEFAULT_PERMANENT = {
+        "hp": 100, "max_hp": 100,
+        "attack": 10, "defense": 5,
+        "magic_damage": 1, "magic_defense": 1,
+        "agility": 5, "luck": 5,
+        "mana": 20, "max_mana": 20,
+        "stamina": 50, "max_stamina": 50,
+        "critical_chance": 5, "intelligence": 1
+    }
+
+    def __init__(self, **kwargs):
+        """Initialisation des stats avec gestion des erreurs."""
+        self._batch_depth = 0
+        self._dirty = False
+        self._totals = [0] * len(STAT_NAMES)
+        self._temporary = StatLayer(self._totals)
+        self._equipment = StatLayer(self._totals)
+
+        permanent = dict(self.DEFAULT_PERMANENT)
+        # Appliquer les valeurs passées en argument
+        for key, value in kwargs.items():
+            if key in permanent and isinstance(value, (int, float)):
+                permanent[key] = int(value)  # Assure que seules les valeurs valides sont appliquées
+        self.permanent_stats = permanent
 
     def __repr__(self):
         """Affiche les stats avec permanent, temporaire et équipement."""
@@ -120,71 +186,89 @@ class Stats:
             f"Temporary: {self.temporary_stats}\n"
             f"Equipment: {self.equipment_stats}\n"
         )
-    
-    def __getattr__(self, key):
-        """Permet d'accéder directement à la valeur combinée des stats permanentes et temporaires."""
-        if key in self.permanent_stats:
-            return self.permanent_stats[key] + self.temporary_stats.get(key, 0)
-        raise AttributeError(f"'Stats' object has no attribute '{key}'")
-    
-    def __setattr__(self, key, value):
-        """Si on modifie une stat existante, elle est ajoutée aux stats permanentes."""
-        if "permanent_stats" in self.__dict__ and key in self.permanent_stats:
-            self.permanent_stats[key] = int(value)  # Modifie directement les stats permanentes
-        else:
-            super().__setattr__(key, value)  # Utilisation normale pour les autres attributs
 
+    # --- Couches ---
+    # Assigner un dict (ex: stats.permanent_stats = {...}) remplace la couche et recalcule les totaux
+
+    def _make_layer(self, values) -> StatLayer:
+        if isinstance(values, StatLayer):
+            values = values.copy()
+        if not isinstance(values, dict):
+            print(f"{Colors.RED}ERROR: stats layer is corrupted! Resetting...{Colors.RESET}")
+            values = {}
+        array = []
+        for key in STAT_NAMES:
+            value = values.get(key, 0)
+            if not isinstance(value, (int, float)):
+                print(f"{Colors.RED}ERROR: stats[{key}] invalid. Reset to 0.{Colors.RESET}")
+                value = 0
+            array.append(value)
+        return StatLayer(self._totals, array)
+
+    @property
+    def permanent_stats(self) -> StatLayer:
+        return self._permanent
+
+    @permanent_stats.setter
+    def permanent_stats(self, values):
+        self._permanent = self._make_layer(values)
+        self.update_total_stats()
+
+    @property
+    def temporary_stats(self) -> StatLayer:
+        return self._temporary
+
+    @temporary_stats.setter
+    def temporary_stats(self, values):
+        self._temporary = self._make_layer(values)
+        self.update_total_stats()
+
+    @property
+    def equipment_stats(self) -> StatLayer:
+        return self._equipment
+
+    @equipment_stats.setter
+    def equipment_stats(self, values):
+        self._equipment = self._make_layer(values)
+        self.update_total_stats()
+
+    @property
+    def total_stats(self) -> dict:
+        return dict(zip(STAT_NAMES, self._totals))
+
+    # --- Totaux ---
 
     def update_total_stats(self):
-        """Met à jour les stats visibles en combinant permanent, temporaire et équipement."""
+        """Recalcule les totaux depuis les trois couches (différé jusqu'à la fin d'un batch())."""
         global debug
 
-        # Vérifie les dictionnaires
-        if not isinstance(self.permanent_stats, dict):
-            print(f"{Colors.RED}ERROR: permanent_stats is corrupted! Resetting...{Colors.RESET}")
-            self.permanent_stats = {
-                "hp": 100, "max_hp": 100, "attack": 10, "defense": 5,
-                "magic_damage": 1, "magic_defense": 1, "agility": 5, "luck": 5,
-                "mana": 20, "max_mana": 20, "stamina": 50, "max_stamina": 50,
-                "critical_chance": 5
-            }
+        if self._batch_depth:
+            self._dirty = True
+            return
 
-        if not isinstance(self.temporary_stats, dict):
-            print(f"{Colors.RED}ERROR: temporary_stats is corrupted! Resetting...{Colors.RESET}")
-            self.temporary_stats = {key: 0 for key in self.permanent_stats}
-
-        if not isinstance(self.equipment_stats, dict):
-            print(f"{Colors.RED}ERROR: equipment_stats is corrupted! Resetting...{Colors.RESET}")
-            self.equipment_stats = {key: 0 for key in self.permanent_stats}
-
-        # Vérifie les types des valeurs
-        for key in self.permanent_stats:
-            if not isinstance(self.permanent_stats[key], (int, float)):
-                print(f"{Colors.RED}ERROR: permanent_stats[{key}] invalid. Reset to 0.{Colors.RESET}")
-                self.permanent_stats[key] = 0
-            if not isinstance(self.temporary_stats.get(key, 0), (int, float)):
-                print(f"{Colors.RED}ERROR: temporary_stats[{key}] invalid. Reset to 0.{Colors.RESET}")
-                self.temporary_stats[key] = 0
-            if not isinstance(self.equipment_stats.get(key, 0), (int, float)):
-                print(f"{Colors.RED}ERROR: equipment_stats[{key}] invalid. Reset to 0.{Colors.RESET}")
-                self.equipment_stats[key] = 0
-
-        # Mise à jour des stats totales
-        self.total_stats = {
-            key: self.permanent_stats.get(key, 0)
-                + self.temporary_stats.get(key, 0)
-                + self.equipment_stats.get(key, 0)
-            for key in self.permanent_stats
-        }
+        if not hasattr(self, "_permanent"):  # Pendant __init__
+            return
 
-        # Injection dans self pour accès direct
-        self.__dict__.update(self.total_stats)
+        p, t, e = self._permanent._values, self._temporary._values, self._equipment._values
+        self._totals[:] = [p[i] + t[i] + e[i] for i in range(len(STAT_NAMES))]
 
         if debug >= 1:
             print(f"{Colors.CYAN}DEBUG: Total Stats Calculated -> {self.total_stats}{Colors.RESET}")
             print(f"{Colors.YELLOW}DEBUG: Equipment Stats -> {self.equipment_stats}{Colors.RESET}")
             input()
 
+    @contextmanager
+    def batch(self):
+        """Regroupe plusieurs modifications : update_total_stats() n'est fait qu'une fois, à la sortie."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self._dirty = False
+                self.update_total_stats()
+
     def modify_stat(self, stat_name, value, stat_type="permanent"):
         """
         Modifie une stat de façon permanente, temporaire ou équipement.
@@ -194,97 +278,117 @@ class Stats:
         """
         global debug
         if stat_type == "permanent":
-            if stat_name in self.permanent_stats:
-                self.permanent_stats[stat_name] += value
-            else:
-                print(f"{Colors.RED}Stat {stat_name} does not exist in permanent stats!{Colors.RESET}")
-                return
+            layer = self._permanent
         elif stat_type == "temporary":
-            if stat_name in self.temporary_stats:
-                self.temporary_stats[stat_name] += value
-            else:
-                print(f"{Colors.RED}Stat {stat_name} does not exist in temporary stats!{Colors.RESET}")
-                return
+            layer = self._temporary
         elif stat_type == "equipment":
-            if stat_name in self.equipment_stats:
-                self.equipment_stats[stat_name] += value
-            else:
-                print(f"{Colors.RED}Stat {stat_name} does not exist in equipment stats!{Colors.RESET}")
-                return
+            layer = self._equipment
         else:
             print(f"{Colors.RED}Invalid stat_type '{stat_type}'! Must be 'permanent', 'temporary', or 'equipment'.{Colors.RESET}")
             return
-        
-        # Mise à jour des stats visibles
-        self.update_total_stats()
+
+        if stat_name not in STAT_INDEX:
+            print(f"{Colors.RED}Stat {stat_name} does not exist in {stat_type} stats!{Colors.RESET}")
+            return
+
+        # Mise à jour des stats visibles (delta sur le total)
+        layer[stat_name] += value
 
         if config.DEV_AGENT_MODE: try_reward(value)
 
         if debug >= 1:
-            print(f"{Colors.GREEN}{stat_name.capitalize()} changed by {value} in {stat_type}! (Now {self.__dict__.get(stat_name, 'N/A')}){Colors.RESET}")
+            print(f"{Colors.GREEN}{stat_name.capitalize()} changed by {value} in {stat_type}! (Now {getattr(self, stat_name)}){Colors.RESET}")
 
     def remove_temporary_effects(self):
         """Réinitialise toutes les stats temporaires à 0 et met à jour les stats visibles."""
         global debug
 
-        if not isinstance(self.temporary_stats, dict):
-            print(f"{Colors.RED}ERROR: temporary_stats is corrupted! Resetting...{Colors.RESET}")
-            self.temporary_stats = {key: 0 for key in self.permanent_stats}
+        temporary = self._temporary._values
+        for i, value in enumerate(temporary):
+            if value:
+                self._totals[i] -= value
+                temporary[i] = 0
 
-        for key in self.temporary_stats:
-            self.temporary_stats[key] = 0
-
-        self.update_total_stats()
         if debug >= 1:
             print(f"{Colors.YELLOW}DEBUG: Temporary effects removed. Stats updated.{Colors.RESET}")
 
     def reset_equipment_stats(self):
-        self.equipment_stats = {key: 0 for key in self.permanent_stats}
+        equipment = self._equipment._values
+        for i, value in enumerate(equipment):
+            if value:
+                self._totals[i] -= value
+                equipment[i] = 0
 
     def take_damage(self, damage:int|float):
         """Gère la prise de dégâts en priorisant les points de vie temporaires et conserve les HP max temporaires."""
         global debug
 
-        # Vérification de la structure des stats avant utilisation
-        if not isinstance(self.temporary_stats, dict):
-            print(f"{Colors.RED}ERROR: temporary_stats is corrupted! Resetting...{Colors.RESET}")
-            self.temporary_stats = {key: 0 for key in self.permanent_stats}
-
-        if not isinstance(self.permanent_stats, dict):
-            print(f"{Colors.RED}ERROR: permanent_stats is corrupted! Resetting...{Colors.RESET}")
-            self.permanent_stats = {
-                "hp": 100, "max_hp": 100, "attack": 10, "defense": 5,
-                "magic_damage": 1, "magic_defense": 1, "agility": 5, "luck": 5,
-                "mana": 20, "max_mana": 20, "stamina": 50, "max_stamina": 50,
-                "critical_chance": 5
-            }
-
-        hp_temp = self.temporary_stats["hp"]
-        hp_max_temp = self.temporary_stats["max_hp"]
-        hp_perm = self.permanent_stats["hp"]
+        hp_temp = self._temporary["hp"]
+        hp_perm = self._permanent["hp"]
 
         # Dégâts absorbés en priorité par les HP temporaires
         if hp_temp > 0:
             damage_absorbed = min(hp_temp, damage)
-            self.temporary_stats["hp"] -= int(damage_absorbed)
+            self._temporary["hp"] = hp_temp - int(damage_absorbed)
             damage -= damage_absorbed  # Mise à jour des dégâts restants
         else:
             damage_absorbed = 0
 
         # S'il reste des dégâts, ils sont appliqués aux HP permanents
         if damage > 0:
-            self.permanent_stats["hp"] = int(max(0, hp_perm - damage))
-
-        # Mise à jour des HP affichés (permanents + temporaires)
-        self.update_total_stats()
+            self._permanent["hp"] = int(max(0, hp_perm - damage))
 
         if debug >= 1:
-            print(f"DEBUG: After damage -> Temp HP: {self.temporary_stats['hp']}/{hp_max_temp},\n"
-                f"Perm HP: {self.permanent_stats['hp']}/{self.permanent_stats['max_hp']}")
+            print(f"DEBUG: After damage -> Temp HP: {self._temporary['hp']}/{self._temporary['max_hp']},\n"
+                f"Perm HP: {self._permanent['hp']}/{self._permanent['max_hp']}")
         
         # return total damage
         return damage, damage_absorbed
 
+    # --- Sauvegarde ---
+
+    def to_dict(self) -> dict:
+        """Même forme que l'ancien Stats.__dict__ (couches, total_stats puis les totaux à plat)."""
+        data = {
+            "permanent_stats": self._permanent.copy(),
+            "temporary_stats": self._temporary.copy(),
+            "equipment_stats": self._equipment.copy(),
+            "total_stats": self.total_stats,
+        }
+        data.update(self.total_stats)
+        if hasattr(self, "can_act"):
+            data["can_act"] = self.can_act
+        return data
+
+    def load_dict(self, data: dict):
+        """Recharge les couches depuis to_dict() (ou une ancienne sauvegarde). Les totaux sont recalculés."""
+        with self.batch():
+            if "permanent_stats" in data:
+                permanent = dict(self.DEFAULT_PERMANENT)
+                permanent.update(data["permanent_stats"] or {})
+                self.permanent_stats = permanent
+            if "temporary_stats" in data:
+                self.temporary_stats = data["temporary_stats"] or {}
+            if "equipment_stats" in data:
+                self.equipment_stats = data["equipment_stats"] or {}
+            if "can_act" in data:
+                self.can_act = data["can_act"]
+
+
+def _stat_property(name: str):
+    index = STAT_INDEX[name]
+
+    def getter(self):
+        return self._totals[index]
+
+    def setter(self, value):
+        # Si on modifie une stat existante, elle est ajoutée aux stats permanentes
+        self._permanent[name] = int(value)
+
+    return property(getter, setter, doc=f"Total {name} (permanent + temporary + equipment).")
+
+for _name in STAT_NAMES:
+    setattr(Stats, _name, _stat_property(_name))
 
 
 # Game Classes
@@ -382,7 +486,7 @@ class Entity:
                 return
 
         resistance = self.resistances.get(effect.name.lower(), 0)
-        if random.randint(0, 100) < (100 - resistance):
+        if rng_for(self, COMBAT).randint(0, 100) < (100 - resistance):
             # Check if effect of same name already exists
             existing_effect = next((e for e in self.status_effects if e.name == effect.name), None)
             if existing_effect:
@@ -428,6 +532,164 @@ class Entity:
 
 from engine.difficulty import Difficulty, NormalDifficulty, RealisticDifficulty
 
+
+# --- Schéma de sauvegarde du joueur ---
+# Version 1 = anciennes sauvegardes (copie de __dict__, sans "schema_version"), relues avec ce même schéma.
+PLAYER_SCHEMA_VERSION = 2
+
+
+def _dump_objects(attr: str):
+    return lambda player: [obj.to_dict() for obj in getattr(player, attr)]
+
+def _load_run_seed(player, value):
+    player.rng = RunRNG(value)
+
+def _load_stats(player, value):
+    player.stats.load_dict(value or {})
+
+def _load_equipment(player, value):
+    player.equipment = Equipment.from_dict(value) if value else None
+
+def _load_inventory(player, value):
+    player.inventory = Inventory(player)
+    list.extend(player.inventory, (Item.from_dict(item) for item in value or [])) # sans compter items_collected
+
+def _load_quests(attr: str):
+    def load(player, value):
+        from core.progression import Quest
+        setattr(player, attr, [Quest.from_dict(q) for q in value or []])
+    return load
+
+def _load_achievements(player, value):
+    from core.progression import Achievement
+    condition_map = {ach.id: ach.condition for ach in player.achievements}
+    player.achievements = [Achievement.from_dict(a, condition_map) for a in value or []]
+
+def _load_status_effects(player, value):
+    from core.status_effects import status_effect_from_dict
+    player.status_effects = [effect for effect in (status_effect_from_dict(e) for e in value or []) if effect]
+
+def _load_playtime(player, value):
+    player.playtime_seconds = value or 0
+    player._playtime_start = time.time()
+
+def _load_known_recipes(player, value):
+    player.known_recipes = {recipe_id: Recipe.from_dict(recipe) for recipe_id, recipe in (value or {}).items()}
+
+def _load_player_class(player, value):
+    player.player_class = PlayerClass.from_dict(value) if value else None
+
+
+# (clé, dump(player) -> valeur JSON, load(player, valeur)) dans l'ordre de sauvegarde et de chargement.
+# None = attribut du même nom copié tel quel. Les attributs dérivés (total_armor, set_bonuses...)
+# ou de session (_playtime_start) ne sont pas sauvegardés.
+PLAYER_SCHEMA = (
+    # Identité
+    ("name", None, None),
+    ("player_id", None, None),
+    ("user_id", None, None),
+    ("run_seed", lambda p: p.rng.run_seed, _load_run_seed),
+    ("difficulty", lambda p: p.difficulty.name if hasattr(p.difficulty, "name") else str(p.difficulty),
+                   lambda p, v: setattr(p, "difficulty", Difficulty.from_dict(v or {}))),
+    ("difficulty_data", None, None),
+
+    # Progression
+    ("level", None, None),
+    ("xp", None, None),
+    ("max_xp", None, None),
+    ("gold", None, None),
+    ("souls", None, None),
+    ("sin", None, None),
+    ("class_name", None, None),
+    ("profession", None, None),
+    ("player_class", lambda p: p.player_class.to_dict() if getattr(p, "player_class", None) is not None else None,
+                     _load_player_class),
+
+    # Stats (avant l'équipement, ses effets sont réappliqués après le chargement)
+    ("stats", lambda p: p.stats.to_dict(), _load_stats),
+    ("resistances", None, None),
+    ("status_effects", lambda p: [effect.__dict__ for effect in p.status_effects], _load_status_effects),
+    ("equipment", lambda p: p.equipment.to_dict() if p.equipment else None, _load_equipment),
+    ("inventory", _dump_objects("inventory"), _load_inventory),
+    ("displayed_set_bonuses", lambda p: list(p.displayed_set_bonuses),
+                              lambda p, v: setattr(p, "displayed_set_bonuses", set(v or []))),
+    ("skills", _dump_objects("skills"), lambda p, v: setattr(p, "skills", [Skill.from_dict(s) for s in v or []])),
+    ("known_spells", _dump_objects("known_spells"),
+                     lambda p, v: setattr(p, "known_spells", [Spell.from_dict(s) for s in v or []])),
+    ("masteries", lambda p: {k: m.to_dict() for k, m in p.masteries.items()},
+                  lambda p, v: setattr(p, "masteries", {k: Mastery.from_dict(m) for k, m in (v or {}).items()})),
+    ("quests", _dump_objects("quests"), _load_quests("quests")),
+    ("completed_quests", _dump_objects("completed_quests"), _load_quests("completed_quests")),
+    ("achievements", _dump_objects("achievements"), _load_achievements),
+    ("seen_events", lambda p: list(p.seen_events), lambda p, v: setattr(p, "seen_events", set(v or []))),
+    ("tutorial_completed", None, None),
+    ("tutorial_rooms_shown", None, None),
+
+    # Donjon
+    ("dungeon_level", None, None),
+    ("current_room_number", None, None),
+    ("total_rooms_explored", None, None),
+    ("position", None, lambda p, v: setattr(p, "position", tuple(v) if v is not None else (0, 0))),  # clé de dict (move_player)
+    ("next_layout_seed", None, None),
+    ("next_room_count", None, None),
+
+    # Suivi de la partie
+    ("playtime_seconds", None, _load_playtime),
+    ("deaths_per_room", None, None),
+    ("levels_completed", None, None),
+    ("total_deaths", None, None),
+    ("total_play_sessions", None, None),
+    ("kills", None, None),
+    ("critical_count", None, None),
+    ("attack_count", None, None),
+    ("shops_visited", None, None),
+    ("combat_encounters", None, None),
+    ("rest_rooms_visited", None, None),
+    ("puzzles_solved", None, None),
+    ("treasures_found", None, None),
+    ("traps_triggered", None, None),
+    ("bosses_defeated", None, None),
+    ("items_collected", None, None),
+    ("gold_spent", None, None),
+    ("gold_collected", None, None),
+    ("damage_dealt", None, None),
+    ("damage_taken", None, None),
+
+    # Analytics
+    ("mostDeadlyEnemies", None, None),
+    ("combatSuccessByLevel", None, None),
+    ("skillsUsageFrequency", None, None),
+    ("roomTypePreferences", None, None),
+    ("explorationDepthByDifficulty", None, None),
+    ("puzzleSuccessRateOverTime", None, None),
+    ("bossEncounterOutcomes", None, None),
+    ("goldSpendingPatterns", None, None),
+    ("equipmentUsageByType", None, None),
+    ("shopVisitFrequency", None, None),
+    # Clés en str pour le JSON
+    ("purchased_items", lambda p: {str(k): v for k, v in p.purchased_items.items()}, None),
+    ("levelDistribution", None, None),
+    ("classSpecializationChoices", None, None),
+    ("xpGainOverTime", None, None),
+    ("achievementCompletionRates", None, None),
+    ("ng_plus", None, None),
+    ("unlocked_difficulties", None, None),
+    ("finished_difficulties", None, None),
+
+    # Crafting
+    ("resources", None, None),
+    ("known_recipes", lambda p: {recipe_id: recipe.to_dict() for recipe_id, recipe in p.known_recipes.items()},
+                      _load_known_recipes),
+)
+
+# Alias lus par analytics/analytics.html, écrits mais jamais rechargés
+PLAYER_ANALYTICS_ALIASES = (("player_name", "name"), ("rooms_explored", "total_rooms_explored"), ("deaths", "total_deaths"))
+
+# Listes précalculées pour to_dict / from_dict
+PLAYER_DUMP_FIELDS = tuple((key, dump) for key, dump, _ in PLAYER_SCHEMA)
+PLAYER_LOAD_FIELDS = tuple((key, load) for key, _, load in PLAYER_SCHEMA)
+
+
 class Player(Entity):
     """
     Represents the player-controlled character in the Dungeon Hunter game.
@@ -478,6 +740,8 @@ class Player(Entity):
         
         # Dungeon Progression
         dungeon_level (int): Current dungeon depth/level.
+        next_layout_seed (int | None): Seed of the next puzzle layout, drawn one level ahead (engine.layout_pool).
+        next_room_count (int | None): Room count of the next puzzle level, drawn with next_layout_seed.
         levels_completed (int): Number of dungeon levels fully completed.
         deaths_per_room (dict): Tracks deaths per room across difficulties.
         
@@ -503,10 +767,10 @@ class Player(Entity):
 
     Methods:
         # Progression
-        level_up() -> None:
+        level_up(silent: bool = False) -> None:
             Increases stats, maxes out health/mana, and shows level-up message.
         
-        gain_xp(amount: int) -> None:
+        gain_xp(amount: int, silent: bool = False) -> None:
             Adds experience points and triggers level_up() if threshold reached.
         
         choose_class(level: int, classes: list[PlayerClass]) -> None:
@@ -559,6 +823,12 @@ class Player(Entity):
         # Combat & Abilities
         use_skill(target: Entity) -> int:
             Executes a learned skill against a target, returns damage dealt.
+
+        choose_skill() -> Skill | None:
+            Prompts the player for one of the learned skills.
+
+        apply_skill(skill: Skill, target: Entity) -> int:
+            Activates a given skill against a target, returns damage dealt.
         
         learn_spell(spell: Spell) -> None:
             Adds spell to learned spells list.
@@ -647,8 +917,8 @@ class Player(Entity):
         move_player(direction: str, dungeon_grid: list) -> bool:
             Moves player in dungeon grid based on direction.
         
-        save_player(filename: str = "player_save.json") -> None:
-            Serializes player state to JSON file in saves/ directory.
+        save_player(filename: str = "player_save.json", dungeon: Dungeon | None = None, save_type: str = "manual") -> None:
+            Saves the player (and the dungeon left, restored on load) in saves/ through SaveManager.
         
         reset_player() -> None:
             Resets character to initial state, losing all progression.
@@ -682,7 +952,7 @@ class Player(Entity):
             Returns detailed player representation for debugging.
     """
 
-    def __init__(self, name="Adventurer", difficulty=Difficulty()):
+    def __init__(self, name="Adventurer", difficulty=Difficulty(), seed: int | None = None):
         """Initialise le joueur avec des stats de base et un équipement vide."""
         import uuid
         from engine.game_utility import get_or_create_user_id
@@ -713,6 +983,9 @@ class Player(Entity):
 
         self.difficulty_data = {}
 
+        # RNG de la run (seed sauvegardée), voir engine.rng
+        self.rng = RunRNG(seed)
+
         self.level = 1
         self.xp = 0
         self.max_xp = 100
@@ -777,6 +1050,8 @@ class Player(Entity):
         self.current_room_number = 0
         self.total_rooms_explored = 0
         self.position: tuple[int, int] = (0, 0)
+        self.next_layout_seed: int | None = None
+        self.next_room_count: int | None = None
 
 
         # New stats for tracking player activities
@@ -1147,123 +1422,32 @@ class Player(Entity):
             self.class_name = "Novice"
 
     def to_dict(self):
-        data = self.__dict__.copy()
-
-        # Nettoyage / conversions spécifiques
-        data["equipment"] = self.equipment.to_dict() if self.equipment else None
-        data["inventory"] = [item.to_dict() for item in self.inventory]
-        data["skills"] = [skill.to_dict() for skill in self.skills]
-        data["quests"] = [quest.to_dict() for quest in self.quests]
-        data["completed_quests"] = [quest.to_dict() for quest in self.completed_quests]
-        data["achievements"] = [ach.to_dict() for ach in self.achievements]
-        data["stats"] = {k: v for k, v in self.stats.__dict__.items() if k != "equipment"}
-        data["seen_events"] = list(self.seen_events)
-        data["difficulty"] = self.difficulty.to_dict()
-        data["displayed_set_bonuses"] = list(self.displayed_set_bonuses) if hasattr(self, "displayed_set_bonuses") else []
-        data["status_effects"] = [effect.__dict__ for effect in self.status_effects] if self.status_effects else []
-        data["masteries"] = {k: v.to_dict() for k, v in self.masteries.items()}
-
-        # Convert player_class to dict if present
-        if hasattr(self, "player_class") and self.player_class is not None:
-            data["player_class"] = self.player_class.to_dict()
-        else:
-            data["player_class"] = None
-
-        # Add playtime_seconds to saved data
-        data["playtime_seconds"] = self.playtime_seconds
-
-        # Add new stats to saved data
-        data["player_id"] = self.player_id
-        data["deaths_per_room"] = self.deaths_per_room
-        data["levels_completed"] = self.levels_completed
-        data["total_deaths"] = self.total_deaths
-        data["total_play_sessions"] = self.total_play_sessions
-
-        # Crafting system: save resources and recipes
-        data["resources"] = self.resources
-        data["known_recipes"] = {recipe_id: recipe.to_dict() for recipe_id, recipe in self.known_recipes.items()}
-
-        # Add analytics variables needed for analytics.html
-        data["player_name"] = self.name
-        data["level"] = self.level
-        data["difficulty"] = self.difficulty.name if hasattr(self.difficulty, "name") else str(self.difficulty)
-        data["rooms_explored"] = self.total_rooms_explored
-        data["combat_encounters"] = self.combat_encounters
-        data["damage_dealt"] = self.damage_dealt
-        data["damage_taken"] = self.damage_taken
-        data["gold_spent"] = self.gold_spent
-        data["gold_collected"] = self.gold_collected
-        data["deaths"] = self.total_deaths
-
-        # Fix for JSON serialization: convert purchased_items keys to strings
-        data["purchased_items"] = {str(k): v for k, v in self.purchased_items.items()}
-
+        """Sauvegarde les champs de PLAYER_SCHEMA, dans l'ordre du schéma."""
+        data = {"schema_version": PLAYER_SCHEMA_VERSION}
+        for key, dump in PLAYER_DUMP_FIELDS:
+            data[key] = getattr(self, key) if dump is None else dump(self)
+        for alias, key in PLAYER_ANALYTICS_ALIASES:
+            data[alias] = data[key]
         return data
 
     @classmethod
     def from_dict(cls, data):
-        from core.progression import Quest, Achievement
-        from engine.difficulty import Difficulty
-        import time
-        from core.player_class import PlayerClass
-
+        """
+        Recharge un joueur depuis to_dict() (ou une sauvegarde de version 1).
+        Les champs absents gardent la valeur de __init__, les clés hors schéma sont ignorées.
+        """
         player = cls(data.get("name", "Adventurer"), Difficulty.from_dict(data.get("difficulty", {})))
 
-        # Remplissage générique
-        for key, value in data.items():
-            if key in ("equipment", "inventory", "skills", "quests", "completed_quests", "achievements", "stats", "difficulty", "seen_events", "displayed_set_bonuses", "playtime_seconds", "player_id", "deaths_per_room", "levels_completed", "total_deaths", "total_play_sessions", "player_class", "resources", "known_recipes"):
-                continue  # On gère ceux-là à part
-            setattr(player, key, value)
-
-        # Champs complexes
-        player.stats.__dict__.update(data.get("stats", {}))
-        player.inventory = [Item.from_dict(i) for i in data.get("inventory", [])]
-        player.equipment = Equipment.from_dict(data["equipment"]) if data.get("equipment") else None
-        player.skills = [Skill.from_dict(s) for s in data.get("skills", [])]
-        player.quests = [Quest.from_dict(q) for q in data.get("quests", [])]
-        player.completed_quests = [Quest.from_dict(q) for q in data.get("completed_quests", [])]
-
-        # Achievements avec condition_mapping
-        condition_map = {ach.id: ach.condition for ach in player.achievements}
-        player.achievements = [Achievement.from_dict(a, condition_map) for a in data.get("achievements", [])]
-
-        player.seen_events = set(data.get("seen_events", []))
-        player.displayed_set_bonuses = set(data.get("displayed_set_bonuses") or [])
+        for key, load in PLAYER_LOAD_FIELDS:
+            if key not in data:
+                continue
+            if load is None:
+                setattr(player, key, data[key])
+            else:
+                load(player, data[key])
 
         if player.equipment:
             player.apply_all_equipment_effects()
-            
-        from core.status_effects import status_effect_from_dict
-
-        player.status_effects = [
-            effect for effect in (status_effect_from_dict(e) for e in data.get("status_effects", [])) if effect
-        ]
-
-        player.masteries = {k: Mastery.from_dict(v) for k, v in data.get("masteries", {}).items()}
-
-        # Restore playtime_seconds and reset _playtime_start to current time
-        player.playtime_seconds = data.get("playtime_seconds", 0)
-        player._playtime_start = time.time()
-
-        # Restore new stats
-        player.player_id = data.get("player_id", str(uuid.uuid4()))
-        player.deaths_per_room = data.get("deaths_per_room", {})
-        player.levels_completed = data.get("levels_completed", 0)
-        player.total_deaths = data.get("total_deaths", 0)
-        player.total_play_sessions = data.get("total_play_sessions", 1)
-
-        # Restore crafting system data
-        from items.crafting import Recipe
-        player.resources = data.get("resources", {})
-        player.known_recipes = {recipe_id: Recipe.from_dict(recipe_data) for recipe_id, recipe_data in data.get("known_recipes", {}).items()}
-
-        # Restore player_class from dict if present
-        player_class_data = data.get("player_class")
-        if player_class_data:
-            from core.player_class import PlayerClass
-            player.player_class = PlayerClass.from_dict(player_class_data)
-        else:
-            player.player_class = None
 
         return player
 
@@ -1610,17 +1794,18 @@ class Player(Entity):
         # Remove bonuses that are no longer active from displayed_set_bonuses
         self.displayed_set_bonuses.intersection_update(current_active_bonuses)
 
-        # --- 3. Application des stats cumulées ---
-        for stat, value in total_stats.items():
-            if hasattr(self.stats, stat):
-                if debug >= 1:
-                    print(f"{Colors.CYAN}DEBUG: Modifying stat {stat} by {value} (equipment){Colors.RESET}")
-                self.stats.modify_stat(stat, value, stat_type="equipment")
-            else:
-                print(f"{Colors.RED}Stat {stat} does not exist in player stats!{Colors.RESET}")
+        # --- 3. Application des stats cumulées (un seul recalcul des totaux) ---
+        with self.stats.batch():
+            for stat, value in total_stats.items():
+                if hasattr(self.stats, stat):
+                    if debug >= 1:
+                        print(f"{Colors.CYAN}DEBUG: Modifying stat {stat} by {value} (equipment){Colors.RESET}")
+                    self.stats.modify_stat(stat, value, stat_type="equipment")
+                else:
+                    print(f"{Colors.RED}Stat {stat} does not exist in player stats!{Colors.RESET}")
 
-        # --- 4. Mise à jour finale ---
-        self.stats.update_total_stats()
+            # --- 4. Mise à jour finale ---
+            self.stats.update_total_stats()
         self.total_armor = total_stats.get("defense", 0)
 
         if debug >= 1:
@@ -1654,7 +1839,7 @@ class Player(Entity):
         return total_domage
 
 
-    def level_up(self):
+    def level_up(self, silent=False):
         self.level += 1
 
         # Obtenir les bonus selon le difficulty
@@ -1688,6 +1873,9 @@ class Player(Entity):
         else: # Would need to be * 1.08104849064 instad of * 1.5 to not reach inf
             self.max_xp = 166291628028091842613009095009266495195675719663122313883385367291708148049287571070332769258231929566843581503287283337414771535086454589469476502004191810875221462134119793315060067813232587839056216279794984264298677002182295914072532150201829472437592045207860103637703316939267547371315877194678772170752
 
+        if silent:
+            return
+
         # Affichage
         print(f"\n{Colors.BRIGHT_GREEN}{Colors.BOLD}╔══════════════════════════════╗")
         print(f"║      LEVEL UP! Level {self.level}!     ║")
@@ -1755,22 +1943,31 @@ class Player(Entity):
                 print(f"{Colors.RED}Invalid input. Please enter a number.{Colors.RESET}")
 
 
-    def gain_xp(self, amount):
+    def gain_xp(self, amount, silent=False):
+        """Adds XP and levels up if needed. silent=True skips the output and the class choice (headless runs)."""
         self.xp += amount
-        print(f"{Colors.BRIGHT_GREEN}You gain {amount} XP!{Colors.RESET}")
+        if not silent:
+            print(f"{Colors.BRIGHT_GREEN}You gain {amount} XP!{Colors.RESET}")
         
         # Check for level up
         if self.xp >= self.max_xp:
             excess = self.xp - self.max_xp
             self.xp = excess
-            self.level_up()
+            self.level_up(silent=silent)
             return True
         return False
     
     def use_skill(self, target:Entity):
+        skill = self.choose_skill()
+        if skill is None:
+            return 0
+        return self.apply_skill(skill, target)
+
+    def choose_skill(self) -> Skill | None:
+        """Asks the player which skill to use. Returns None on invalid input."""
         if not self.skills:
             print(f"{Colors.RED}You don't have any skills yet!{Colors.RESET}")
-            return 0
+            return None
 
         # Choisir le skill
         print(f"\n{Colors.YELLOW}Choose a skill to use:{Colors.RESET}")
@@ -1781,14 +1978,14 @@ class Player(Entity):
         if choice.isdigit():
             choice = int(choice)
             if 1 <= choice <= len(self.skills):
-                skill = self.skills[choice - 1]
-            else:
-                print(f"{Colors.RED}Invalid skill choice.{Colors.RESET}")
-                return 0
-        else:
-            print(f"{Colors.RED}Invalid input.{Colors.RESET}")
-            return 0
+                return self.skills[choice - 1]
+            print(f"{Colors.RED}Invalid skill choice.{Colors.RESET}")
+            return None
+        print(f"{Colors.RED}Invalid input.{Colors.RESET}")
+        return None
 
+    def apply_skill(self, skill: Skill, target:Entity):
+        """Activates the given skill against target and returns the damage dealt."""
         # Activation du skill
         multiplier = skill.activate(self)
         if multiplier == 0:
@@ -1797,7 +1994,7 @@ class Player(Entity):
 
         base_damage = self.total_domage()
 
-        critical = random.random() < (0.05 + self.stats.luck * 0.01)
+        critical = rng_for(self, COMBAT).random() < (0.05 + self.stats.luck * 0.01)
         if critical:
             base_damage *= 2
             print(f"{Colors.BRIGHT_YELLOW}{Colors.BOLD}CRITICAL HIT!{Colors.RESET}")
@@ -2020,7 +2217,7 @@ class Player(Entity):
 
         # Additional Stats
         stat_count = 0
-        for stat, base_value in self.stats.__dict__.items():
+        for stat, base_value in self.stats.to_dict().items():
             if stat in ["base_stats", "permanent_stats", "hp", "max_hp", "max_stamina", "stamina", "max_mana", "mana", "equipment"]:
                 continue
             if isinstance(base_value, dict):  
@@ -2241,7 +2438,7 @@ class Player(Entity):
         """
         # Additional Stats
         stat_count = 0
-        for stat, base_value in self.stats.__dict__.items():
+        for stat, base_value in self.stats.to_dict().items():
             if stat in ["base_stats", "permanent_stats", "hp", "max_hp", "max_stamina", "stamina", "max_mana", "mana", "equipment"]:
                 continue
             if isinstance(base_value, dict):  
@@ -2270,7 +2467,7 @@ class Player(Entity):
 
         # Additional Stats
         stat_count = 0
-        for stat, base_value in self.stats.__dict__.items():
+        for stat, base_value in self.stats.to_dict().items():
             if stat in ["base_stats", "permanent_stats", "hp", "max_hp", "max_stamina", "stamina", "max_mana", "mana", "equipment"]:
                 continue
             if isinstance(base_value, dict):  
@@ -2629,8 +2826,12 @@ class Player(Entity):
             self.seen_events.add(event_id)
     
 
-    def save_player(self, filename="player_save.json"):
-        """Saves the player's data to a JSON file.""" 
+    def save_player(self, filename="player_save.json", dungeon=None, save_type="manual"):
+        """
+        Saves the player's data to saves/<filename>, in the SaveManager format. With the
+        dungeon, the save also holds its dungeon_state: loading it resumes the same level
+        instead of generating it again.
+        """
 
         import time
         # Update playtime_seconds before saving
@@ -2646,134 +2847,13 @@ class Player(Entity):
             return
 
         try:
-            if not filename.endswith('.json'):
-                filename += '.json'
-
-            # Ensure saves directory exists
-            save_dir = "saves"
-            if not os.path.exists(save_dir):
-                os.makedirs(save_dir)
-
-            filepath = os.path.join(save_dir, filename)
-
-            data = self.to_dict()
-
-            with open(filepath, "w", encoding='utf-8') as file:
-                json.dump(data, file, indent=4)
+            # meta + player_data + dungeon_state, written atomically and indexed
+            from engine.save_system import SaveManager
+            SaveManager("saves").create_save(self, dungeon, save_type, name=filename)
 
             print(f"{Colors.GREEN}Game saved successfully!{Colors.RESET}")
 
-            # Save analytics data separately with nested structure expected by generate_global_stats.py
-            import datetime
-            analytics_data = {
-                    "timestamp": datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=2))).isoformat(),            "overview": {
-                    "totalPlayers": 1,
-                    "gamesPlayed": 1,
-                    "avgRoomsExplored": self.total_rooms_explored,
-                    "survivalRate": 100.0 if self.total_deaths == 0 else 0.0
-                },
-                "combat": {
-                    "totalDamageDealt": self.damage_dealt,
-                    "totalDamageTaken": self.damage_taken,
-                    "enemiesDefeated": self.kills,  # Not handled
-                    "critical_count": self.critical_count, # Need to be handled with criticalHitRate
-                    "attack_count": self.attack_count, # Need to add the criticalHitRate calculus
-                },
-                "exploration": {
-                    "roomsExplored": self.total_rooms_explored,
-                    "treasuresFound": self.treasures_found,
-                    "puzzlesSolved": self.puzzles_solved,
-                    "trapsTriggered": self.traps_triggered
-                },
-                "economy": {
-                    "totalGoldSpent": self.gold_spent,
-                    "totalGoldCollected": self.gold_collected,
-                    "itemsPurchased": len(self.purchased_items),  # Not tracked per player here
-                    "avgGoldPerPlayer": self.gold_spent,  # For aggregation
-                    "shopUtilization": 100.0 if self.gold_spent > 0 else 0.0
-                },
-                "progression": {
-                    "avgLevel": self.level,
-                    "tutorialCompletion": 1.0 if self.tutorial_completed else 0.0,
-                    "ngPlusPlayers": self.ng_plus.get(self.difficulty.name if hasattr(self.difficulty, "name") else str(self.difficulty), 0),
-                    "achievementsEarned": len(self.achievements) if hasattr(self, "achievements") else 0
-                },
-                "deathsByRoomPerDifficulty": self.deaths_per_room,
-                "timestamp": datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=2))).isoformat(),            "overview": {
-                "totalPlayers": 1,
-                "gamesPlayed": 1,
-                "avgRoomsExplored": self.total_rooms_explored,
-                "survivalRate": 100.0 if self.total_deaths == 0 else 0.0
-                },
-                "combat": {
-                    "totalDamageDealt": self.damage_dealt,
-                    "totalDamageTaken": self.damage_taken,
-                    "enemiesDefeated": self.kills,  # Not handled
-                    "critical_count": self.critical_count, # Need to be handled with criticalHitRate
-                    "attack_count": self.attack_count, # Need to add the criticalHitRate calculus
-                },
-                "exploration": {
-                    "roomsExplored": self.total_rooms_explored,
-                    "treasuresFound": self.treasures_found,
-                    "puzzlesSolved": self.puzzles_solved,
-                    "trapsTriggered": self.traps_triggered
-                },
-                "economy": {
-                    "totalGoldSpent": self.gold_spent,
-                    "totalGoldCollected": self.gold_collected,
-                    "itemsPurchased": len(self.purchased_items),  # Not tracked per player here
-                    "avgGoldPerPlayer": self.gold_spent,  # For aggregation
-                    "shopUtilization": 100.0 if self.gold_spent > 0 else 0.0
-                },
-                "progression": {
-                    "avgLevel": self.level,
-                    "tutorialCompletion": 1.0 if self.tutorial_completed else 0.0,
-                    "ngPlusPlayers": self.ng_plus.get(self.difficulty.name if hasattr(self.difficulty, "name") else str(self.difficulty), 0),
-                    "achievementsEarned": len(self.achievements) if hasattr(self, "achievements") else 0
-                },
-                "deathsByRoomPerDifficulty": self.deaths_per_room,
-
-                "mostDeadlyEnemies": {name: self.mostDeadlyEnemies.count(name) for name in set(self.mostDeadlyEnemies)},
-                "combatSuccessByLevel": self.combatSuccessByLevel,
-                "damageDealt": self.damage_dealt,
-                "damageTaken": self.damage_taken,
-                "skillsUsageFrequency": self.skillsUsageFrequency,
-                "roomTypePreferences": self.roomTypePreferences,
-                "explorationDepthByDifficulty": self.explorationDepthByDifficulty,
-                "puzzleSuccessRateOverTime": self.puzzleSuccessRateOverTime,
-                "bossEncounterOutcomes": self.bossEncounterOutcomes,
-                "purchased_items": {str(k): v for k, v in self.purchased_items.items()}, # Convert keys to strings for JSON serialization
-                "goldSpendingPatterns": self.goldSpendingPatterns,
-                "equipmentUsageByType": self.equipmentUsageByType,
-                "shopVisitFrequency": self.shopVisitFrequency,
-                "levelDistribution": self.levelDistribution,
-                "classSpecializationChoices": self.classSpecializationChoices,
-                "xpGainOverTime": self.xpGainOverTime,
-                "achievementCompletionRates": self.achievementCompletionRates
-            }
-
-            analytics_dir = "analytics_saves"
-            if not os.path.exists(analytics_dir):
-                os.makedirs(analytics_dir)
-
-            analytics_filepath = os.path.join(analytics_dir, f"analytics_{self.player_id}.json")
-
-            # Use user_id in analytics filename to group players by user
-            analytics_filepath = os.path.join(analytics_dir, f"analytics_user_{self.user_id}.json")
-
-            with open(analytics_filepath, "w", encoding='utf-8') as analytics_file:
-                json.dump(analytics_data, analytics_file, indent=4)
-
-            print(f"{Colors.GREEN}Analytics data saved successfully to {analytics_filepath}!{Colors.RESET}")
-
-            from data.player_data import can_send_analytics
-            if can_send_analytics() == True:
-                try:
-                    print(f"{Colors.YELLOW}Sending analytics data...{Colors.RESET}")
-                    from network.client import send_analytics_files
-                    send_analytics_files()
-                except Exception as e:
-                    print(f"{Colors.RED}Error sending analytics data: {e}{Colors.RESET}")
+            # Analytics are no longer written here, see engine.analytics (events queued during the game)
         except Exception as e:
             from engine.game_utility import handle_error
             handle_error()
@@ -2878,6 +2958,9 @@ class Player(Entity):
         self.difficulty = persistent_data["difficulty"]
         self._playtime_start = persistent_data["_playtime_start"]
 
+        # New run, new seed (derived from the previous one so a whole session stays reproducible)
+        self.rng = self.rng.fork("respawn")
+
         # Update stats after reset
         self.stats.update_total_stats()
         self.apply_all_equipment_effects()
@@ -2945,33 +3028,44 @@ class Enemy(Entity):
         difficulty (int): A numerical scale from 1 to 10 determining enemy strength.
 
     Methods:
+        strike(player: Player) -> int:
+            Resolves an attack silently and returns the damage dealt.
+
         attack_player(player: Player) -> int:
             Attacks the player and returns the damage dealt.
     """
-    def __init__(self, name="???", enemy_type="???", hp=random.randint(1,9317), attack=random.randint(1,5785), defense=random.randint(1,31957), xp_reward=random.randint(1,352934), gold_reward=random.randint(1,53126), tier=random.randint(1,152)):
+    def __init__(self, name="???", enemy_type="???", hp=None, attack=None, defense=None, xp_reward=None, gold_reward=None, tier=None, rng=None):
+        # Stats aléatoires si non précisées (tirées à chaque création, pas une seule fois à l'import)
+        rng = rng or random
+        hp = hp if hp is not None else rng.randint(1,9317)
+        attack = attack if attack is not None else rng.randint(1,5785)
+        defense = defense if defense is not None else rng.randint(1,31957)
+        xp_reward = xp_reward if xp_reward is not None else rng.randint(1,352934)
+        gold_reward = gold_reward if gold_reward is not None else rng.randint(1,53126)
+        tier = tier if tier is not None else rng.randint(1,152)
         super().__init__(name, hp, hp, attack, defense)
         self.xp_reward = xp_reward
         self.gold_reward = gold_reward
         self.tier = tier  # 1-10 scale
         self.type = enemy_type
     
-    def attack_player(self, player:Player):
-        """Enemy attacks the player, considering total armor defense."""
+    def strike(self, player:Player) -> int:
+        """Resolves one attack on the player without any output and returns the damage dealt."""
         global debug
 
         player.apply_all_equipment_effects()
-        damage = max(1, self.stats.attack - (player.stats.defense + player.total_armor))
-        if debug >= 1:
-            print(damage)
         damage = int(self.stats.attack * (100 / (100 + player.stats.defense + player.total_armor)))
-        if debug >= 1:
-            print(damage)
         
         if debug >= 1:
             print('DEBUG: player hp:', player.stats.hp)
             
         player.stats.take_damage(damage)
         player.damage_taken += damage
+        return damage
+
+    def attack_player(self, player:Player):
+        """Enemy attacks the player, considering total armor defense."""
+        damage = self.strike(player)
 
         print(f"{self.name} attacks you for {Colors.RED}{damage}{Colors.RESET} damage!")
         
@@ -2981,37 +3075,76 @@ class Enemy(Entity):
         return damage
 
 
-def generate_enemy(level:int, is_boss:bool, player: Player):
-    """Génère un ennemi ou un boss en fonction du niveau donné."""
-    
-    global debug
+# Candidats par (niveau, boss) : types valides + poids cumulés, reconstruits si enemies_data change
+_enemy_candidates_cache: dict[tuple[int, bool], tuple[list[dict], list[float]]] = {}
+_enemy_candidates_key = None
 
-    if debug >= 1:
-        print(f"DEBUG: Generating {'boss' if is_boss else 'enemy'} for level {level}")
+def clear_enemy_candidates_cache():
+    global _enemy_candidates_key
+    _enemy_candidates_cache.clear()
+    _enemy_candidates_key = None
 
-    # Sélection des ennemis ou des boss disponibles pour ce niveau
+def enemy_candidates(level: int, is_boss: bool) -> tuple[list[dict], list[float]]:
+    """Types d'ennemis (ou de boss) possibles à ce niveau et leurs poids cumulés (pour random.choices)."""
+    global _enemy_candidates_key
     from data.enemies_data import boss_types, enemy_types
+
+    key = (id(enemy_types), len(enemy_types), id(boss_types), len(boss_types))
+    if key != _enemy_candidates_key:
+        _enemy_candidates_cache.clear()
+        _enemy_candidates_key = key
+
+    cached = _enemy_candidates_cache.get((level, is_boss))
+    if cached is not None:
+        return cached
+
+    # Sélection des ennemis ou des boss disponibles pour ce niveau
     if is_boss:
         valid_types = [e for e in boss_types if e["min_level"] == level]
     else:
         valid_types = [e for e in enemy_types if e["min_level"] <= level]
 
-    if debug >= 1:
-        print(f"DEBUG: Found {len(valid_types)} valid {'boss' if is_boss else 'enemy'} types")
-
     # Si aucun ennemi valide, on prend le premier ennemi par défaut
     if not valid_types:
         valid_types = [enemy_types[0]]
 
-    # Calcul des poids pour chaque ennemi valide, favorisant ceux avec min_level proche du niveau
-    weights = []
-    for enemy in valid_types:
-        diff = level - enemy["min_level"]
-        weight = 1 / (1 + diff)  # Plus le min_level est proche du niveau, plus le poids est élevé
-        weights.append(weight)
+    # Poids favorisant les ennemis avec un min_level proche du niveau
+    cum_weights = list(accumulate(1 / (1 + level - e["min_level"]) for e in valid_types))
+
+    _enemy_candidates_cache[(level, is_boss)] = (valid_types, cum_weights)
+    return valid_types, cum_weights
+
+
+def generate_enemy(level:int, is_boss:bool, player: Player, rng=None):
+    """Génère un ennemi ou un boss en fonction du niveau donné (rng : par défaut le flux de génération du joueur)."""
+    return generate_enemies(level, 1, is_boss, player, rng)[0]
 
-    # Sélection pondérée d'un ennemi approprié
-    enemy_data = random.choices(valid_types, weights=weights, k=1)[0]
+
+def generate_enemies(level:int, n:int, is_boss:bool, player: Player, rng=None) -> list[Enemy]:
+    """Génère n ennemis (ou boss) pour ce niveau. Même tirage que n appels à generate_enemy."""
+    
+    global debug
+
+    if debug >= 1:
+        print(f"DEBUG: Generating {n} {'boss' if is_boss else 'enemy'} for level {level}")
+
+    valid_types, cum_weights = enemy_candidates(level, is_boss)
+
+    if debug >= 1:
+        print(f"DEBUG: Found {len(valid_types)} valid {'boss' if is_boss else 'enemy'} types")
+
+    # Sélection pondérée des ennemis
+    selected = (rng or rng_for(player, GENERATION)).choices(valid_types, cum_weights=cum_weights, k=n)
+
+    # Multiplicateur NG+ (>= 1), 10% par niveau de NG+
+    diff_mltp = max(1, player.difficulty.get_ng_plus(player) * 0.1)
+
+    return [_build_enemy(level, is_boss, enemy_data, diff_mltp) for enemy_data in selected]
+
+
+def _build_enemy(level:int, is_boss:bool, enemy_data:dict, diff_mltp:float) -> Enemy:
+    """Crée l'ennemi d'un type donné avec les stats du niveau."""
+    global debug
 
     if debug >= 1:
         print(f"DEBUG: Selected enemy type: {enemy_data['name']} with modifiers hp:{enemy_data['hp_mod']}, atk:{enemy_data['atk_mod']}, def:{enemy_data['def_mod']}")
@@ -3042,7 +3175,6 @@ def generate_enemy(level:int, is_boss:bool, player: Player):
             print(f"DEBUG: Boss stats after multiplier - HP: {hp}, Attack: {attack}, Defense: {defense}")
 
     # Apply NG+ difficulty multiplier to enemy stats, starting at NG+0 (multiplier >= 1)
-    diff_mltp = max(1, player.difficulty.get_ng_plus(player) * 0.1) # 10% increase per NG+ level
     hp = int(hp * diff_mltp)
     attack = int(attack * diff_mltp)
     defense = int(defense * diff_mltp)
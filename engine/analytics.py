@@ -0,0 +1,312 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.entity import Player
+
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+
+"""
+Analytics pipeline, separate from the saves.
+
+The game calls emit() at gameplay points (room done, level cleared, death,
+end of session). emit() only serializes the event and queues it; a
+background thread appends the queued events as JSON lines to
+analytics_saves/events.jsonl, rotated at MAX_BYTES (events.jsonl.1 ... .N).
+
+    {"ts": "2026-10-18T16:40:00+02:00", "type": "room", "user_id": ..., "player_id": ..., "data": {...}}
+
+"player" events hold the full player summary (player_summary(), the structure
+expected by generate_global_stats.py). The aggregation step reads the event
+files and writes one analytics_user_<user_id>.json per user, then sends them
+if the player agreed to it. It runs at the end of every session
+(DungeonMode.cleanup, publish()) and by hand with:
+
+    python -m engine.analytics
+"""
+
+import atexit
+import datetime
+import json
+import os
+import threading
+from collections import deque
+
+from engine.logger import logger
+
+
+ANALYTICS_DIR = "analytics_saves"
+EVENTS_FILENAME = "events.jsonl"
+MAX_BYTES = 1024 * 1024
+BACKUP_COUNT = 5
+FLUSH_INTERVAL = 2.0  # seconds between two background writes
+
+TIMEZONE = datetime.timezone(datetime.timedelta(hours=2))
+
+
+def _now() -> str:
+    return datetime.datetime.now(TIMEZONE).isoformat()
+
+
+def player_summary(player: Player) -> dict:
+    """Analytics payload of a player (the structure of the old analytics_user_*.json files)."""
+    difficulty = player.difficulty.name if hasattr(player.difficulty, "name") else str(player.difficulty)
+    return {
+        "timestamp": _now(),
+        "difficulty": difficulty,
+        "playtimeSeconds": int(player.playtime_seconds),
+        "overview": {
+            "totalPlayers": 1,
+            "gamesPlayed": 1,
+            "avgRoomsExplored": player.total_rooms_explored,
+            "survivalRate": 100.0 if player.total_deaths == 0 else 0.0
+        },
+        "combat": {
+            "totalDamageDealt": player.damage_dealt,
+            "totalDamageTaken": player.damage_taken,
+            "enemiesDefeated": player.kills,  # Not handled
+            "critical_count": player.critical_count, # Need to be handled with criticalHitRate
+            "attack_count": player.attack_count, # Need to add the criticalHitRate calculus
+        },
+        "exploration": {
+            "roomsExplored": player.total_rooms_explored,
+            "treasuresFound": player.treasures_found,
+            "puzzlesSolved": player.puzzles_solved,
+            "trapsTriggered": player.traps_triggered
+        },
+        "economy": {
+            "totalGoldSpent": player.gold_spent,
+            "totalGoldCollected": player.gold_collected,
+            "itemsPurchased": len(player.purchased_items),  # Not tracked per player here
+            "avgGoldPerPlayer": player.gold_spent,  # For aggregation
+            "shopUtilization": 100.0 if player.gold_spent > 0 else 0.0
+        },
+        "progression": {
+            "avgLevel": player.level,
+            "tutorialCompletion": 1.0 if player.tutorial_completed else 0.0,
+            "ngPlusPlayers": player.ng_plus.get(difficulty, 0),
+            "achievementsEarned": len(player.achievements) if hasattr(player, "achievements") else 0
+        },
+        "deathsByRoomPerDifficulty": player.deaths_per_room,
+
+        "mostDeadlyEnemies": {name: player.mostDeadlyEnemies.count(name) for name in set(player.mostDeadlyEnemies)},
+        "combatSuccessByLevel": player.combatSuccessByLevel,
+        "damageDealt": player.damage_dealt,
+        "damageTaken": player.damage_taken,
+        "skillsUsageFrequency": player.skillsUsageFrequency,
+        "roomTypePreferences": player.roomTypePreferences,
+        "explorationDepthByDifficulty": player.explorationDepthByDifficulty,
+        "puzzleSuccessRateOverTime": player.puzzleSuccessRateOverTime,
+        "bossEncounterOutcomes": player.bossEncounterOutcomes,
+        "purchased_items": {str(k): v for k, v in player.purchased_items.items()}, # Convert keys to strings for JSON serialization
+        "goldSpendingPatterns": player.goldSpendingPatterns,
+        "equipmentUsageByType": player.equipmentUsageByType,
+        "shopVisitFrequency": player.shopVisitFrequency,
+        "levelDistribution": player.levelDistribution,
+        "classSpecializationChoices": player.classSpecializationChoices,
+        "xpGainOverTime": player.xpGainOverTime,
+        "achievementCompletionRates": player.achievementCompletionRates
+    }
+
+
+class AnalyticsPipeline:
+    """Buffered event writer: emit() queues a JSON line, a daemon thread appends them in batches."""
+
+    def __init__(self, directory: str = ANALYTICS_DIR, max_bytes: int = MAX_BYTES,
+                 backup_count: int = BACKUP_COUNT, flush_interval: float = FLUSH_INTERVAL):
+        self.directory = directory
+        self.path = os.path.join(directory, EVENTS_FILENAME)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self._buffer: deque[str] = deque()
+        self._writing = False
+        self._flush_requested = False
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def emit(self, event_type: str, player: Player | None = None, **data):
+        """Queues an event. The data is serialized right away, the player can change afterwards."""
+        event = {"ts": _now(), "type": event_type}
+        if player is not None:
+            event["user_id"] = getattr(player, "user_id", None)
+            event["player_id"] = getattr(player, "player_id", None)
+        event["data"] = data
+        try:
+            line = json.dumps(event, ensure_ascii=False, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Analytics event {event_type} dropped: {e}")
+            return
+
+        with self._cond:
+            self._buffer.append(line)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="AnalyticsWriter", daemon=True)
+                self._thread.start()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Writes the queued events now and waits for it. False if the timeout expired first."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._buffer and not self._writing, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._flush_requested, self.flush_interval)
+                self._flush_requested = False
+                if not self._buffer:
+                    self._cond.notify_all()
+                    continue
+                lines = list(self._buffer)
+                self._buffer.clear()
+                self._writing = True
+            try:
+                self._write("".join(line + "\n" for line in lines).encode("utf-8"))
+            except OSError as e:
+                logger.warning(f"Analytics events not written ({len(lines)} lost): {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write(self, data: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "ab") as f:
+            f.write(data)
+
+    def _rotate(self):
+        """events.jsonl -> events.jsonl.1 -> ... -> events.jsonl.<backup_count> (the oldest one is dropped)."""
+        for i in range(self.backup_count - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+_pipeline: AnalyticsPipeline | None = None
+
+
+def get_pipeline() -> AnalyticsPipeline:
+    """Shared pipeline, flushed at exit."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = AnalyticsPipeline()
+        atexit.register(_pipeline.flush, 5)
+    return _pipeline
+
+
+def emit(event_type: str, player: Player | None = None, **data):
+    """Queues an analytics event on the shared pipeline (never raises, never touches the disk)."""
+    try:
+        get_pipeline().emit(event_type, player, **data)
+    except Exception as e:
+        logger.warning(f"Analytics event {event_type} dropped: {e}")
+
+
+def emit_player(player: Player, reason: str):
+    """Queues the full summary of the player ("player" event)."""
+    emit("player", player, reason=reason, summary=player_summary(player))
+
+
+def flush(timeout: float | None = None) -> bool:
+    return _pipeline.flush(timeout) if _pipeline else True
+
+
+# --- Aggregation step ---
+
+def read_events(directory: str = ANALYTICS_DIR):
+    """Events of the rotated files then of the current one (oldest first). Damaged lines are skipped."""
+    path = os.path.join(directory, EVENTS_FILENAME)
+    backups = sorted((name for name in os.listdir(directory) if name.startswith(EVENTS_FILENAME + ".")),
+                     key=lambda name: int(name.rsplit(".", 1)[1]) if name.rsplit(".", 1)[1].isdigit() else 0,
+                     reverse=True) if os.path.isdir(directory) else []
+    for filepath in [os.path.join(directory, name) for name in backups] + [path]:
+        if not os.path.exists(filepath):
+            continue
+        with open(filepath, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def aggregate(directory: str = ANALYTICS_DIR) -> dict[str, dict]:
+    """
+    {user_id: analytics} from the events: the last player summary of the user,
+    plus the number of events of each type ("eventCounts").
+    """
+    users: dict[str, dict] = {}
+    counts: dict[str, dict[str, int]] = {}
+    for event in read_events(directory):
+        user_id = event.get("user_id")
+        if not user_id:
+            continue
+        user_counts = counts.setdefault(user_id, {})
+        user_counts[event.get("type")] = user_counts.get(event.get("type"), 0) + 1
+        if event.get("type") == "player" and "summary" in event.get("data", {}):
+            users[user_id] = event["data"]["summary"]
+
+    for user_id, summary in users.items():
+        summary["eventCounts"] = counts.get(user_id, {})
+    return users
+
+
+def write_user_files(directory: str = ANALYTICS_DIR) -> list[str]:
+    """Writes analytics_user_<user_id>.json for every user found in the events. Returns the paths."""
+    paths = []
+    for user_id, data in aggregate(directory).items():
+        filepath = os.path.join(directory, f"analytics_user_{user_id}.json")
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        paths.append(filepath)
+    return paths
+
+
+def publish(directory: str = ANALYTICS_DIR) -> tuple[list[str], bool]:
+    """
+    Aggregation step of the end of a session: writes the analytics_user files, then sends
+    them if can_send_analytics() allows it. Returns (paths, sent), never raises.
+    """
+    try:
+        paths = write_user_files(directory) if os.path.isdir(directory) else []
+    except Exception as e:
+        logger.warning("Analytics user files not written: %s", e)
+        return [], False
+
+    from data.player_data import can_send_analytics
+    if not paths or can_send_analytics() != True:
+        return paths, False
+    try:
+        logger.info("Sending analytics data (%s file(s))", len(paths))
+        from network.client import send_analytics_files
+        send_analytics_files()
+        return paths, True
+    except Exception as e:
+        logger.warning("Error sending analytics data: %s", e)
+        return paths, False
+
+
+if __name__ == "__main__":
+    from interface.colors import Colors
+
+    paths, sent = publish()
+    print(f"{Colors.GREEN}{len(paths)} analytics file(s) written in {ANALYTICS_DIR}.{Colors.RESET}")
+    if sent:
+        print(f"{Colors.GREEN}Analytics data sent.{Colors.RESET}")
@@ -0,0 +1,264 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from core.entity import Player, Enemy
+    from items.items import Item
+
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+
+"""
+Headless combat engine.
+
+resolve_combat() plays a whole fight without any input, print or sleep.
+Decisions come from a policy and everything that happens is reported
+through an optional on_event callback, so the same rules drive both the
+interactive Room.handle_combat and simulations.
+
+A policy is called as policy(player, enemy, outcome) and returns an action:
+    (ATTACK,)           basic attack
+    (SKILL, skill)      use a learned skill
+    (ITEM, potion)      drink a potion from the inventory
+    (RUN,)              try to escape (always fails in boss rooms)
+    (WAIT,)             the turn is lost, the enemy still attacks
+    None                nothing happens, the policy is asked again (counts for max_turns)
+"""
+
+import config
+try_reward = lambda value: None
+if config.DEV_AGENT_MODE:
+    try:
+        from ai.reward_engine import try_reward
+    except ImportError: pass
+
+from items.items import Potion, generate_random_item
+from engine.logger import logger
+from engine.rng import rng_for, COMBAT
+
+
+ATTACK = "attack"
+SKILL = "skill"
+ITEM = "item"
+RUN = "run"
+WAIT = "wait"
+
+
+class CombatOutcome:
+    """
+    Structured result of a fight.
+
+    Attributes:
+        result (str): "victory", "defeat", "fled" or "stalemate" (max_turns reached).
+        turns (int): Number of player turns played.
+        damage_dealt / damage_taken (int): Damage done by and to the player.
+        crits, dodges, kills (int): Combat counters.
+        xp_gained, gold_gained (int): Rewards collected during the fight.
+        level_ups (int): Number of levels gained.
+        drops (list[Item]): Items dropped by defeated enemies.
+    """
+    def __init__(self):
+        self.result = "ongoing"
+        self.turns = 0
+        self.damage_dealt = 0
+        self.damage_taken = 0
+        self.crits = 0
+        self.dodges = 0
+        self.kills = 0
+        self.xp_gained = 0
+        self.gold_gained = 0
+        self.level_ups = 0
+        self.drops: list[Item] = []
+
+    @property
+    def player_survived(self) -> bool:
+        return self.result != "defeat"
+
+    def to_dict(self):
+        return {
+            "result": self.result,
+            "turns": self.turns,
+            "damage_dealt": self.damage_dealt,
+            "damage_taken": self.damage_taken,
+            "crits": self.crits,
+            "dodges": self.dodges,
+            "kills": self.kills,
+            "xp_gained": self.xp_gained,
+            "gold_gained": self.gold_gained,
+            "level_ups": self.level_ups,
+            "drops": [item.name for item in self.drops if item],
+        }
+
+    def __repr__(self):
+        return f"CombatOutcome({self.result}, turns={self.turns}, kills={self.kills})"
+
+
+def attack_stamina_cost(player: Player) -> int:
+    """Stamina used by a basic attack, depending on the equipped weapons."""
+    if player.equipment.main_hand:
+        return 5
+    elif player.equipment.off_hand:
+        return 10
+    return 2
+
+
+def critical_chance(player: Player) -> float:
+    return 0.025 + player.stats.luck * 0.01 + player.stats.critical_chance * 0.02
+
+
+def run_chance(player: Player) -> float:
+    return 0.3 + player.stats.luck * 0.03
+
+
+def drop_chance(player: Player) -> float:
+    return 0.2 + player.stats.luck * 0.02
+
+
+def basic_policy(player: Player, enemy: Enemy, outcome: CombatOutcome):
+    """Simple automatic policy: drinks a healing potion under 30% HP, attacks otherwise."""
+    if player.stats.hp < player.stats.max_hp * 0.3:
+        for item in player.inventory:
+            if isinstance(item, Potion) and item.effect_type == "heal":
+                return (ITEM, item)
+    return (ATTACK,)
+
+
+def resolve_combat(player: Player,
+                   enemies: list[Enemy],
+                   policy: Callable = basic_policy,
+                   is_boss_room: bool = False,
+                   on_event: Callable | None = None,
+                   drops: bool = True,
+                   silent: bool = True,
+                   max_turns: int | None = None,
+                   rng=None) -> CombatOutcome:
+    """
+    Plays a fight between player and enemies until one side is down or the player escapes.
+
+    enemies is consumed in place: defeated enemies are removed, so after a successful
+    escape the list holds the survivors. on_event(kind, **data) receives every step of
+    the fight (see Room.handle_combat for the interactive renderer). silent is passed
+    to gain_xp, set it to False to get the level up screen and class choice.
+    Rolls come from rng, by default the player's combat stream.
+    """
+    rng = rng or rng_for(player, COMBAT)
+    emit = on_event or (lambda kind, **data: None)
+    outcome = CombatOutcome()
+
+    if not enemies:
+        outcome.result = "victory"
+        return outcome
+
+    enemy = enemies[0]
+    calls = 0  # policy calls, None answers included: a policy that never acts still stops at max_turns
+
+    while enemy.is_alive() and player.is_alive():
+        if max_turns is not None and calls >= max_turns:
+            outcome.result = "stalemate"
+            return outcome
+
+        calls += 1
+        action = policy(player, enemy, outcome)
+        if not action:
+            continue
+
+        kind = action[0]
+        outcome.turns += 1
+
+        if kind == ATTACK:
+            base_damage = player.total_domage()
+
+            critical = rng.random() < critical_chance(player)
+            if critical:
+                player.critical_count += 1
+                outcome.crits += 1
+                base_damage *= 2
+            else:
+                player.attack_count += 1
+
+            stamina_cost = attack_stamina_cost(player)
+            exhausted = player.stats.stamina < stamina_cost
+            if exhausted:
+                base_damage /= 2
+            else:
+                player.use_stamina(stamina_cost)
+
+            damage, absorbed_damage = enemy.stats.take_damage(base_damage)
+            actual_damage = damage + absorbed_damage
+            player.damage_dealt += actual_damage
+            outcome.damage_dealt += actual_damage
+            if config.DEV_AGENT_MODE: try_reward(actual_damage // 10)
+            logger.debug("Player attack: %s %s dmg, %s stm", 'critical hit' if critical else '', actual_damage, stamina_cost)
+            emit("player_attack", enemy=enemy, damage=actual_damage, critical=critical, exhausted=exhausted)
+
+        elif kind == SKILL:
+            dealt = player.apply_skill(action[1], enemy)
+            outcome.damage_dealt += dealt
+            emit("skill", enemy=enemy, skill=action[1], damage=dealt)
+
+        elif kind == ITEM:
+            action[1].use(player)
+            emit("item", item=action[1])
+
+        elif kind == RUN:
+            # No escape from a boss: the attempt fails and the turn is lost
+            if not is_boss_room and rng.random() < run_chance(player):
+                outcome.result = "fled"
+                emit("fled", enemy=enemy)
+                return outcome
+            emit("run_failed", enemy=enemy)
+
+        elif kind != WAIT:
+            raise ValueError(f"Unknown combat action: {action!r}")
+
+        # Check if enemy defeated
+        if not enemy.is_alive():
+            if is_boss_room: player.bosses_defeated += 1
+            player.kills += 1
+            player.souls += 1
+            player.gold += enemy.gold_reward
+            outcome.kills += 1
+            outcome.gold_gained += enemy.gold_reward
+            outcome.xp_gained += enemy.xp_reward
+            emit("enemy_defeated", enemy=enemy)
+            if player.gain_xp(enemy.xp_reward, silent=silent):
+                outcome.level_ups += 1
+            emit("rewards", enemy=enemy, gold=enemy.gold_reward, souls=1)
+
+            if config.DEV_AGENT_MODE: try_reward(10)
+
+            if drops and rng.random() < drop_chance(player):
+                dropped_item = generate_random_item(player=player, enemy=enemy)
+                player.inventory.append(dropped_item)
+                if dropped_item:
+                    outcome.drops.append(dropped_item)
+                emit("drop", enemy=enemy, item=dropped_item)
+
+            enemies.remove(enemy)
+            player.update_quests("kill_enemies")
+
+            if not enemies:
+                outcome.result = "victory"
+                return outcome
+
+            enemy = enemies[0]
+            emit("next_enemy", enemy=enemy)
+
+        # Enemy turn
+        if enemy.is_alive():
+            emit("enemy_turn", enemy=enemy)
+            if rng.random() < player.dodge_chance():
+                outcome.dodges += 1
+                emit("dodge", enemy=enemy)
+            else:
+                damage = enemy.strike(player)
+                outcome.damage_taken += damage
+                emit("enemy_attack", enemy=enemy, damage=damage)
+            emit("enemy_turn_end", enemy=enemy)
+
+    outcome.result = "victory" if player.is_alive() else "defeat"
+    return outcome
@@ -0,0 +1,275 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.entity import Player, Enemy
+
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+
+"""
+Vectorized combat kernel.
+
+Resolves thousands of independent 1 vs 1 duels at once with NumPy, for balance
+sweeps. Each side is stored as a structure of arrays (one row per duel) and
+every turn is one masked vector step using the same rules as
+engine.combat.resolve_combat with an attack-only policy:
+
+    player attack   total_domage(), x2 on a critical hit (combat.critical_chance),
+                    halved when stamina < combat.attack_stamina_cost
+    enemy attack    int(attack * 100 / (100 + defense + total_armor)) (Enemy.strike),
+                    avoided with Player.dodge_chance()
+    damage          temporary HP absorb first, then permanent HP (Stats.take_damage)
+
+Potions, skills and status effects are not modelled, and the player's temporary
+stats are ignored (Enemy.strike resets them at the first hit anyway).
+
+    players = PlayerArrays.from_player(player, 10000)
+    enemies = EnemyArrays.from_enemy(enemy, 10000)
+    results = resolve_duels(players, enemies, seed=0)
+    results.win_rate
+"""
+
+import numpy as np
+
+from engine import combat
+
+
+# Duel results
+ONGOING = 0
+VICTORY = 1
+DEFEAT = 2
+STALEMATE = 3
+
+RESULT_NAMES = {ONGOING: "ongoing", VICTORY: "victory", DEFEAT: "defeat", STALEMATE: "stalemate"}
+
+
+def _layers(stats, name: str):
+    """(permanent, temporary, equipment) values of a stat."""
+    return stats.permanent_stats[name], stats.temporary_stats[name], stats.equipment_stats[name]
+
+
+class PlayerArrays:
+    """Player side of a batch of duels, one row per duel."""
+
+    def __init__(self, hp, hp_bonus, stamina, stamina_bonus, damage, stamina_cost, crit_chance, dodge_chance, armor):
+        self.hp = np.asarray(hp, dtype=np.int64)                    # permanent HP
+        self.hp_bonus = np.asarray(hp_bonus, dtype=np.int64)        # equipment HP, added to hp for is_alive()
+        self.stamina = np.asarray(stamina, dtype=np.float64)        # permanent stamina
+        self.stamina_bonus = np.asarray(stamina_bonus, dtype=np.float64)
+        self.damage = np.asarray(damage, dtype=np.float64)          # total_domage()
+        self.stamina_cost = np.asarray(stamina_cost, dtype=np.float64)
+        self.crit_chance = np.asarray(crit_chance, dtype=np.float64)
+        self.dodge_chance = np.asarray(dodge_chance, dtype=np.float64)
+        self.armor = np.asarray(armor, dtype=np.float64)            # defense + total_armor
+
+    def __len__(self):
+        return len(self.hp)
+
+    @classmethod
+    def from_player(cls, player: Player, n: int = 1) -> PlayerArrays:
+        """n copies of the player as it would enter a fight (permanent + equipment stats)."""
+        stats = player.stats
+        hp, _, hp_bonus = _layers(stats, "hp")
+        stamina, _, stamina_bonus = _layers(stats, "stamina")
+
+        # Same formulas as the scalar engine, without the temporary layer
+        attack = stats.permanent_stats["attack"] + stats.equipment_stats["attack"]
+        damage_main = getattr(player.equipment.main_hand, "damage", 0) or 0
+        damage_off = getattr(player.equipment.off_hand, "damage", 0) or 0
+        if player.equipment.main_hand and player.equipment.off_hand: # Player.total_domage()
+            damage = attack + (damage_main + damage_off) // 1.5
+        else:
+            damage = attack + damage_main
+        luck = stats.permanent_stats["luck"] + stats.equipment_stats["luck"]
+        crit = stats.permanent_stats["critical_chance"] + stats.equipment_stats["critical_chance"]
+        agility = stats.permanent_stats["agility"] + stats.equipment_stats["agility"]
+        defense = stats.permanent_stats["defense"] + stats.equipment_stats["defense"]
+
+        return cls(
+            hp=np.full(n, hp), hp_bonus=np.full(n, hp_bonus),
+            stamina=np.full(n, stamina), stamina_bonus=np.full(n, stamina_bonus),
+            damage=np.full(n, damage),
+            stamina_cost=np.full(n, combat.attack_stamina_cost(player)),
+            crit_chance=np.full(n, 0.025 + luck * 0.01 + crit * 0.02),
+            dodge_chance=np.full(n, max(0.01, min(0.9, agility * 0.01))),
+            armor=np.full(n, defense + player.total_armor),
+        )
+
+
+class EnemyArrays:
+    """Enemy side of a batch of duels, one row per duel."""
+
+    def __init__(self, hp, attack, hp_temp=None):
+        self.hp = np.asarray(hp, dtype=np.float64)
+        self.hp_temp = np.zeros_like(self.hp) if hp_temp is None else np.asarray(hp_temp, dtype=np.float64)
+        self.attack = np.asarray(attack, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.hp)
+
+    @classmethod
+    def from_enemy(cls, enemy: Enemy, n: int = 1) -> EnemyArrays:
+        hp, hp_temp, _ = _layers(enemy.stats, "hp")
+        return cls(np.full(n, hp), np.full(n, enemy.stats.attack), np.full(n, hp_temp))
+
+    @classmethod
+    def from_enemies(cls, enemies: list[Enemy]) -> EnemyArrays:
+        """One row per enemy."""
+        return cls([e.stats.permanent_stats["hp"] for e in enemies],
+                   [e.stats.attack for e in enemies],
+                   [e.stats.temporary_stats["hp"] for e in enemies])
+
+
+class DuelResults:
+    """Per duel arrays returned by resolve_duels."""
+
+    def __init__(self, result, turns, damage_dealt, damage_taken, hp_left):
+        self.result = result
+        self.turns = turns
+        self.damage_dealt = damage_dealt
+        self.damage_taken = damage_taken
+        self.hp_left = hp_left
+
+    def __len__(self):
+        return len(self.result)
+
+    @property
+    def win_rate(self) -> float:
+        return float(np.mean(self.result == VICTORY)) if len(self) else 0.0
+
+    def summary(self) -> dict:
+        won = self.result == VICTORY
+        return {
+            "duels": len(self),
+            "winRate": round(self.win_rate, 4),
+            "stalemates": int(np.sum(self.result == STALEMATE)),
+            "avgTurns": round(float(np.mean(self.turns)), 2) if len(self) else 0,
+            "avgDamageTaken": round(float(np.mean(self.damage_taken)), 2) if len(self) else 0,
+            "avgHpLeftOnWin": round(float(np.mean(self.hp_left[won])), 2) if won.any() else 0,
+        }
+
+    def __repr__(self):
+        return f"DuelResults({len(self)} duels, win_rate={self.win_rate:.3f})"
+
+
+def resolve_duels(players: PlayerArrays, enemies: EnemyArrays, seed=None, max_turns: int = 1000) -> DuelResults:
+    """
+    Plays every duel (row i of players against row i of enemies) until one side is down.
+
+    The arrays are copied, players and enemies are left untouched. seed is anything
+    numpy.random.default_rng accepts (int, Generator or None).
+    """
+    if len(players) != len(enemies):
+        raise ValueError(f"players and enemies must have the same length ({len(players)} != {len(enemies)})")
+
+    rng = np.random.default_rng(seed)
+    n = len(players)
+
+    p_hp = players.hp.copy()
+    p_stamina = players.stamina.copy()
+    e_hp = enemies.hp.copy()
+    e_hp_temp = enemies.hp_temp.copy()
+
+    result = np.full(n, ONGOING, dtype=np.int8)
+    turns = np.zeros(n, dtype=np.int64)
+    damage_dealt = np.zeros(n, dtype=np.float64)
+    damage_taken = np.zeros(n, dtype=np.int64)
+
+    # Duels already over before the first turn
+    result[e_hp + e_hp_temp <= 0] = VICTORY
+    result[(result == ONGOING) & (p_hp + players.hp_bonus <= 0)] = DEFEAT
+
+    active = np.flatnonzero(result == ONGOING)
+    for _ in range(max_turns):
+        if not active.size:
+            break
+        turns[active] += 1
+
+        # --- Player attack ---
+        dmg = players.damage[active] * np.where(rng.random(active.size) < players.crit_chance[active], 2, 1)
+        cost = players.stamina_cost[active]
+        exhausted = p_stamina[active] + players.stamina_bonus[active] < cost
+        dmg = np.where(exhausted, dmg / 2, dmg)
+        p_stamina[active] = np.where(exhausted, p_stamina[active], np.maximum(0, p_stamina[active] - cost))
+
+        # Stats.take_damage: temporary HP first, then int(max(0, hp - rest))
+        temp = e_hp_temp[active]
+        absorbed = np.where(temp > 0, np.minimum(temp, dmg), 0)
+        e_hp_temp[active] = temp - np.trunc(absorbed)
+        rest = dmg - absorbed
+        e_hp[active] = np.where(rest > 0, np.trunc(np.maximum(0, e_hp[active] - rest)), e_hp[active])
+        damage_dealt[active] += dmg
+
+        killed = e_hp[active] + e_hp_temp[active] <= 0
+        result[active[killed]] = VICTORY
+        active = active[~killed]
+
+        # --- Enemy turn ---
+        hit = active[rng.random(active.size) >= players.dodge_chance[active]]
+        enemy_dmg = np.trunc(enemies.attack[hit] * (100 / (100 + players.armor[hit]))).astype(np.int64)
+        p_hp[hit] = np.maximum(0, p_hp[hit] - enemy_dmg)
+        damage_taken[hit] += enemy_dmg
+
+        dead = p_hp[active] + players.hp_bonus[active] <= 0
+        result[active[dead]] = DEFEAT
+        active = active[~dead]
+
+    result[active] = STALEMATE
+    return DuelResults(result, turns, damage_dealt, damage_taken, p_hp + players.hp_bonus)
+
+
+def enemy_stat_arrays(level: int, enemy_data: list[dict], index, is_boss: bool = False, ng_plus: int = 0):
+    """
+    (hp, attack) arrays for the enemy types enemy_data[index], with the formulas of
+    core.entity.generate_enemy (base stats by level, modifiers, boss and NG+ multipliers).
+    """
+    hp_mod = np.array([e["hp_mod"] for e in enemy_data])[index]
+    atk_mod = np.array([e["atk_mod"] for e in enemy_data])[index]
+
+    hp = np.trunc((20 + level * 10) * hp_mod)
+    attack = np.trunc((5 + level * 2) * atk_mod)
+
+    if is_boss:
+        hp *= 2
+        attack = np.trunc(attack * 1.5)
+
+    diff_mltp = max(1, ng_plus * 0.1)
+    return np.trunc(hp * diff_mltp), np.trunc(attack * diff_mltp)
+
+
+def sample_enemies(level: int, n: int, is_boss: bool = False, ng_plus: int = 0,
+                   overrides: dict | None = None, seed=None) -> EnemyArrays:
+    """
+    n enemies drawn like generate_enemy does for this level (same valid types and weights).
+    overrides = {"Goblin": {"hp_mod": 1.2}, ...} replaces modifiers to try a balance change.
+    """
+    from core.entity import enemy_candidates
+
+    valid_types, cum_weights = enemy_candidates(level, is_boss)
+    if overrides:
+        valid_types = [{**e, **overrides.get(e["name"], {})} for e in valid_types]
+
+    weights = np.diff(cum_weights, prepend=0)
+    index = np.random.default_rng(seed).choice(len(valid_types), size=n, p=weights / weights.sum())
+    hp, attack = enemy_stat_arrays(level, valid_types, index, is_boss, ng_plus)
+    return EnemyArrays(hp, attack)
+
+
+def level_sweep(players: dict[int, Player] | Player, levels=range(1, 11), n: int = 10000,
+                is_boss: bool = False, ng_plus: int = 0, overrides: dict | None = None, seed=None) -> dict:
+    """
+    Win rate (and other summaries) of n duels per dungeon level.
+    players is one Player for every level or {level: Player}.
+    """
+    rng = np.random.default_rng(seed)
+    report = {}
+    for level in levels:
+        player = players[level] if isinstance(players, dict) else players
+        enemies = sample_enemies(level, n, is_boss, ng_plus, overrides, seed=rng)
+        report[level] = resolve_duels(PlayerArrays.from_player(player, n), enemies, seed=rng).summary()
+    return report
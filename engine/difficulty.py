@@ -129,7 +129,8 @@ class Difficulty:
         print(f"\r{Colors.YELLOW}║ {Colors.BRIGHT_BLUE}{mana_text.ljust(box_len)}{Colors.RESET}")
         print(f"\r{Colors.YELLOW}║ {mana_bar.ljust(box_len)}{Colors.RESET}")
 
-        logger.info(f"Player: {player.stats.hp}/{player.stats.max_hp} hp, {player.stats.stamina}/{player.stats.max_stamina} stm, {player.stats.mana}/{player.stats.max_mana} mana")
+        logger.info("Player: %s/%s hp, %s/%s stm, %s/%s mana", player.stats.hp, player.stats.max_hp,
+                    player.stats.stamina, player.stats.max_stamina, player.stats.mana, player.stats.max_mana)
 
         # Skip separator line
         print("\033[1B", end="")
@@ -144,7 +145,7 @@ class Difficulty:
         print(f"\r{Colors.YELLOW}║ {Colors.RED}{enemy_hp_text.ljust(box_len)}{Colors.RESET}")
         print(f"\r{Colors.YELLOW}║ {enemy_hp_bar.ljust(box_len)}{Colors.RESET}")
 
-        logger.info(f"{enemy.name}: {enemy.stats.hp}/{enemy.stats.max_hp} hp")
+        logger.info("%s: %s/%s hp", enemy.name, enemy.stats.hp, enemy.stats.max_hp)
 
         # Bottom border
         print(f"{Colors.YELLOW}╚{'═' * (box_len + 1)}╝{Colors.RESET}")
@@ -210,14 +211,14 @@ class Difficulty:
 
     def _intro_message(self, enemy, is_boss_room):
         if is_boss_room:
-            logger.info(f"Boss Enconter: {enemy.name}")
+            logger.info("Boss Enconter: %s", enemy.name)
             print(f"\n{Colors.RED}{Colors.BOLD}╔══════════════════════════════════════════╗")
             print(f"║              BOSS ENCOUNTER              ║")
             print(f"╚══════════════════════════════════════════╝{Colors.RESET}")
             typewriter_effect(f"\n{Colors.RED}{Colors.BOLD}The {enemy.name} emerges from the shadows!{Colors.RESET}", 0.03 * config.game_speed_multiplier)
             sleep(1)
         else:
-            logger.info(f"Enemy enconter: {enemy.name}")
+            logger.info("Enemy enconter: %s", enemy.name)
             print(f"\n{Colors.RED}A {enemy.name} appears!{Colors.RESET}")
             sleep(0.5)
 
@@ -275,14 +276,14 @@ class Difficulty:
         }
     
     def get_ng_plus(self, player: Player) -> int:
-        return player.ng_plus[self.name]
+        return player.ng_plus.get(self.name, 0)
     
 
     # ----- Exploration -----
 
-    def get_room_count(self):
+    def get_room_count(self, rng=random):
         # Valeur par défaut
-        return random.randint(5, 8)
+        return rng.randint(5, 8)
 
     def maybe_trigger_event(self, player):
         if random.random() < 0.2:  # 20% de chance
@@ -298,11 +299,11 @@ class Difficulty:
     def get_rarity_boost(self):
         return 1.0
     
-    def get_shop_item_num(self) -> int:
-        return random.randint(5, 7)
+    def get_shop_item_num(self, rng=random) -> int:
+        return rng.randint(5, 7)
     
-    def get_treasure_item_num(self):
-        return random.randint(1, 2)
+    def get_treasure_item_num(self, rng=random):
+        return rng.randint(1, 2)
     
     def allows_resources(self) -> bool:
         return True
@@ -343,14 +344,14 @@ class HardcoreDifficulty(Difficulty):
             "agility": 0
         }
 
-    def get_shop_item_num(self):
-        return random.randint(1, 3)
+    def get_shop_item_num(self, rng=random):
+        return rng.randint(1, 3)
 
-    def get_treasure_item_num(self):
-        return random.randint(0, 2)
+    def get_treasure_item_num(self, rng=random):
+        return rng.randint(0, 2)
 
-    def get_room_count(self):
-        return random.randint(10, 15)
+    def get_room_count(self, rng=random):
+        return rng.randint(10, 15)
 
     def get_available_rarities(self):
         return ["common", "uncommon", "rare"]
@@ -383,11 +384,11 @@ class NormalDifficulty(Difficulty):
             "agility": 1
         }
     
-    def get_shop_item_num(self):
-        return random.randint(5, 7)
+    def get_shop_item_num(self, rng=random):
+        return rng.randint(5, 7)
 
-    def get_treasure_item_num(self):
-        return random.randint(1, 2)
+    def get_treasure_item_num(self, rng=random):
+        return rng.randint(1, 2)
 
     def allows_resources(self) -> bool:
         return False
@@ -421,14 +422,14 @@ class SoulsDifficulty(Difficulty):
             "agility": 1
         }
 
-    def get_shop_item_num(self):
-        return random.randint(3, 6)
+    def get_shop_item_num(self, rng=random):
+        return rng.randint(3, 6)
 
-    def get_room_count(self):
-        return random.randint(6, 10)
+    def get_room_count(self, rng=random):
+        return rng.randint(6, 10)
 
-    def get_treasure_item_num(self):
-        return random.randint(0, 1)
+    def get_treasure_item_num(self, rng=random):
+        return rng.randint(0, 1)
 
 class RealisticDifficulty(Difficulty):
     def __init__(self):
@@ -464,8 +465,8 @@ class RealisticDifficulty(Difficulty):
             "agility": 0
         }
     
-    def get_room_count(self):
-        return random.randint(50, 100)
+    def get_room_count(self, rng=random):
+        return rng.randint(50, 100)
 
     def get_available_rarities(self):
         return ["common", "uncommon", "rare", "epic", "legendary", "divine", "???"]
@@ -473,11 +474,11 @@ class RealisticDifficulty(Difficulty):
     def get_rarity_boost(self):
         return 1.0
 
-    def get_shop_item_num(self):
-        return random.randint(2, 5)
+    def get_shop_item_num(self, rng=random):
+        return rng.randint(2, 5)
 
-    def get_treasure_item_num(self):
-        return random.randint(1, 2)
+    def get_treasure_item_num(self, rng=random):
+        return rng.randint(1, 2)
 
 
 class PuzzleDifficulty(Difficulty):
@@ -509,8 +510,8 @@ class PuzzleDifficulty(Difficulty):
             "agility": 1
         }
 
-    def get_room_count(self):
-        return random.randint(5, 7)
+    def get_room_count(self, rng=random):
+        return rng.randint(5, 7)
 
     def get_available_rarities(self):
         return ["common", "uncommon", "rare", "epic", "legendary", "divine", "???"]
@@ -518,6 +519,6 @@ class PuzzleDifficulty(Difficulty):
     def get_rarity_boost(self):
         return 1.1
 
-    def get_shop_item_num(self):
-        return random.randint(3, 5)
+    def get_shop_item_num(self, rng=random):
+        return rng.randint(3, 5)
 
@@ -5,6 +5,7 @@ __creation__ = "09-03-2025"
 # Li​c​en​s​e​d ​u​n​d​e​r ​C​C​-​BY​-​NC​ ​4.​0
 
 
+import logging
 import random
 from math import ceil
 
@@ -31,12 +32,14 @@ from engine.game_utility import (clear_screen, typewriter_effect,
                           get_input
                           )
 from interface.colors import Colors
-from core.entity import Player, Enemy, generate_enemy
+from core.entity import Player, Enemy, generate_enemies
 from items.items import Item, Armor, Weapon, Potion, generate_random_item, generate_random_resource_item
 from core.spells import get_random_scroll, get_random_spell
 from data import room_descriptions, puzzle_choices, rest_events
 from engine.logger import logger
 from engine.difficulty import RealisticDifficulty
+from engine import combat, layout_pool, telemetry
+from engine.rng import rng_for, GENERATION, TRAPS
 
 
 debug = 0
@@ -123,7 +126,7 @@ class Room:
         global debug
         if debug >= 1:
             print(f"{Colors.YELLOW}DEBUG: Entering room of type '{self.room_type}' with description: {self.description}{Colors.RESET}")
-        logger.info(f"Player entering room of type '{self.room_type}' with description: {self.description}")
+        logger.info("Player entering room of type '%s' with description: %s", self.room_type, self.description)
         if not self.visited:
             
             splited_desc = self.description.split('\n') if '\n' in self.description else [self.description]
@@ -137,10 +140,10 @@ class Room:
             self.visited = True
         else:
             print(f"\n{Colors.CYAN}You've returned to {self.description}{Colors.RESET}")
-            logger.info(f"Player returned to room: {self.description}")
+            logger.info("Player returned to room: %s", self.description)
         
         if self.trap and not self.trap["triggered"]:
-            logger.warning(f"Trap triggered in room: {self.description} - Trap details: {self.trap}")
+            logger.warning("Trap triggered in room: %s - Trap details: %s", self.description, self.trap)
             self.trigger_trap(player)
             
         return self.handle_room(player)
@@ -150,19 +153,19 @@ class Room:
             return None
         print(f"\n{Colors.RED}{Colors.BOLD}*CLICK*{Colors.RESET}")
         player.traps_triggered +=1
-        logger.info(f"Trap activated: {self.trap['description']}")
+        logger.info("Trap activated: %s", self.trap['description'])
         sleep(0.5 * config.game_speed_multiplier)
         print(f"{Colors.RED}It's a trap! {self.trap['description']}{Colors.RESET}")
         
         # Give player a chance to avoid the trap based on luck
-        if random.random() < (0.1 + player.stats.luck * 0.01 + player.stats.agility * 0.01):
+        if rng_for(player, TRAPS).random() < (0.1 + player.stats.luck * 0.01 + player.stats.agility * 0.01):
             print(f"{Colors.GREEN}Thanks to your quick reflexes, you manage to avoid the trap!{Colors.RESET}")
             logger.info("Player avoided the trap due to quick reflexes.")
         else:
             if self.trap["type"] == "damage":
                 damage = self.trap["value"]
                 player.stats.modify_stat(stat_name="hp", value=-damage)
-                logger.info(f"Player took {damage} damage from trap.")
+                logger.info("Player took %s damage from trap.", damage)
                 #player.stats.hp = max(0, player.stats.hp - damage)
                 print(f"{Colors.RED}You take {damage} damage from the trap!{Colors.RESET}")
             elif self.trap["type"] == "stat_reduction":
@@ -170,11 +173,11 @@ class Room:
                 value = self.trap["value"]
                 if stat == "attack":
                     player.stats.modify_stat(stat_name="attack", value=-value, stat_type="temporary")
-                    logger.info(f"Player's attack temporarily reduced by {value} due to trap.")
+                    logger.info("Player's attack temporarily reduced by %s due to trap.", value)
                     print(f"{Colors.RED}Your attack is temporary reduced by {value}!{Colors.RESET}")
                 elif stat == "defense":
                     player.stats.modify_stat(stat_name="defense", value=-value, stat_type="temporary")
-                    logger.info(f"Player's defense temporarily reduced by {value} due to trap.")
+                    logger.info("Player's defense temporarily reduced by %s due to trap.", value)
                     print(f"{Colors.RED}Your defense is temporary reduced by {value}!{Colors.RESET}")
         
         self.trap["triggered"] = True
@@ -184,7 +187,7 @@ class Room:
 
         if debug >= 1:
             print(f"\n{Colors.YELLOW}DEBUG: Entering handle_room() for \"{self.room_type}\"{Colors.RESET}")
-        logger.debug(f"handle_room() called for room type \"{self.room_type}\"")
+        logger.debug("handle_room() called for room type \"%s\"", self.room_type)
         
         if self.room_type == "combat":
             if debug >= 1:
@@ -247,7 +250,7 @@ class Room:
         puzzle_types = ["riddle", "number", "sequence", "choice", "dice"]
         puzzle_type = random.choice(puzzle_types)
         
-        logger.info(f"Player encountered a puzzle of type: {puzzle_type}")
+        logger.info("Player encountered a puzzle of type: %s", puzzle_type)
         print(f"\n{Colors.CYAN}You encounter a puzzle.{Colors.RESET}")
 
         if tutorial is True:
@@ -280,7 +283,7 @@ class Room:
         target = random.randint(1, 20)
         attempts = 5
         
-        logger.info(f"Number puzzle target is {target} with {attempts} attempts allowed.")
+        logger.info("Number puzzle target is %s with %s attempts allowed.", target, attempts)
         print(f"\n{Colors.CYAN}There's a strange mechanical device with numbered dials.{Colors.RESET}")
         print(f"{Colors.YELLOW}You need to guess the correct number between 1 and 20.{Colors.RESET}")
         print(f"{Colors.GREEN}The device will tell you if your guess is higher or lower than the target.{Colors.RESET}")
@@ -289,14 +292,14 @@ class Room:
             try:
                 guess_str = get_input(f"\n{Colors.YELLOW}Your guess (attempt {attempt+1}/{attempts}): {Colors.RESET}", options=None, player=player)
                 guess = int(guess_str)
-                logger.debug(f"Player guessed {guess} on attempt {attempt+1}")
+                logger.debug("Player guessed %s on attempt %s", guess, attempt+1)
                 if guess == target:
                     print(f"\n{Colors.GREEN}Correct! The device whirs and opens.{Colors.RESET}")
                     
                     # Generate reward
                     gold_amount = random.randint(20, 50) * player.dungeon_level
                     player.gold += gold_amount
-                    logger.info(f"Player guessed correctly and won {gold_amount} gold.")
+                    logger.info("Player guessed correctly and won %s gold.", gold_amount)
                     print(f"{Colors.YELLOW}You found {gold_amount} gold!{Colors.RESET}")
                     
                     return True
@@ -309,7 +312,7 @@ class Room:
                 print(f"{Colors.RED}Please enter a valid number.{Colors.RESET}")
                 attempt -= 1  # Don't count invalid inputs as attempts
         
-        logger.info(f"Player failed to guess the number. The correct number was {target}.")
+        logger.info("Player failed to guess the number. The correct number was %s.", target)
         print(f"\n{Colors.RED}You failed to guess the number. The correct number was {target}.{Colors.RESET}")
         print(f"{Colors.YELLOW}The device resets and nothing happens.{Colors.RESET}")
         
@@ -545,7 +548,7 @@ class Room:
         return True
 
     def handle_combat(self, player: Player, is_boss_room = False, tutorial = False):
-        """Gère un combat, normal ou contre un boss, de manière optimisée avec timing-based mechanic et UI améliorée."""
+        """Gère un combat, normal ou contre un boss. Les règles sont dans engine.combat, ici on ne fait que l'affichage et les choix du joueur."""
         USE_AGENT = False
         if config.DEV_AGENT_MODE:
             try:
@@ -561,16 +564,16 @@ class Room:
 
         if tutorial is True: player.difficulty._show_tutorial_intro(is_boss_room)
 
-        enemy = self.enemies[0]
         get_input(f'\n{Colors.BOLD}{Colors.RED}Press enter to begin the combat{Colors.RESET}', player=player)
         sleep(0.3)
         clear_screen()
 
-        player.difficulty._intro_message(enemy, is_boss_room)
+        player.difficulty._intro_message(self.enemies[0], is_boss_room)
         
         one_time_message = True
 
-        while enemy.is_alive() and player.is_alive():
+        def player_turn(player: Player, enemy: Enemy, outcome):
+            nonlocal one_time_message
             player.difficulty._display_combat_status(player, enemy)
 
             if tutorial is True and one_time_message is True:
@@ -599,48 +602,17 @@ class Room:
             choice = get_input(f"\n{Colors.CYAN}What will you do? {Colors.RESET}", options=options, player=player)
 
             if choice == "1":  # Normal attack without timing mechanic (simpler)
-                base_damage = player.total_domage()
-
-                # Critical hit chance
-                critical = random.random() < (0.025 + player.stats.luck * 0.01 + player.stats.critical_chance * 0.02)
-                if critical:
-                    player.critical_count += 1
-                    base_damage *= 2
-                    print(f"{Colors.BRIGHT_YELLOW}{Colors.BOLD}CRITICAL HIT!{Colors.RESET}")
-                    sleep(0.1)
-                else:
-                    player.attack_count += 1
-
-                # Stamina cost
-                if player.equipment.main_hand:
-                    stamina_cost = 5
-                elif player.equipment.off_hand:
-                    stamina_cost = 10
-                else:
-                    stamina_cost = 2
-
-                if player.stats.stamina >= stamina_cost:
-                    player.use_stamina(stamina_cost)
-                else:
-                    print(f"{Colors.RED}You're exhausted! Your attack is weaker...{Colors.RESET}")
-                    base_damage /= 2
-
-                # Attacks
-                damage, absorbed_damage = enemy.stats.take_damage(base_damage)
-                actual_damage = damage + absorbed_damage
-                player.damage_dealt += actual_damage
-                if config.DEV_AGENT_MODE: try_reward(actual_damage // 10)
-                logger.info(f"Player attack: {'critical hit' if critical else ''} {actual_damage} dmg, {stamina_cost} stm")
-                print(f"You deal {Colors.RED}{ceil(actual_damage)}{Colors.RESET} damage to {enemy.name}!")
+                return (combat.ATTACK,)
 
             elif choice == "2" and player.skills:  # Use skill with timing mechanic
-                player.use_skill(enemy)
+                skill = player.choose_skill()
+                return (combat.SKILL, skill) if skill else (combat.WAIT,)
 
             elif choice == "3":  # Use item
                 potions = [item for item in player.inventory if isinstance(item, Potion)]
                 if not potions:
                     print(f"{Colors.RED}You don't have any usable items in combat!{Colors.RESET}")
-                    continue
+                    return None
                 
                 print(f"\n{Colors.GREEN}Your Items:{Colors.RESET}")
                 for i, item in enumerate(potions, 1):
@@ -649,120 +621,124 @@ class Room:
                 try:
                     item_choice = int(get_input(f"\n{Colors.CYAN}Choose an item to use (0 to cancel): {Colors.RESET}", options=[str(i) for i in range(len(potions) + 1)], player=player, use_agent=USE_AGENT))
                     if 1 <= item_choice <= len(potions):
-                        potions[item_choice - 1].use(player)
-                    else:
-                        print(f"{Colors.RED}Invalid choice.{Colors.RESET}")
+                        return (combat.ITEM, potions[item_choice - 1])
+                    print(f"{Colors.RED}Invalid choice.{Colors.RESET}")
+                    return (combat.WAIT,)
                 except ValueError:
                     print(f"{Colors.RED}Please enter a number.{Colors.RESET}")
-                    continue
+                    return None
 
             elif choice == "4" and not is_boss_room:  # Try to run
-                if random.random() < (0.3 + player.stats.luck * 0.03):
-                    print(f"{Colors.GREEN}You successfully escape !{Colors.RESET}")
-                    return True
-                else:
-                    print(f"{Colors.RED}You failed to escape !{Colors.RESET}")
+                return (combat.RUN,)
 
-            else:
-                print(f"{Colors.RED}Invalid choice. Please try again.{Colors.RESET}")
-                continue
-
-            # Check if enemy defeated
-            if not enemy.is_alive():
-                if is_boss_room: player.bosses_defeated += 1
-                player.kills += 1
-                player.souls += 1
-                player.gold += enemy.gold_reward
+            print(f"{Colors.RED}Invalid choice. Please try again.{Colors.RESET}")
+            return None
+
+        def render(kind, enemy=None, **data):
+            if kind == "player_attack":
+                if data["critical"]:
+                    print(f"{Colors.BRIGHT_YELLOW}{Colors.BOLD}CRITICAL HIT!{Colors.RESET}")
+                    sleep(0.1)
+                if data["exhausted"]:
+                    print(f"{Colors.RED}You're exhausted! Your attack is weaker...{Colors.RESET}")
+                print(f"You deal {Colors.RED}{ceil(data['damage'])}{Colors.RESET} damage to {enemy.name}!")
+
+            elif kind == "fled":
+                print(f"{Colors.GREEN}You successfully escape !{Colors.RESET}")
+
+            elif kind == "run_failed":
+                print(f"{Colors.RED}You failed to escape !{Colors.RESET}")
+
+            elif kind == "enemy_defeated":
                 print(f"\n{Colors.GREEN}You defeated the {enemy.name} !{Colors.RESET}\n")
-                player.gain_xp(enemy.xp_reward)
-                print(f"{Colors.YELLOW}You gain {enemy.gold_reward} gold !{Colors.RESET}")
-                print(f"{Colors.BRIGHT_BLACK}You gain 1 souls !{Colors.RESET}\n")
-
-                if config.DEV_AGENT_MODE: try_reward(10)
-
-                # Item drop
-                if is_boss_room:
-                    dropped_item = generate_random_item(player=player, enemy=enemy, rarity_boost=1.5)
-
-                if tutorial is False:
-                    if random.random() < (0.2 + player.stats.luck * 0.02):
-                        dropped_item = generate_random_item(player=player, enemy=enemy)
-                        player.inventory.append(dropped_item)
-                        if dropped_item:
-                            print(f"{Colors.GREEN}The {enemy.name} dropped: {dropped_item.name} !{Colors.RESET}")
-                        sleep(2)
-                
-                elif tutorial is True and not is_boss_room:
-                    sleep(0.5)
-                    # Tell the player he can get an item
-                    typewriter_effect(f"[Assistant]: {Colors.BRIGHT_BLACK}After combat, there is a chance that you get an item depending on the enemy type.{Colors.RESET}", 0.05 * config.game_speed_multiplier, " ")
-                    sleep(0.2)
-                    typewriter_effect(f"As it's a tutorial, I will grant you one.{Colors.RESET}", 0.05 * config.game_speed_multiplier)
-                    sleep(1)
-                    typewriter_effect(f"[Assistant]: {Colors.BLUE}Requesting permission..{Colors.RESET}", 0.05 * config.game_speed_multiplier)
-                    loading(2)
-                    typewriter_effect(f"[Assistant]: {Colors.GREEN}Permission allowed, executing command...{Colors.RESET}\n", 0.03 * config.game_speed_multiplier)
-                    sleep(1)
-                    generated_item = execute_command(
-                        "generate_random_item(player=player, enemy=enemy)",
-                        allowed=True,
-                        prnt=True,
-                        rtn=True,
-                        context={
-                            "generate_random_item": generate_random_item,
-                            "player": player,
-                            "enemy": enemy,
-                        }
-                    )
-                    sleep(0.5)
-                    execute_command(
-                        "player.inventory.append(generated_item)",
-                        allowed=True,
-                        prnt=True,
-                        context={
-                            "player":player,
-                            "generated_item": generated_item,
-                        }
-                    )
-                    sleep(0.5)
-                    typewriter_effect(f"\n[Assistant]: {Colors.GREEN}Item added succesfully.{Colors.RESET}\n", 0.03 * config.game_speed_multiplier)
-                    print(f"{Colors.GREEN}The {enemy.name} dropped: {generated_item.name if isinstance(generated_item, Item) else 'Unknow error'} !{Colors.RESET}")
-                    sleep(2)
-
-
-                self.enemies.remove(enemy)
-
-                # Quest progress
-                """
-                for quest in player.quests:
-                    if quest.objective_type == "kill_enemies" and not quest.completed:
-                        if quest.update_progress():
-                            print(f"\n{Colors.BRIGHT_GREEN}{Colors.BOLD}Quest Completed: {quest.title}!{Colors.RESET}")
-                """
-                player.update_quests("kill_enemies")
-
-
-                if self.enemies:
-                    enemy = self.enemies[0]
-                    print(f"\n{Colors.RED}A {enemy.name}{Colors.RED} appears !{Colors.RESET}")
-                    sleep(0.5)
-                else:
-                    if not player.is_alive():
-                        player.increment_deaths_in_room(player.difficulty.name, player.current_room_number)
-                    return True
 
-            # Enemy turn
-            if enemy.is_alive():
+            elif kind == "rewards":
+                print(f"{Colors.YELLOW}You gain {data['gold']} gold !{Colors.RESET}")
+                print(f"{Colors.BRIGHT_BLACK}You gain {data['souls']} souls !{Colors.RESET}\n")
+                if tutorial is True and not is_boss_room:
+                    self._tutorial_drop(player, enemy)
+
+            elif kind == "drop":
+                if data["item"]:
+                    print(f"{Colors.GREEN}The {enemy.name} dropped: {data['item'].name} !{Colors.RESET}")
+                sleep(2)
+
+            elif kind == "next_enemy":
+                print(f"\n{Colors.RED}A {enemy.name}{Colors.RED} appears !{Colors.RESET}")
+                sleep(0.5)
+
+            elif kind == "enemy_turn":
                 print(f"\n{Colors.RED}{enemy.name} attacks !{Colors.RESET}")
                 sleep(1.5)
-                if random.random() < player.dodge_chance():
-                    print(f"{Colors.GREEN}You dodged the attack !{Colors.RESET}")
-                else:
-                    enemy.attack_player(player)
+
+            elif kind == "dodge":
+                print(f"{Colors.GREEN}You dodged the attack !{Colors.RESET}")
+
+            elif kind == "enemy_attack":
+                print(f"{enemy.name} attacks you for {Colors.RED}{data['damage']}{Colors.RESET} damage!")
+
+            elif kind == "enemy_turn_end":
                 sleep(1.5)
+
+        def on_event(kind, enemy=None, **data):
+            if kind in ("player_attack", "skill"):
+                telemetry.record(telemetry.DAMAGE_DEALT, player, data["damage"], enemy.name, data.get("critical", False))
+            elif kind == "enemy_attack":
+                telemetry.record(telemetry.DAMAGE_TAKEN, player, data["damage"], enemy.name)
+            elif kind == "drop" and data["item"]:
+                telemetry.record(telemetry.DROP, player, data["item"].value, data["item"].name)
+            render(kind, enemy, **data)
+
+        telemetry.record(telemetry.FIGHT_START, player, len(self.enemies), self.enemies[0].name, is_boss_room)
+        outcome = combat.resolve_combat(player, self.enemies, player_turn,
+                                        is_boss_room=is_boss_room,
+                                        on_event=on_event,
+                                        drops=not tutorial,
+                                        silent=False)
+        telemetry.record(telemetry.FIGHT_END, player, outcome.damage_taken, outcome.result, is_boss_room)
+
         if not player.is_alive():
             player.increment_deaths_in_room(player.difficulty.name, player.current_room_number)
-        return player.is_alive()
+            telemetry.record(telemetry.DEATH, player, outcome.damage_taken, self.enemies[0].name if self.enemies else None, is_boss_room)
+        return outcome.player_survived
+
+    def _tutorial_drop(self, player: Player, enemy: Enemy):
+        """Drop garanti du tutoriel, avec la mise en scène de l'assistant."""
+        sleep(0.5)
+        # Tell the player he can get an item
+        typewriter_effect(f"[Assistant]: {Colors.BRIGHT_BLACK}After combat, there is a chance that you get an item depending on the enemy type.{Colors.RESET}", 0.05 * config.game_speed_multiplier, " ")
+        sleep(0.2)
+        typewriter_effect(f"As it's a tutorial, I will grant you one.{Colors.RESET}", 0.05 * config.game_speed_multiplier)
+        sleep(1)
+        typewriter_effect(f"[Assistant]: {Colors.BLUE}Requesting permission..{Colors.RESET}", 0.05 * config.game_speed_multiplier)
+        loading(2)
+        typewriter_effect(f"[Assistant]: {Colors.GREEN}Permission allowed, executing command...{Colors.RESET}\n", 0.03 * config.game_speed_multiplier)
+        sleep(1)
+        generated_item = execute_command(
+            "generate_random_item(player=player, enemy=enemy)",
+            allowed=True,
+            prnt=True,
+            rtn=True,
+            context={
+                "generate_random_item": generate_random_item,
+                "player": player,
+                "enemy": enemy,
+            }
+        )
+        sleep(0.5)
+        execute_command(
+            "player.inventory.append(generated_item)",
+            allowed=True,
+            prnt=True,
+            context={
+                "player":player,
+                "generated_item": generated_item,
+            }
+        )
+        sleep(0.5)
+        typewriter_effect(f"\n[Assistant]: {Colors.GREEN}Item added succesfully.{Colors.RESET}\n", 0.03 * config.game_speed_multiplier)
+        print(f"{Colors.GREEN}The {enemy.name} dropped: {generated_item.name if isinstance(generated_item, Item) else 'Unknow error'} !{Colors.RESET}")
+        sleep(2)
 
     
     def handle_treasure(self, player:Player, tutorial=False):
@@ -1248,7 +1224,7 @@ class Room:
 
         if debug >= 1:
             print(f"\n{Colors.YELLOW}DEBUG: Entering handle_tutorial() for \"{self.room_type}\"{Colors.RESET}")
-        logger.debug(f"handle_tutorial() called for room type \"{self.room_type}\"")
+        logger.debug("handle_tutorial() called for room type \"%s\"", self.room_type)
 
 
         if self.room_type == "combat_tutorial":
@@ -1442,7 +1418,7 @@ class Room:
         global debug
         if debug >= 1:
             print(f"\n{Colors.YELLOW}DEBUG: Entering handle_inter_level() for \"{self.room_type}\"{Colors.RESET}")
-        logger.debug(f"handle_inter_level() called for room type \"{self.room_type}\"")
+        logger.debug("handle_inter_level() called for room type \"%s\"", self.room_type)
 
         # Saving stats
         player.save_difficulty_data()
@@ -1459,7 +1435,7 @@ class Room:
         special_rooms = ["workshop", "shop", "fountain", "blessing", "forsaken_chapel"]
         room_type = random.choice(special_rooms)
 
-        logger.info(f"Player encountered inter-level room of type: {room_type}")
+        logger.info("Player encountered inter-level room of type: %s", room_type)
         print(f"\n{Colors.CYAN}You enter a special room...{Colors.RESET}")
 
         if room_type == "workshop":
@@ -1564,8 +1540,65 @@ class Dungeon(list):
     def append(self, object):
         return super().append(object)
 
+    def next_room(self, player: Player) -> Room:
+        """Retire la prochaine salle et la génère si ce n'est encore qu'un plan."""
+        room = self.pop(0)
+        if isinstance(room, RoomPlan):
+            room = room.materialize(player)
+        return room
+
+    def to_dict(self):
+        """Only the plans are saved, rooms already generated are not."""
+        return [plan.to_dict() for plan in self if isinstance(plan, RoomPlan)]
+
+    @classmethod
+    def from_dict(cls, data):
+        dungeon = cls()
+        dungeon.extend(RoomPlan.from_dict(plan) for plan in data or [])
+        return dungeon
+
+
+class RoomPlan:
+    """
+    Lightweight description of a room that is not generated yet.
+
+    generate_dungeon only decides the type, a seed and the coordinates of each room;
+    enemies, items and traps are generated by materialize() when the room is entered,
+    always the same way for a given seed. A plan without seed is an empty room
+    (start, inter level, rooms of the puzzle mode).
+    """
+    __slots__ = ("room_type", "seed", "coords", "description", "is_boss_room")
+
+    def __init__(self, room_type: str, seed: int|None = None, coords: tuple = (), description: str|None = None, is_boss_room=False):
+        self.room_type = room_type
+        self.seed = seed
+        self.coords = tuple(coords)
+        self.description = description
+        self.is_boss_room = is_boss_room
+
+    def materialize(self, player: Player) -> Room:
+        if self.seed is None:
+            return Room(self.room_type, self.description, [], [], None)
+        return generate_random_room(player=player, room_type=self.room_type, is_boss_room=self.is_boss_room, rng=random.Random(self.seed))
+
+    def to_dict(self):
+        return {
+            "room_type": self.room_type,
+            "seed": self.seed,
+            "coords": list(self.coords),
+            "description": self.description,
+            "is_boss_room": self.is_boss_room,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["room_type"], data.get("seed"), data.get("coords", ()), data.get("description"), data.get("is_boss_room", False))
+
+    def __repr__(self):
+        return f"RoomPlan({self.room_type}, seed={self.seed}, coords={self.coords})"
+
 def generate_shop_inventory(level):
-    logger.info(f"Generating shop inventory for level {level}")
+    logger.debug("Generating shop inventory for level %s", level)
     shop_items = [
         Weapon("Short Sword", "A basic sword for beginners.", 30, 4),
         Weapon("Iron Mace", "A heavy but strong weapon.", 50, 6),
@@ -1574,30 +1607,36 @@ def generate_shop_inventory(level):
         Potion("Healing Potion", "Restores 30 HP.", 25, "heal", 30),
         Potion("Strength Elixir", "Increases attack power.", 40, "attack_boost", 5)
     ]
-    logger.debug(f"Shop items generated: {[item.name for item in shop_items]}")
-    logger.info(f"Returning {min(len(shop_items), 5)} items for sale")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Shop items generated: %s", [item.name for item in shop_items])
+    logger.debug("Returning %s items for sale", min(len(shop_items), 5))
     return random.sample(shop_items, min(len(shop_items), 5))  # Randomly pick 5 items for sale
 
 
-def generate_random_room(player: Player, room_type: str|None = None, is_boss_room=False, tutorial=False):
-    """Generate a random room for the given dungeon level"""
+def choose_room_type(rng=random) -> str:
+    weights = [0.5, 0.2, 0.1, 0.15, 0.05]
+    return rng.choices(["combat", "treasure", "shop", "rest", "puzzle"], weights=weights)[0]
+
+
+def generate_random_room(player: Player, room_type: str|None = None, is_boss_room=False, tutorial=False, rng=None):
+    """Generate a random room for the given dungeon level (rng: the player's generation stream by default)"""
     global debug
 
     level = player.dungeon_level
+    rng = rng or rng_for(player, GENERATION)
     if room_type is None:
-        weights = [0.5, 0.2, 0.1, 0.15, 0.05]
-        room_type = random.choices(["combat", "treasure", "shop", "rest", "puzzle"], weights=weights)[0]
+        room_type = choose_room_type(rng)
     
     if debug >= 1:
         print(f"{Colors.YELLOW}DEBUG: Generating random room of type '{room_type}' for level {level}{Colors.RESET}")
-    logger.info(f"Generating random room of type '{room_type}' for level {level}")
+    logger.debug("Generating random room of type '%s' for level %s", room_type, level)
     
     if is_boss_room:
         room_type = "boss"
         logger.info("Generating boss room")
 
     
-    description = random.choice(room_descriptions[room_type])
+    description = rng.choice(room_descriptions[room_type])
     
     enemies = []
     items = []
@@ -1605,20 +1644,19 @@ def generate_random_room(player: Player, room_type: str|None = None, is_boss_roo
     
     # Generate enemies for combat and boss rooms
     if room_type in ["combat", "boss"]:
-        num_enemies = 1 if room_type == "boss" else random.randint(1, 2 + level // 3)
-        for _ in range(num_enemies):
-            enemies.append(generate_enemy(level, is_boss_room, player))
+        num_enemies = 1 if room_type == "boss" else rng.randint(1, 2 + level // 3)
+        enemies.extend(generate_enemies(level, num_enemies, is_boss_room, player, rng))
     if debug >= 1:
         print(f"{Colors.YELLOW}DEBUG: Enemies generated: {enemies}{Colors.RESET}")
-        logger.debug(f"Generated {len(enemies)} enemies for room")
+        logger.debug("Generated %s enemies for room", len(enemies))
 
     # Generate items for treasure rooms
     if room_type == "treasure":
         possible_items = ["scroll", "ressource", "equipment"]
-        num_items = player.difficulty.get_treasure_item_num()
+        num_items = player.difficulty.get_treasure_item_num(rng)
 
         for _ in range(num_items):
-            item_type = random.choices(
+            item_type = rng.choices(
                 possible_items,
                 weights=[0.3, 0.4 if isinstance(player.difficulty, RealisticDifficulty) else 0.1, 0.3]
             )[0]
@@ -1628,35 +1666,35 @@ def generate_random_room(player: Player, room_type: str|None = None, is_boss_roo
                 if isinstance(player.difficulty, RealisticDifficulty):
                     items.append(generate_random_resource_item())
             elif item_type == "equipment":
-                    items.append(generate_random_item(player=player))
+                    items.append(generate_random_item(player=player, rng=rng))
                     
             else: # Fallback to equipment
-                items.append(generate_random_item(player=player))
+                items.append(generate_random_item(player=player, rng=rng))
 
     
     # In realistic mode, add resources to combat rooms as well
     if room_type == "combat" and isinstance(player.difficulty, RealisticDifficulty):
-        num_resources = random.randint(1, 2)
+        num_resources = rng.randint(1, 2)
         for _ in range(num_resources):
             items.append(generate_random_resource_item())
         
     if debug >= 1:
         print(f"{Colors.YELLOW}DEBUG: Items generated: {items}{Colors.RESET}")
-    logger.debug(f"Generated item: {items}")
+    logger.debug("Generated item: %s", items)
     
     # Generate trap (30% chance) for all rooms except rest, shop, and inter_level
-    if room_type not in ("rest", "shop", "inter_level") and random.random() < 0.3:
+    if room_type not in ("rest", "shop", "inter_level") and rng.random() < 0.3:
         trap_types = [
             {"type": "damage", "value": 5 + level * 2, "description": "A poisoned dart shoots from the wall!"},
             {"type": "damage", "value": 3 + level * 3, "description": "The floor opens up to reveal spikes!"},
             {"type": "stat_reduction", "stat": "attack", "value": 2, "description": "A strange gas makes your muscles weaken!"},
             {"type": "stat_reduction", "stat": "defense", "value": 2, "description": "A curse makes your skin more vulnerable!"}
         ]
-        trap = random.choice(trap_types)
+        trap = rng.choice(trap_types)
         trap["triggered"] = False
     if debug >= 1:
         print(f"{Colors.YELLOW}DEBUG: Trap generated: {trap}{Colors.RESET}")
-    logger.info(f"Trap generated: {trap}")
+    logger.debug("Trap generated: %s", trap)
     
     room = Room(room_type, description, enemies, items, trap)
 
@@ -1666,20 +1704,40 @@ def generate_random_room(player: Player, room_type: str|None = None, is_boss_roo
 
     return room
 
-from engine.dungeon_generator import DungeonGenerator
+# Layout of the puzzle levels (engine.dungeon_generator.generate_layout options), completed by
+# puzzle_layout_options() for the room count of the level (generate_2d_constrained)
+PUZZLE_LAYOUT = {"mode": "2d_constrained", "width": 20, "height": 20, "branch_probability": 0.3}
 
-def generate_dungeon(player:Player) -> list[Room]:
-    """Generates a dungeon with rooms based on the level and difficulty."""
+def puzzle_layout_options(num_rooms: int) -> dict:
+    """
+    Options of a puzzle level of num_rooms rooms: the layout is a start -> end path of
+    exactly num_rooms rooms (the rooms the level plays, end = boss) with 1 to num_rooms // 3 treasures.
+    """
+    return {**PUZZLE_LAYOUT, "min_rooms": num_rooms, "max_rooms": num_rooms, "min_distance": num_rooms - 1,
+            "min_treasures": 1, "max_treasures": max(1, num_rooms // 3)}
+
+def prefetch_layout(player: Player):
+    """Starts generating the next puzzle layout in the background, if its seed and room count are already known."""
+    if (player.difficulty.name == "puzzle" and getattr(player, "next_layout_seed", None) is not None
+            and getattr(player, "next_room_count", None) is not None):
+        layout_pool.get_pool().prefetch(player.next_layout_seed, **puzzle_layout_options(player.next_room_count))
+
+def generate_dungeon(player:Player) -> list[RoomPlan]:
+    """
+    Generates the plan of a dungeon based on the level and difficulty.
+    The rooms themselves are generated when entered (RoomPlan.materialize / Dungeon.next_room).
+    """
     global debug
     dungeon_level = player.dungeon_level
     difficulty = player.difficulty
-    rooms: list[Room] = []
+    rng = rng_for(player, GENERATION)
+    rooms: list[RoomPlan] = []
     if debug >= 1:
         print(f"{Colors.YELLOW}DEBUG: Generating dungeon level {dungeon_level} with difficulty {difficulty}{Colors.RESET}")
-    logger.info(f"Starting dungeon generation for level {dungeon_level} with difficulty {difficulty}")
+    logger.info("Starting dungeon generation for level %s with difficulty %s", dungeon_level, difficulty)
 
-    num_rooms = player.difficulty.get_room_count()
-    logger.debug(f"Number of rooms to generate: {num_rooms}")
+    num_rooms = player.difficulty.get_room_count(rng)
+    logger.debug("Number of rooms to generate: %s", num_rooms)
 
     if debug >= 1:
         print(f"{Colors.YELLOW}DEBUG: Number of rooms: {num_rooms}{Colors.RESET}")
@@ -1689,23 +1747,25 @@ def generate_dungeon(player:Player) -> list[Room]:
     # Use dimensional room-based generation for PuzzleMode
     if difficulty.name == "puzzle":
         logger.info("Using dimensional room-based dungeon generation for PuzzleMode")
-        generator = DungeonGenerator(dimensions=2, time_enabled=False)
-        generator.generate_2d_organic(width=20, height=20, branch_probability=0.3)
+        # The layout seed and room count are drawn one level ahead, so the next layout is generated in the
+        # background while this level is played (taken from the pool, or generated now if not ready: same layout)
+        layout_seed = getattr(player, "next_layout_seed", None)
+        if layout_seed is None:
+            layout_seed = rng.getrandbits(64)
+        elif getattr(player, "next_room_count", None) is not None:
+            num_rooms = player.next_room_count
+        player.next_layout_seed = rng.getrandbits(64)
+        player.next_room_count = difficulty.get_room_count(rng)
+        layout, path = layout_pool.get_pool().take(layout_seed, **puzzle_layout_options(num_rooms))
+        prefetch_layout(player)
 
         # Convert generated rooms to engine.dungeon.Room
         # Add starting room explicitly
-        rooms.append(Room("start", "You noticed the entrance to the dungeon.\nYou finally decided to open the door and step in.\nTorches flicker on the damp walls, and the air is heavy with anticipation.", [], [], None))
-
-        # Limit rooms to num_rooms - 1 (excluding start)
-        generated_rooms = list(generator.rooms.values())
-        # Remove start room from generated_rooms to avoid duplication
-        generated_rooms = [r for r in generated_rooms if r.room_type != "start"]
+        rooms.append(RoomPlan("start", description="You noticed the entrance to the dungeon.\nYou finally decided to open the door and step in.\nTorches flicker on the damp walls, and the air is heavy with anticipation."))
 
-        # Sort or shuffle rooms to pick num_rooms - 1 rooms
-        # Here, just take first num_rooms - 1 rooms
-        selected_rooms = generated_rooms[:max(0, num_rooms - 1)]
-
-        for gen_room in selected_rooms:
+        # The level plays the start -> end path of the layout (the start room is the one above)
+        for index in path[1:]:
+            coords, gen_type = layout[index]
             # Map DungeonGenerator.Room types to engine.dungeon.Room types
             room_type_map = {
                 "start": "start",
@@ -1714,13 +1774,18 @@ def generate_dungeon(player:Player) -> list[Room]:
                 "normal": "combat",  # treat normal rooms as combat rooms for gameplay
                 "temporal": "puzzle"
             }
-            room_type = room_type_map.get(gen_room.room_type, "combat")
-            description = f"A {room_type} room at coordinates {gen_room.coords}."
-            rooms.append(Room(room_type, description, [], [], None))
+            room_type = room_type_map.get(gen_type, "combat")
+            description = f"A {room_type} room at coordinates {coords}."
+            if room_type == "boss":
+                rooms.append(RoomPlan("boss", rng.getrandbits(64), coords=coords, is_boss_room=True))
+            elif room_type == "treasure":
+                rooms.append(RoomPlan("treasure", rng.getrandbits(64), coords=coords, description=description))
+            else:
+                rooms.append(RoomPlan(room_type, coords=coords, description=description))
 
         # Add boss room if not already added
         if not any(r.room_type == "boss" for r in rooms):
-            rooms.append(generate_random_room(player=player, is_boss_room=True))
+            rooms.append(RoomPlan("boss", rng.getrandbits(64), is_boss_room=True))
 
         if debug >= 1:
             print(f"{Colors.YELLOW}DEBUG: Generated {len(rooms)} rooms for PuzzleMode:{Colors.RESET}")
@@ -1731,27 +1796,27 @@ def generate_dungeon(player:Player) -> list[Room]:
 
     # Existing generation for other difficulties
     if dungeon_level == 1:
-        logger.debug(f"Generating Starting room")
-        rooms.append(Room("start", f"You noticed the entrance to the dungeon.\nYou finally decided to open the door and step in.\nTorches flicker on the damp walls, and the air is heavy with anticipation.", [], [], None))
+        logger.debug("Generating Starting room")
+        rooms.append(RoomPlan("start", description="You noticed the entrance to the dungeon.\nYou finally decided to open the door and step in.\nTorches flicker on the damp walls, and the air is heavy with anticipation."))
         if debug >= 1:
             print(f"{Colors.YELLOW}DEBUG: Starting room added{Colors.RESET}")
     else:
         # Inter-level room:
-        logger.debug(f"Generating Inter-level room")
-        rooms.append(Room("inter_level", f"You find a small room with a few torches and a table.\nIt seems like a resting place for adventurers.", [], [], None))
+        logger.debug("Generating Inter-level room")
+        rooms.append(RoomPlan("inter_level", description="You find a small room with a few torches and a table.\nIt seems like a resting place for adventurers."))
         if debug >= 1:
             print(f"{Colors.YELLOW}DEBUG: Inter-level room added{Colors.RESET}")
 
     for i in range(1, num_rooms): # not +1 because of boss room
-        rooms.append(generate_random_room(player=player))
-        logger.debug(f"Room generated: {rooms[i]}")
+        rooms.append(RoomPlan(choose_room_type(rng), rng.getrandbits(64), coords=(i,)))
+        logger.debug("Room planned: %s", rooms[i])
 
     if debug >= 1:
         print(f"{Colors.YELLOW}DEBUG: Generated {len(rooms)} rooms :{Colors.RESET}")
         for room in rooms:
-            print(f"{Colors.YELLOW}DEBUG: Room type: {room.room_type}, Description: {room.description}, Enemies: {room.enemies}, Items: {room.items}, Trap: {room.trap}{Colors.RESET}")
+            print(f"{Colors.YELLOW}DEBUG: Room type: {room.room_type}, Seed: {room.seed}, Coords: {room.coords}{Colors.RESET}")
 
-    rooms.append(generate_random_room(player=player, is_boss_room=True))
+    rooms.append(RoomPlan("boss", rng.getrandbits(64), coords=(num_rooms,), is_boss_room=True))
 
     if debug >= 1:
         print(f"{Colors.YELLOW}DEBUG: Boss room added{Colors.RESET}")
@@ -1,14 +1,66 @@
+"""
+N-dimensional dungeon layout generation (used by the puzzle mode).
+
+Only depends on the standard library: the matplotlib visualizer and the tkinter
+test GUI live in engine.dungeon_visualizer and are loaded only when asked for.
+
+The generators work on packed integer keys: every coordinate (and the time
+state of the 4D maps, on axis TIME_AXIS) is stored on GRID_BITS bits of one
+int, so a neighbour is key ± stride and occupancy is a dict of ints. A layout
+is kept as compact arrays (keys, type codes, edge list); the Room objects of
+the `rooms` view (and their `connections` sets) are only built on first
+access. Same RNG calls as the tuple-based version: a given seed gives the same
+layout.
+
+generate_2d_constrained is the 2D mode with guarantees (room count, start ->
+end distance, treasures, dead ends): seeded attempts checked while they are
+built, with the attempts and time of the accepted layout in generator.report.
+"""
+
 import random
 import math
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-import numpy as np
-from collections import defaultdict, deque
-from typing import cast
-import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
 import time
+from array import array
+
+
+GRID_BITS = 16                        # bits per axis: coordinates in [-32768, 32767]
+GRID_OFFSET = 1 << (GRID_BITS - 1)
+GRID_MASK = (1 << GRID_BITS) - 1
+TIME_AXIS = 3                         # 4D maps: (x, y, z) + time state
+
+ROOM_TYPES = ("start", "end", "treasure", "normal", "temporal")
+START, END, TREASURE, NORMAL, TEMPORAL = range(len(ROOM_TYPES))
+
+
+def pack_coords(coords) -> int:
+    """Packs a coordinate tuple into one int (GRID_BITS bits per axis)."""
+    key = 0
+    for axis, value in enumerate(coords):
+        key |= (value + GRID_OFFSET) << (GRID_BITS * axis)
+    return key
+
+
+def unpack_coords(key: int, axes: int) -> tuple:
+    if axes == 2:
+        return (key & GRID_MASK) - GRID_OFFSET, ((key >> GRID_BITS) & GRID_MASK) - GRID_OFFSET
+    if axes == 3:
+        return ((key & GRID_MASK) - GRID_OFFSET, ((key >> GRID_BITS) & GRID_MASK) - GRID_OFFSET,
+                ((key >> (2 * GRID_BITS)) & GRID_MASK) - GRID_OFFSET)
+    return tuple(((key >> (GRID_BITS * axis)) & GRID_MASK) - GRID_OFFSET for axis in range(axes))
+
+
+def axis_value(key: int, axis: int) -> int:
+    return ((key >> (GRID_BITS * axis)) & GRID_MASK) - GRID_OFFSET
+
+
+def index_picker(rng):
+    """
+    below(n) such that rng.choice(seq) is seq[below(len(seq))] and rng.randint(a, b) is
+    a + below(b - a + 1): the same draws as random.Random, without the choice/randint calls.
+    """
+    below = getattr(rng, "_randbelow", None) or getattr(getattr(rng, "_inst", None), "_randbelow", None)
+    return below or rng.randrange
+
 
 class Room:
     """Represents a room in the dungeon with n-dimensional coordinates"""
@@ -17,662 +69,528 @@ class Room:
         self.room_type = room_type  # "start", "end", "treasure", "normal"
         self.time_state = time_state  # for time manipulation
         self.connections = set()  # connected rooms
-        
+
     def __hash__(self):
         return hash((self.coords, self.time_state))
-    
+
     def __eq__(self, other):
         return self.coords == other.coords and self.time_state == other.time_state
-    
+
     def __repr__(self):
         return f"Room{self.coords}[{self.room_type}]"
 
 class DungeonGenerator:
     """Main dungeon generation engine"""
-    
-    def __init__(self, dimensions=2, time_enabled=False):
+
+    def __init__(self, dimensions=2, time_enabled=False, rng=None):
         self.dimensions = dimensions
+        self.rng = rng or random  # random.Random-like (engine.rng stream), global random by default
         self.time_enabled = time_enabled
-        self.rooms = {}  # coords -> Room
-        self.start_room = None
-        self.end_room = None
-        
+        self._reset()
+
+    def _reset(self, axes=2, temporal=False):
+        self._axes = axes             # spatial axes of the keys
+        self._temporal = temporal
+        self._keys = array('Q')       # room index -> packed coordinates
+        self._types = bytearray()     # room index -> ROOM_TYPES code
+        self._edges = array('i')      # flat (a, b) pairs of room indexes
+        self._index = {}              # packed coordinates -> room index
+        self._start = self._end = -1
+        self._time_states = 1
+        self.report = None            # attempts/time of generate_2d_constrained, None for the other generators
+        self._view = None
+        self._adjacency = None
+        # Neighbour offsets, same order as get_neighbors: axis 0 -1/+1, axis 1 -1/+1...
+        self._steps = tuple(sign << (GRID_BITS * axis) for axis in range(self.dimensions) for sign in (-1, 1))
+
+    def _add_room(self, key: int, room_type: int, previous: int = -1) -> int:
+        """Adds a room (connected to the room index previous if given) and returns its index."""
+        index = len(self._types)
+        self._index[key] = index
+        self._keys.append(key)
+        self._types.append(room_type)
+        if previous >= 0:
+            self._edges.extend((previous, index))
+        return index
+
+    def _done(self):
+        self._index = None  # only needed while generating, a finished layout is just the arrays
+        self._view = None
+        self._adjacency = None
+
+    # --- Compatibility views ---
+
+    @property
+    def rooms(self):
+        """coords -> Room ((coords, time_state) -> Room for the 4D maps), built on first access."""
+        if self._view is None:
+            objects = [Room(coords, room_type, time_state) for coords, room_type, time_state in self.iter_rooms()]
+            edges = self._edges
+            for i in range(0, len(edges), 2):
+                a, b = objects[edges[i]], objects[edges[i + 1]]
+                a.connections.add(b)
+                b.connections.add(a)
+            if self._temporal:
+                self._view = {(room.coords, room.time_state): room for room in objects}
+            else:
+                self._view = {room.coords: room for room in objects}
+            self._objects = objects
+        return self._view
+
+    def _room_object(self, index):
+        if index < 0:
+            return None
+        self.rooms  # builds the view
+        return self._objects[index]
+
+    @property
+    def start_room(self):
+        return self._room_object(self._start)
+
+    @property
+    def end_room(self):
+        return self._room_object(self._end)
+
+    @property
+    def start_index(self) -> int:
+        """Index of the start room in iter_rooms()/adjacency() (-1 before generation)."""
+        return self._start
+
+    @property
+    def end_index(self) -> int:
+        return self._end
+
+    def __len__(self):
+        return len(self._types)
+
+    def iter_rooms(self):
+        """(coords, room_type, time_state) of every room, in generation order, without building Room objects."""
+        axes, temporal = self._axes, self._temporal
+        for key, code in zip(self._keys, self._types):
+            yield unpack_coords(key, axes), ROOM_TYPES[code], axis_value(key, TIME_AXIS) if temporal else 0
+
+    def adjacency(self) -> list[list[int]]:
+        """Neighbour room indexes of every room (indexes of iter_rooms), duplicates removed."""
+        if self._adjacency is None:
+            neighbors = [set() for _ in range(len(self._types))]
+            edges = self._edges
+            for i in range(0, len(edges), 2):
+                a, b = edges[i], edges[i + 1]
+                neighbors[a].add(b)
+                neighbors[b].add(a)
+            self._adjacency = [sorted(n) for n in neighbors]
+        return self._adjacency
+
+    def path(self, source: int | None = None, target: int | None = None) -> list[int]:
+        """Room indexes of a shortest path source -> target (default: start -> end), [] if there is none."""
+        source = self._start if source is None else source
+        target = self._end if target is None else target
+        if source < 0 or target < 0:
+            return []
+        adjacency = self.adjacency()
+        parents = {source: source}
+        frontier = [source]
+        while frontier and target not in parents:
+            next_frontier = []
+            for room in frontier:
+                for neighbor in adjacency[room]:
+                    if neighbor not in parents:
+                        parents[neighbor] = room
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        if target not in parents:
+            return []
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        return path[::-1]
+
+    # --- Helpers ---
+
     def distance(self, coord1, coord2):
         """Calculate Euclidean distance between two coordinates"""
         return math.sqrt(sum((a - b) ** 2 for a, b in zip(coord1, coord2)))
-    
+
     def get_neighbors(self, coords):
         """Get all possible neighboring coordinates"""
+        coords = tuple(coords)
         neighbors = []
         for dim in range(self.dimensions):
-            for delta in [-1, 1]:
-                new_coords = list(coords)
-                new_coords[dim] += delta
-                neighbors.append(tuple(new_coords))
+            value = coords[dim]
+            before, after = coords[:dim], coords[dim + 1:]
+            neighbors.append(before + (value - 1,) + after)
+            neighbors.append(before + (value + 1,) + after)
         return neighbors
-    
+
+    def _free_neighbors(self, key, steps=None):
+        index = self._index
+        return [key + step for step in (steps or self._steps) if key + step not in index]
+
+    # --- Generators ---
+
     def generate_2d_organic(self, width=20, height=20, branch_probability=0.3):
         """Generate 2D dungeon with organic branching paths"""
-        self.rooms = {}
-        
+        self._reset()
+        rng = self.rng
+
         # Start at center
-        start_coords = (width // 2, height // 2)
-        self.start_room = Room(start_coords, "start")
-        self.rooms[start_coords] = self.start_room
-        
-        # Main path using random walk with bias
-        current = start_coords
-        main_path = [current]
-        
-        # Generate main path
-        for _ in range(random.randint(15, 25)):
-            neighbors = self.get_neighbors(current)
-            # Bias towards unexplored areas
-            valid_neighbors = [n for n in neighbors if n not in self.rooms]
+        current = pack_coords((width // 2, height // 2))
+        self._start = previous = self._add_room(current, START)
+        last_step = 0
+
+        below, index, steps = index_picker(rng), self._index, self._steps
+
+        # Generate main path (random walk, biased towards the same direction)
+        for _ in range(15 + below(11)):  # randint(15, 25)
+            valid_neighbors = [current + step for step in steps if current + step not in index]
             if valid_neighbors:
-                # Prefer continuing in same general direction
-                if len(main_path) > 1:
-                    prev_dir = (current[0] - main_path[-2][0], current[1] - main_path[-2][1])
-                    weighted_neighbors = []
-                    for n in valid_neighbors:
-                        new_dir = (n[0] - current[0], n[1] - current[1])
-                        # Weight by direction similarity
-                        dot_product = prev_dir[0] * new_dir[0] + prev_dir[1] * new_dir[1]
-                        weight = max(1, dot_product + 2)
-                        weighted_neighbors.extend([n] * weight)
-                    current = random.choice(weighted_neighbors)
+                if last_step:
+                    # Weight by direction similarity: same 3, perpendicular 2, opposite 1
+                    weights = [3 if n - current == last_step else 1 if n - current == -last_step else 2 for n in valid_neighbors]
+                    pick = below(sum(weights))  # same draw as choice() over the expanded list
+                    for n, weight in zip(valid_neighbors, weights):
+                        if pick < weight:
+                            break
+                        pick -= weight
                 else:
-                    current = random.choice(valid_neighbors)
-                
-                room = Room(current, "normal")
-                self.rooms[current] = room
-                self.rooms[main_path[-1]].connections.add(room)
-                room.connections.add(self.rooms[main_path[-1]])
-                main_path.append(current)
-        
+                    n = valid_neighbors[below(len(valid_neighbors))]
+                last_step = n - current
+                current = n
+
+                previous = self._add_room(current, NORMAL, previous)
+
         # Set end room
-        self.end_room = self.rooms[current]
-        self.end_room.room_type = "end"
-        
+        self._end = self._index[current]
+        self._types[self._end] = END
+
         # Generate branches
-        for room_coords in list(self.rooms.keys()):
-            if random.random() < branch_probability:
-                self._generate_branch(room_coords, random.randint(2, 8))
-    
+        random_, keys = rng.random, self._keys
+        for room in range(len(self._types)):
+            if random_() < branch_probability:
+                self._generate_branch(keys[room], 2 + below(7))  # randint(2, 8)
+        self._done()
+
     def generate_3d_layered(self, width=15, height=15, layers=5, branch_probability=0.25):
         """Generate 3D dungeon with vertical connections"""
-        self.rooms = {}
-        
+        self._reset(axes=3)
+        rng = self.rng
+        below, random_, index, keys = index_picker(rng), rng.random, self._index, self._keys
+        layer_stride = 1 << (GRID_BITS * 2)
+        layer_mask = GRID_MASK << (GRID_BITS * 2)
+        flat_steps = self._steps[:4]
+
         # Start at bottom center
-        start_coords = (width // 2, height // 2, 0)
-        self.start_room = Room(start_coords, "start")
-        self.rooms[start_coords] = self.start_room
-        
-        current = start_coords
-        
+        current = pack_coords((width // 2, height // 2, 0))
+        self._start = self._add_room(current, START)
+
         # Generate spiral path going up
         for layer in range(layers):
             # Generate path on current layer
             layer_rooms = []
-            for _ in range(random.randint(8, 15)):
-                neighbors = [(x, y, layer) for x, y in 
-                           [(current[0] + dx, current[1] + dy) 
-                            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]]]
-                valid_neighbors = [n for n in neighbors if n not in self.rooms]
-                
+            layer_bits = (layer + GRID_OFFSET) << (GRID_BITS * 2)
+            for _ in range(8 + below(8)):  # randint(8, 15)
+                on_layer = (current & ~layer_mask) | layer_bits
+                valid_neighbors = [on_layer + step for step in flat_steps if on_layer + step not in index]
+
                 if valid_neighbors:
-                    current = random.choice(valid_neighbors)
-                    room = Room(current, "normal")
-                    self.rooms[current] = room
-                    layer_rooms.append(current)
-                    
-                    # Connect to previous room
-                    prev_coords = layer_rooms[-2] if len(layer_rooms) > 1 else start_coords
-                    if prev_coords in self.rooms:
-                        self.rooms[prev_coords].connections.add(room)
-                        room.connections.add(self.rooms[prev_coords])
-            
+                    current = valid_neighbors[below(len(valid_neighbors))]
+                    # Connected to the previous room of the layer (the start room for the first one)
+                    layer_rooms.append(self._add_room(current, NORMAL, layer_rooms[-1] if layer_rooms else self._start))
+
             # Add vertical connections
             if layer < layers - 1:
                 # Connect some rooms to upper layer
-                for room_coords in layer_rooms:
-                    if random.random() < 0.4:  # 40% chance of vertical connection
-                        upper_coords = (room_coords[0], room_coords[1], room_coords[2] + 1)
-                        if upper_coords not in self.rooms:
-                            upper_room = Room(upper_coords, "normal")
-                            self.rooms[upper_coords] = upper_room
-                            self.rooms[room_coords].connections.add(upper_room)
-                            upper_room.connections.add(self.rooms[room_coords])
-                            current = upper_coords
-            
+                for room in layer_rooms:
+                    if random_() < 0.4:  # 40% chance of vertical connection
+                        upper = keys[room] + layer_stride
+                        if upper not in index:
+                            self._add_room(upper, NORMAL, room)
+                            current = upper
+
             # Generate branches on this layer
-            for room_coords in layer_rooms:
-                if random.random() < branch_probability:
-                    self._generate_branch(room_coords, random.randint(2, 6))
-        
+            for room in layer_rooms:
+                if random_() < branch_probability:
+                    self._generate_branch(keys[room], 2 + below(5))  # randint(2, 6)
+
         # Set end room at top
-        top_rooms = [coords for coords in self.rooms.keys() if coords[2] == layers - 1]
+        top_bits = (layers - 1 + GRID_OFFSET) << (GRID_BITS * 2)
+        top_rooms = [room for room, key in enumerate(keys) if key & layer_mask == top_bits]
         if top_rooms:
-            end_coords = random.choice(top_rooms)
-            self.end_room = self.rooms[end_coords]
-            self.end_room.room_type = "end"
-    
-    def generate_4d_temporal(self, width=10, height=10, depth=3, time_states=3, branch_probability=0.2):
-        """Generate 4D dungeon with time manipulation"""
-        self.rooms = {}
+            self._end = rng.choice(top_rooms)
+            self._types[self._end] = END
+        self._done()
+
+    def generate_4d_temporal(self, width=10, height=10, depth=3, time_states=3, branch_probability=0.2, path_length=None):
+        """
+        Generate 4D dungeon with time manipulation.
+        path_length: steps of the main path (randint(20, 30) by default), raise it with the size of big maps.
+        """
+        self._reset(axes=3, temporal=True)
         self.time_enabled = True
-        
+        self._time_states = time_states
+        rng = self.rng
+        time_stride = 1 << (GRID_BITS * TIME_AXIS)
+
         # Start in present (time_state=1)
-        start_coords = (width // 2, height // 2, depth // 2)
-        self.start_room = Room(start_coords, "start", time_state=1)
-        self.rooms[(start_coords, 1)] = self.start_room
-        
-        current = start_coords
-        current_time = 1
-        
-        # Generate main path with temporal shifts
-        for _ in range(random.randint(20, 30)):
+        current = pack_coords((width // 2, height // 2, depth // 2, min(1, time_states - 1)))
+        self._start = previous = self._add_room(current, START)
+
+        # Generate main path with temporal shifts. previous is the room the walker stands in:
+        # every new room is connected to it, whatever was created before (branches, other time states)
+        for _ in range(rng.randint(20, 30) if path_length is None else path_length):
             # Decide on action: move in space or time
-            if random.random() < 0.7:  # 70% spatial movement
-                neighbors = self.get_neighbors(current)
-                valid_neighbors = [n for n in neighbors 
-                                 if (n, current_time) not in self.rooms]
+            if rng.random() < 0.7:  # 70% spatial movement
+                valid_neighbors = self._free_neighbors(current)
                 if valid_neighbors:
-                    current = random.choice(valid_neighbors)
-                    room = Room(current, "normal", current_time)
-                    self.rooms[(current, current_time)] = room
-                    
-                    # Connect to previous room
-                    prev_key = list(self.rooms.keys())[-2]
-                    prev_room = self.rooms[prev_key]
-                    prev_room.connections.add(room)
-                    room.connections.add(prev_room)
-            
+                    current = rng.choice(valid_neighbors)
+                    previous = self._add_room(current, NORMAL, previous)
+
             else:  # 30% temporal movement
-                if random.random() < 0.5 and current_time > 0:
-                    new_time = current_time - 1
+                current_time = axis_value(current, TIME_AXIS)
+                if rng.random() < 0.5 and current_time > 0:
+                    new_key = current - time_stride
                 elif current_time < time_states - 1:
-                    new_time = current_time + 1
+                    new_key = current + time_stride
                 else:
                     continue
-                
-                # Create temporal connection
-                if (current, new_time) not in self.rooms:
-                    room = Room(current, "temporal", new_time)
-                    self.rooms[(current, new_time)] = room
-                    
-                    # Connect across time
-                    current_room = self.rooms[(current, current_time)]
-                    current_room.connections.add(room)
-                    room.connections.add(current_room)
-                    current_time = new_time
-        
+
+                # Create temporal connection, or travel to the room already there
+                room = self._index.get(new_key)
+                if room is None:
+                    previous = self._add_room(new_key, TEMPORAL, previous)
+                else:
+                    self._edges.extend((previous, room))
+                    previous = room
+                current = new_key
+
         # Set end room
-        end_coords = random.choice(list(self.rooms.keys()))
-        self.end_room = self.rooms[end_coords]
-        self.end_room.room_type = "end"
-        
+        self._end = rng.randrange(len(self._types))  # same draw as choice() over the rooms
+        self._types[self._end] = END
+
         # Generate branches
-        for room_key in list(self.rooms.keys()):
-            if random.random() < branch_probability:
-                self._generate_temporal_branch(room_key, random.randint(2, 5))
-    
-    def _generate_branch(self, start_coords, length):
+        for room in range(len(self._types)):
+            if rng.random() < branch_probability:
+                self._generate_temporal_branch(self._keys[room], rng.randint(2, 5))
+        self._done()
+
+    def generate_2d_constrained(self, width=20, height=20, branch_probability=0.3, min_rooms=0, max_rooms=None,
+                                min_distance=0, min_treasures=0, max_treasures=None, max_dead_ends=None,
+                                max_attempts=50):
+        """
+        generate_2d_organic with guarantees: min_rooms <= rooms <= max_rooms, start -> end
+        distance >= min_distance, min_treasures <= treasures <= max_treasures and at most
+        max_dead_ends dead ends (None: no limit).
+
+        Every attempt has its own seed (drawn from self.rng) and is checked while it is built:
+        the main path walks until min_distance instead of stopping blindly, a branch that
+        breaks max_rooms/max_dead_ends is cut or undone, missing rooms are grown as branches
+        and missing treasures are put in dead ends. Only the attempts that cannot be fixed
+        (main path boxed in, no room left to grow) are rejected.
+
+        self.report: {"accepted", "attempts", "ms", "rejected": {reason: count}}.
+        Returns False (the last attempt is kept) when the max_attempts attempts were rejected.
+        """
+        if max_dead_ends is not None and max_dead_ends < 1:
+            raise ValueError("max_dead_ends must be at least 1 (the end room is a dead end)")
+        if max_rooms is not None and max_rooms < max(min_rooms, min_distance + 1, 2):
+            raise ValueError(f"max_rooms={max_rooms} is below min_rooms/min_distance")
+        if max_treasures is not None and max_treasures < min_treasures:
+            raise ValueError(f"max_treasures={max_treasures} is below min_treasures={min_treasures}")
+
+        started = time.perf_counter()
+        rejected: dict[str, int] = {}
+        base_rng = self.rng
+        attempt = 0
+        reason = None
+        for attempt in range(1, max_attempts + 1):
+            # Own seed per attempt: what a rejected attempt drew does not change the next one
+            self.rng = random.Random(base_rng.getrandbits(64))
+            try:
+                reason = self._constrained_attempt(width, height, branch_probability, min_rooms, max_rooms,
+                                                   min_distance, min_treasures, max_treasures, max_dead_ends)
+            finally:
+                self.rng = base_rng
+            if reason is None:
+                break
+            rejected[reason] = rejected.get(reason, 0) + 1
+
+        self.report = {"accepted": reason is None, "attempts": attempt,
+                       "ms": round((time.perf_counter() - started) * 1000, 3), "rejected": rejected}
+        self._done()
+        return reason is None
+
+    def _constrained_attempt(self, width, height, branch_probability, min_rooms, max_rooms,
+                             min_distance, min_treasures, max_treasures, max_dead_ends):
+        """One layout of generate_2d_constrained, None if it is accepted, else the reason of the rejection."""
+        self._reset()
+        rng, keys, types, index = self.rng, self._keys, self._types, self._index
+        degree = [0]       # connections of every room (the layouts of this mode are trees)
+        dead_ends = 0      # rooms with one connection, start excluded
+
+        current = pack_coords((width // 2, height // 2))
+        start = self._start = previous = self._add_room(current, START)
+        last_step = 0
+
+        def attach(key, room_type, parent):
+            nonlocal dead_ends
+            if degree[parent] == 1 and parent != start:
+                dead_ends -= 1
+            degree[parent] += 1
+            degree.append(1)
+            dead_ends += 1
+            return self._add_room(key, room_type, parent)
+
+        # Main path: same biased walk as generate_2d_organic, long enough for min_distance
+        length = max(rng.randint(15, 25), min_distance)
+        if max_rooms is not None:
+            length = min(length, max_rooms - 1)
+        for _ in range(length):
+            valid_neighbors = self._free_neighbors(current)
+            if not valid_neighbors:
+                break  # boxed in: accepted below if the path is already long enough
+            if last_step:
+                weights = [3 if n - current == last_step else 1 if n - current == -last_step else 2 for n in valid_neighbors]
+                pick = rng.randrange(sum(weights))
+                for n, weight in zip(valid_neighbors, weights):
+                    if pick < weight:
+                        break
+                    pick -= weight
+            else:
+                n = rng.choice(valid_neighbors)
+            last_step = n - current
+            current = n
+            previous = attach(current, NORMAL, previous)
+
+        # Tree: the start -> end distance is the length of the main path
+        if len(types) - 1 < min_distance:
+            return "distance"
+        self._end = previous
+        types[previous] = END
+
+        def grow(root, length):
+            """Branch of up to length rooms from root, undone if it leaves too many dead ends."""
+            nonlocal dead_ends
+            size, saved_dead_ends = len(types), dead_ends
+            current, previous = keys[root], root
+            for _ in range(length):
+                if max_rooms is not None and len(types) >= max_rooms:
+                    break
+                valid_neighbors = self._free_neighbors(current)
+                if not valid_neighbors:
+                    break
+                current = rng.choice(valid_neighbors)
+                previous = attach(current, TREASURE if rng.random() < 0.1 else NORMAL, previous)
+            if max_dead_ends is not None and dead_ends > max_dead_ends:
+                for key in keys[size:]:
+                    del index[key]
+                del keys[size:], types[size:], degree[size:]
+                del self._edges[2 * (size - 1):]  # one connection per room after the start
+                degree[root] -= 1
+                dead_ends = saved_dead_ends
+
+        # Branches
+        for room in range(len(types)):
+            if rng.random() < branch_probability:
+                grow(room, rng.randint(2, 8))
+
+        # Missing rooms: more branches from random rooms (bounded, a crowded layout can stay short)
+        for _ in range(4 * min_rooms):
+            if len(types) >= min_rooms:
+                break
+            grow(rng.randrange(len(types)), rng.randint(2, 8))
+        if len(types) < min_rooms:
+            return "rooms"
+
+        # Treasures: missing ones at the bottom of the branches first, extra ones back to normal rooms
+        treasures = [room for room in range(len(types)) if types[room] == TREASURE]
+        if len(treasures) < min_treasures:
+            spots = [room for room in range(len(types)) if types[room] == NORMAL and degree[room] == 1]
+            others = [room for room in range(len(types)) if types[room] == NORMAL and degree[room] > 1]
+            rng.shuffle(spots)
+            rng.shuffle(others)
+            missing = min_treasures - len(treasures)
+            if len(spots) + len(others) < missing:
+                return "treasures"
+            for room in (spots + others)[:missing]:
+                types[room] = TREASURE
+        elif max_treasures is not None and len(treasures) > max_treasures:
+            for room in rng.sample(treasures, len(treasures) - max_treasures):
+                types[room] = NORMAL
+        return None
+
+    def _generate_branch(self, start_key, length):
         """Generate a branch path from a starting room"""
-        current = start_coords
-        
+        rng, index, steps = self.rng, self._index, self._steps
+        below, random_ = index_picker(rng), rng.random
+        keys, types, edges = self._keys, self._types, self._edges
+        current = start_key
+        previous = index[start_key]
+
         for _ in range(length):
-            neighbors = self.get_neighbors(current)
-            valid_neighbors = [n for n in neighbors if n not in self.rooms]
-            
+            valid_neighbors = [current + step for step in steps if current + step not in index]
             if not valid_neighbors:
                 break
-                
-            current = random.choice(valid_neighbors)
-            room_type = "treasure" if random.random() < 0.1 else "normal"
-            room = Room(current, room_type)
-            self.rooms[current] = room
-            
-            # Connect to previous room
-            prev_room = self.rooms[start_coords] if _ == 0 else self.rooms[prev_coords]
-            prev_room.connections.add(room)
-            room.connections.add(prev_room)
-            
-            prev_coords = current
-    
+
+            current = valid_neighbors[below(len(valid_neighbors))]
+            # Connected to the previous room of the branch (_add_room inlined: most rooms come from branches)
+            room_type = TREASURE if random_() < 0.1 else NORMAL
+            room = len(types)
+            index[current] = room
+            keys.append(current)
+            types.append(room_type)
+            edges.append(previous)
+            edges.append(room)
+            previous = room
+
     def _generate_temporal_branch(self, start_key, length):
         """Generate a branch in 4D space"""
-        current_coords, current_time = start_key
-        prev_key = start_key
-        
+        time_stride = 1 << (GRID_BITS * TIME_AXIS)
+        current = start_key
+        previous = self._index[start_key]
+
         for _ in range(length):
             # Mix spatial and temporal movement
-            if random.random() < 0.8:  # Spatial
-                neighbors = self.get_neighbors(current_coords)
-                valid_neighbors = [n for n in neighbors 
-                                 if (n, current_time) not in self.rooms]
+            if self.rng.random() < 0.8:  # Spatial
+                valid_neighbors = self._free_neighbors(current)
                 if valid_neighbors:
-                    current_coords = random.choice(valid_neighbors)
+                    current = self.rng.choice(valid_neighbors)
             else:  # Temporal
-                if random.random() < 0.5 and current_time > 0:
-                    current_time -= 1
-                elif current_time < 2:
-                    current_time += 1
-            
-            new_key = (current_coords, current_time)
-            if new_key not in self.rooms:
-                room_type = "treasure" if random.random() < 0.1 else "normal"
-                room = Room(current_coords, room_type, current_time)
-                self.rooms[new_key] = room
-                
-                # Connect to previous room
-                prev_room = self.rooms[start_key] if _ == 0 else self.rooms[prev_key]
-                prev_room.connections.add(room)
-                room.connections.add(prev_room)
-                
-                prev_key = new_key
-
-class DungeonVisualizer:
-    """Handles visualization of n-dimensional dungeons"""
-    
-    def __init__(self):
-        self.fig = None
-        self.ax = None
-    
-    def visualize_2d(self, generator):
-        """Visualize 2D dungeon"""
-        plt.figure(figsize=(12, 8))
-        
-        # Extract coordinates
-        coords = list(generator.rooms.keys())
-        x_coords = [c[0] for c in coords]
-        y_coords = [c[1] for c in coords]
-        
-        # Color by room type
-        colors = []
-        for coords in generator.rooms.keys():
-            room = generator.rooms[coords]
-            if room.room_type == "start":
-                colors.append('green')
-            elif room.room_type == "end":
-                colors.append('red')
-            elif room.room_type == "treasure":
-                colors.append('gold')
-            else:
-                colors.append('lightblue')
-        
-        # Plot rooms
-        plt.scatter(x_coords, y_coords, c=colors, s=100, alpha=0.7)
-        
-        # Draw connections
-        for room in generator.rooms.values():
-            for connected_room in room.connections:
-                plt.plot([room.coords[0], connected_room.coords[0]], 
-                        [room.coords[1], connected_room.coords[1]], 
-                        'k-', alpha=0.3, linewidth=1)
-        
-        # Labels
-        plt.scatter([], [], c='green', s=100, label='Start')
-        plt.scatter([], [], c='red', s=100, label='End')
-        plt.scatter([], [], c='gold', s=100, label='Treasure')
-        plt.scatter([], [], c='lightblue', s=100, label='Normal')
-        
-        plt.title('2D Dungeon Generation')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.axis('equal')
-        plt.show()
-    
-    def visualize_3d(self, generator):
-        """Visualize 3D dungeon"""
-        fig = plt.figure(figsize=(14, 10))
-        ax: Axes3D = cast(Axes3D, fig.add_subplot(111, projection='3d'))
-        
-        # Extract coordinates
-        coords = list(generator.rooms.keys())
-        x_coords = [c[0] for c in coords]
-        y_coords = [c[1] for c in coords]
-        z_coords = [c[2] for c in coords]
-        
-        # Color by room type
-        colors = []
-        for coords in generator.rooms.keys():
-            room = generator.rooms[coords]
-            if room.room_type == "start":
-                colors.append('green')
-            elif room.room_type == "end":
-                colors.append('red')
-            elif room.room_type == "treasure":
-                colors.append('gold')
-            else:
-                colors.append('lightblue')
-        
-        # Plot rooms
-        ax.scatter(x_coords, y_coords, z_coords, c=colors, marker='o', s=10, alpha=0.7)
-        
-        # Draw connections
-        for room in generator.rooms.values():
-            for connected_room in room.connections:
-                ax.plot([room.coords[0], connected_room.coords[0]], 
-                       [room.coords[1], connected_room.coords[1]], 
-                       [room.coords[2], connected_room.coords[2]], 
-                       'k-', alpha=0.3, linewidth=1)
-        
-        ax.set_xlabel('X')
-        ax.set_ylabel('Y')
-        ax.set_zlabel('Z (Layer)')
-        ax.set_title('3D Dungeon Generation')
-        plt.show()
-    
-    def visualize_4d(self, generator):
-        """Visualize 4D dungeon (3D + time as color)"""
-        fig = plt.figure(figsize=(16, 12))
-        
-        # Group by time state
-        time_states = defaultdict(list)
-        for key, room in generator.rooms.items():
-            if isinstance(key, tuple) and len(key) == 2:
-                coords, time_state = key
-                time_states[time_state].append((coords, room))
-        
-        # Create subplots for each time state
-        num_states = len(time_states)
-        cols = min(3, num_states)
-        rows = (num_states + cols - 1) // cols
-        
-        for i, (time_state, rooms_data) in enumerate(time_states.items()):
-            ax: Axes3D = cast(Axes3D, fig.add_subplot(rows, cols, i + 1, projection='3d'))
-            
-            # Extract coordinates
-            coords = [data[0] for data in rooms_data]
-            rooms = [data[1] for data in rooms_data]
-            
-            x_coords = [c[0] for c in coords]
-            y_coords = [c[1] for c in coords]
-            z_coords = [c[2] for c in coords]
-            
-            # Color by room type
-            colors = []
-            for room in rooms:
-                if room.room_type == "start":
-                    colors.append('green')
-                elif room.room_type == "end":
-                    colors.append('red')
-                elif room.room_type == "treasure":
-                    colors.append('gold')
-                elif room.room_type == "temporal":
-                    colors.append('purple')
-                else:
-                    colors.append('lightblue')
-            
-            # Plot rooms
-            ax.scatter(x_coords, y_coords, z_coords, c=colors, s=100, alpha=0.7)
-            
-            # Draw connections (only within same time state)
-            for room in rooms:
-                for connected_room in room.connections:
-                    if connected_room.time_state == time_state:
-                        ax.plot([room.coords[0], connected_room.coords[0]], 
-                               [room.coords[1], connected_room.coords[1]], 
-                               [room.coords[2], connected_room.coords[2]], 
-                               'k-', alpha=0.3, linewidth=1)
-            
-            ax.set_xlabel('X')
-            ax.set_ylabel('Y')
-            ax.set_zlabel('Z')
-            ax.set_title(f'Time State {time_state}')
-        
-        plt.tight_layout()
-        plt.show()
-
-class DungeonTesterGUI:
-    """GUI for testing dungeon generation algorithms"""
-    
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Dungeon Generation Tester")
-        self.root.geometry("800x600")
-        
-        self.generator = None
-        self.visualizer = DungeonVisualizer()
-        
-        self.setup_ui()
-    
-    def setup_ui(self):
-        # Main frame
-        main_frame = ttk.Frame(self.root, padding="10")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Dimension selection
-        ttk.Label(main_frame, text="Dimension:").grid(row=0, column=0, sticky=tk.W)
-        self.dim_var = tk.StringVar(value="2D")
-        dim_combo = ttk.Combobox(main_frame, textvariable=self.dim_var, 
-                                values=["2D", "3D", "4D"], state="readonly")
-        dim_combo.grid(row=0, column=1, sticky=(tk.W, tk.E))
-        
-        # Algorithm selection
-        ttk.Label(main_frame, text="Algorithm:").grid(row=1, column=0, sticky=tk.W)
-        self.algo_var = tk.StringVar(value="Organic")
-        self.algo_combo = ttk.Combobox(main_frame, textvariable=self.algo_var, 
-                                      values=["Organic", "Layered", "Temporal"], 
-                                      state="readonly")
-        self.algo_combo.grid(row=1, column=1, sticky=(tk.W, tk.E))
-        
-        # Parameters frame
-        params_frame = ttk.LabelFrame(main_frame, text="Parameters", padding="5")
-        params_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
-        
-        # Size parameters
-        ttk.Label(params_frame, text="Width:").grid(row=0, column=0)
-        self.width_var = tk.StringVar(value="20")
-        ttk.Entry(params_frame, textvariable=self.width_var, width=10).grid(row=0, column=1)
-        
-        ttk.Label(params_frame, text="Height:").grid(row=0, column=2)
-        self.height_var = tk.StringVar(value="20")
-        ttk.Entry(params_frame, textvariable=self.height_var, width=10).grid(row=0, column=3)
-        
-        ttk.Label(params_frame, text="Branch Prob:").grid(row=1, column=0)
-        self.branch_var = tk.StringVar(value="0.3")
-        ttk.Entry(params_frame, textvariable=self.branch_var, width=10).grid(row=1, column=1)
-        
-        # Buttons frame
-        buttons_frame = ttk.Frame(main_frame)
-        buttons_frame.grid(row=3, column=0, columnspan=2, pady=10)
-        
-        ttk.Button(buttons_frame, text="Generate Single", 
-                  command=self.generate_single).pack(side=tk.LEFT, padx=5)
-        ttk.Button(buttons_frame, text="Generate Multiple", 
-                  command=self.generate_multiple).pack(side=tk.LEFT, padx=5)
-        ttk.Button(buttons_frame, text="Analyze", 
-                  command=self.analyze_dungeon).pack(side=tk.LEFT, padx=5)
-        
-        # Results text area
-        self.results_text = tk.Text(main_frame, height=20, width=80)
-        self.results_text.grid(row=4, column=0, columnspan=2, pady=5)
-        
-        # Scrollbar for text area
-        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.results_text.yview)
-        scrollbar.grid(row=4, column=2, sticky=(tk.N, tk.S))
-        self.results_text.configure(yscrollcommand=scrollbar.set)
-        
-        # Update algorithm options based on dimension
-        dim_combo.bind('<<ComboboxSelected>>', self.update_algorithms)
-    
-    def update_algorithms(self, event=None):
-        """Update available algorithms based on selected dimension"""
-        dim = self.dim_var.get()
-        if dim == "2D":
-            self.algo_combo['values'] = ["Organic", "Grid", "Maze-like"]
-        elif dim == "3D":
-            self.algo_combo['values'] = ["Layered", "Spiral", "Cave"]
-        elif dim == "4D":
-            self.algo_combo['values'] = ["Temporal", "Portal", "Quantum"]
-        
-        self.algo_combo.set(self.algo_combo['values'][0])
-    
-    def generate_single(self):
-        """Generate and visualize a single dungeon"""
-        try:
-            dim = self.dim_var.get()
-            width = int(self.width_var.get())
-            height = int(self.height_var.get())
-            branch_prob = float(self.branch_var.get())
-            
-            if dim == "2D":
-                self.generator = DungeonGenerator(2, False)
-                self.generator.generate_2d_organic(width, height, branch_prob)
-                self.visualizer.visualize_2d(self.generator)
-            elif dim == "3D":
-                self.generator = DungeonGenerator(3, False)
-                self.generator.generate_3d_layered(width, height, 5, branch_prob)
-                self.visualizer.visualize_3d(self.generator)
-            elif dim == "4D":
-                self.generator = DungeonGenerator(3, True)
-                self.generator.generate_4d_temporal(width, height, 3, 3, branch_prob)
-                self.visualizer.visualize_4d(self.generator)
-            
-            self.log_result(f"Generated {dim} dungeon with {len(self.generator.rooms)} rooms")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Generation failed: {str(e)}")
-    
-    def generate_multiple(self):
-        """Generate multiple dungeons and compare statistics"""
-        try:
-            dim = self.dim_var.get()
-            width = int(self.width_var.get())
-            height = int(self.height_var.get())
-            branch_prob = float(self.branch_var.get())
-            
-            results = []
-            
-            for i in range(10):  # Generate 10 dungeons
-                if dim == "2D":
-                    gen = DungeonGenerator(2, False)
-                    gen.generate_2d_organic(width, height, branch_prob)
-                elif dim == "3D":
-                    gen = DungeonGenerator(3, False)
-                    gen.generate_3d_layered(width, height, 5, branch_prob)
-                elif dim == "4D":
-                    gen = DungeonGenerator(3, True)
-                    gen.generate_4d_temporal(width, height, 3, 3, branch_prob)
-                
-                # Calculate statistics
-                num_rooms = len(gen.rooms)
-                num_connections = sum(len(room.connections) for room in gen.rooms.values()) // 2
-                treasure_rooms = sum(1 for room in gen.rooms.values() if room.room_type == "treasure")
-                
-                results.append({
-                    'rooms': num_rooms,
-                    'connections': num_connections,
-                    'treasures': treasure_rooms,
-                    'connectivity': num_connections / num_rooms if num_rooms > 0 else 0
-                })
-            
-            # Display statistics
-            avg_rooms = sum(r['rooms'] for r in results) / len(results)
-            avg_connections = sum(r['connections'] for r in results) / len(results)
-            avg_treasures = sum(r['treasures'] for r in results) / len(results)
-            avg_connectivity = sum(r['connectivity'] for r in results) / len(results)
-            
-            self.log_result(f"\n{dim} Dungeon Statistics (10 generations):")
-            self.log_result(f"Average Rooms: {avg_rooms:.1f}")
-            self.log_result(f"Average Connections: {avg_connections:.1f}")
-            self.log_result(f"Average Treasures: {avg_treasures:.1f}")
-            self.log_result(f"Average Connectivity: {avg_connectivity:.2f}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Multiple generation failed: {str(e)}")
-    
-    def analyze_dungeon(self):
-        """Analyze the current dungeon"""
-        if not self.generator:
-            messagebox.showwarning("Warning", "Generate a dungeon first!")
-            return
-        
-        try:
-            # Path analysis
-            if self.generator.start_room and self.generator.end_room:
-                path = self.find_shortest_path(self.generator.start_room, self.generator.end_room)
-                if path:
-                    self.log_result(f"\nShortest path length: {len(path)} rooms")
-                else:
-                    self.log_result("\nNo path found between start and end!")
-            
-            # Room type distribution
-            room_types = defaultdict(int)
-            for room in self.generator.rooms.values():
-                room_types[room.room_type] += 1
-            
-            self.log_result(f"\nRoom distribution:")
-            for room_type, count in room_types.items():
-                self.log_result(f"  {room_type}: {count}")
-            
-            # Connectivity analysis
-            connections = [len(room.connections) for room in self.generator.rooms.values()]
-            avg_connections = sum(connections) / len(connections)
-            max_connections = max(connections)
-            min_connections = min(connections)
-            
-            self.log_result(f"\nConnectivity:")
-            self.log_result(f"  Average: {avg_connections:.2f}")
-            self.log_result(f"  Max: {max_connections}")
-            self.log_result(f"  Min: {min_connections}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Analysis failed: {str(e)}")
-    
-    def find_shortest_path(self, start_room, end_room):
-        """Find shortest path between two rooms using BFS"""
-        if start_room == end_room:
-            return [start_room]
-        
-        queue = deque([(start_room, [start_room])])
-        visited = {start_room}
-        
-        while queue:
-            current_room, path = queue.popleft()
-            
-            for connected_room in current_room.connections:
-                if connected_room == end_room:
-                    return path + [connected_room]
-                
-                if connected_room not in visited:
-                    visited.add(connected_room)
-                    queue.append((connected_room, path + [connected_room]))
-        
-        return None  # No path found
-    
-    def log_result(self, message):
-        """Add message to results text area"""
-        self.results_text.insert(tk.END, message + "\n")
-        self.results_text.see(tk.END)
-        self.root.update()
-    
-    def run(self):
-        """Start the GUI"""
-        self.root.mainloop()
-
-# Example usage and testing
-if __name__ == "__main__":
-    # Create and run the GUI
-    app = DungeonTesterGUI()
-    app.run()
-    
-    # Alternative: Command line testing
-    # print("Testing 2D Dungeon Generation...")
-    # gen_2d = DungeonGenerator(2, False)
-    # gen_2d.generate_2d_organic(20, 20, 0.3)
-    # 
-    # visualizer = DungeonVisualizer()
-    # visualizer.visualize_2d(gen_2d)
-    # 
-    # print("Testing 3D Dungeon Generation...")
-    # gen_3d = DungeonGenerator(3, False)
-    # gen_3d.generate_3d_layered(15, 15, 5, 0.25)
-    # visualizer.visualize_3d(gen_3d)
-    # 
-    # print("Testing 4D Dungeon Generation...")
-    # gen_4d = DungeonGenerator(3, True)
-    # gen_4d.generate_4d_temporal(10, 10, 3, 3, 0.2)
-    # visualizer.visualize_4d(gen_4d)
\ No newline at end of file
+                current_time = axis_value(current, TIME_AXIS)
+                if self.rng.random() < 0.5 and current_time > 0:
+                    current -= time_stride
+                elif current_time < self._time_states - 1:
+                    current += time_stride
+
+            room = self._index.get(current)
+            if room is None:
+                # Connected to the room the branch stands in
+                previous = self._add_room(current, TREASURE if self.rng.random() < 0.1 else NORMAL, previous)
+            elif room != previous:
+                # Travel to a room already there (an other time state of the same place)
+                self._edges.extend((previous, room))
+                previous = room
+
+
+# name -> (dimensions, time_enabled, generate method)
+MODES = {
+    "2d": (2, False, "generate_2d_organic"),
+    "2d_constrained": (2, False, "generate_2d_constrained"),
+    "3d": (3, False, "generate_3d_layered"),
+    "4d": (3, True, "generate_4d_temporal"),
+}
+
+
+def generate_layout(mode: str, seed: int, **options) -> DungeonGenerator:
+    """Layout of a mode generated from its own seed (same seed and options, same layout)."""
+    dimensions, time_enabled, method = MODES[mode]
+    generator = DungeonGenerator(dimensions, time_enabled, rng=random.Random(seed))
+    getattr(generator, method)(**options)
+    return generator
+
+
+def __getattr__(name):
+    # Old imports (from engine.dungeon_generator import DungeonVisualizer) still work, without loading matplotlib/tkinter at startup
+    if name in ("DungeonVisualizer", "DungeonTesterGUI"):
+        from engine import dungeon_visualizer
+        return getattr(dungeon_visualizer, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,312 @@
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+
+"""
+Graph metrics of the layouts of engine.dungeon_generator, without any GUI.
+
+Everything works on the adjacency lists of DungeonGenerator.adjacency()
+(room indexes, the order of iter_rooms()):
+
+    bfs / shortest_path     parent-pointer BFS, no path copies
+    dijkstra                weighted distances (weight(a, b) callable)
+    critical_rooms          articulation points and bridges (iterative Tarjan)
+    diameter                double BFS sweep (exact on trees), all the BFS with exact=True
+    analyze                 all the metrics of one layout, as a JSON-able dict
+    summarize               mean/min/max of many layouts + per-depth curves
+
+Batch over generated layouts:
+    python -m engine.dungeon_metrics --mode 2d --count 1000 --workers 4
+    python -m engine.dungeon_metrics --mode 2d_constrained --option min_distance=30 --option max_dead_ends=6
+"""
+
+import heapq
+from collections import deque
+
+from engine.dungeon_generator import MODES, generate_layout
+
+
+def bfs(adjacency: list[list[int]], source: int) -> tuple[list[int], list[int]]:
+    """(distance, parent) of every room from source, -1 when unreachable (parent of source: -1)."""
+    distance = [-1] * len(adjacency)
+    parent = [-1] * len(adjacency)
+    distance[source] = 0
+    queue = deque([source])
+    while queue:
+        room = queue.popleft()
+        next_distance = distance[room] + 1
+        for neighbor in adjacency[room]:
+            if distance[neighbor] < 0:
+                distance[neighbor] = next_distance
+                parent[neighbor] = room
+                queue.append(neighbor)
+    return distance, parent
+
+
+def path_to(parent: list[int], target: int) -> list[int]:
+    """Path from the BFS/Dijkstra source to target, rebuilt from the parent pointers."""
+    path = [target]
+    while parent[path[-1]] >= 0:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def shortest_path(adjacency: list[list[int]], source: int, target: int) -> list[int] | None:
+    """Rooms of a shortest path from source to target (both included), None if there is none."""
+    distance, parent = bfs(adjacency, source)
+    return path_to(parent, target) if distance[target] >= 0 else None
+
+
+def dijkstra(adjacency: list[list[int]], source: int, weight=None) -> tuple[list[float], list[int]]:
+    """(distance, parent) with weight(a, b) per connection (1 by default), inf when unreachable."""
+    distance = [float("inf")] * len(adjacency)
+    parent = [-1] * len(adjacency)
+    distance[source] = 0
+    heap = [(0, source)]
+    while heap:
+        current, room = heapq.heappop(heap)
+        if current > distance[room]:
+            continue
+        for neighbor in adjacency[room]:
+            candidate = current + (weight(room, neighbor) if weight else 1)
+            if candidate < distance[neighbor]:
+                distance[neighbor] = candidate
+                parent[neighbor] = room
+                heapq.heappush(heap, (candidate, neighbor))
+    return distance, parent
+
+
+def critical_rooms(adjacency: list[list[int]]) -> tuple[list[int], list[tuple[int, int]]]:
+    """
+    (articulation points, bridges): rooms and connections whose removal splits
+    the dungeon. Iterative, so big layouts do not hit the recursion limit.
+    """
+    count = len(adjacency)
+    discovered = [-1] * count
+    low = [0] * count
+    parent = [-1] * count
+    points = set()
+    bridges = []
+    timer = 0
+
+    for root in range(count):
+        if discovered[root] >= 0:
+            continue
+        discovered[root] = low[root] = timer
+        timer += 1
+        root_children = 0
+        stack = [(root, iter(adjacency[root]))]
+        while stack:
+            room, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if discovered[neighbor] < 0:
+                    parent[neighbor] = room
+                    discovered[neighbor] = low[neighbor] = timer
+                    timer += 1
+                    if room == root:
+                        root_children += 1
+                    stack.append((neighbor, iter(adjacency[neighbor])))
+                    break
+                if neighbor != parent[room] and discovered[neighbor] < low[room]:
+                    low[room] = discovered[neighbor]
+            else:
+                stack.pop()
+                if stack:
+                    above = stack[-1][0]
+                    if low[room] < low[above]:
+                        low[above] = low[room]
+                    if low[room] > discovered[above]:
+                        bridges.append((above, room))
+                    if above != root and low[room] >= discovered[above]:
+                        points.add(above)
+        if root_children > 1:
+            points.add(root)
+
+    return sorted(points), bridges
+
+
+def eccentricity(adjacency: list[list[int]], source: int) -> tuple[int, int]:
+    """(farthest reachable room, its distance) from source."""
+    distance, _ = bfs(adjacency, source)
+    farthest = max(range(len(distance)), key=distance.__getitem__)
+    return farthest, distance[farthest]
+
+
+def diameter(adjacency: list[list[int]], start: int = 0, exact: bool = False) -> int:
+    """
+    Longest shortest path of the component of start. The double sweep (two BFS)
+    is exact on trees, which most layouts are; exact=True runs a BFS from every room.
+    """
+    if not adjacency:
+        return 0
+    if exact:
+        reachable = [room for room, d in enumerate(bfs(adjacency, start)[0]) if d >= 0]
+        return max(eccentricity(adjacency, room)[1] for room in reachable)
+    farthest, _ = eccentricity(adjacency, start)
+    return eccentricity(adjacency, farthest)[1]
+
+
+def analyze(generator, exact_diameter: bool = False) -> dict:
+    """Metrics of a generated layout (DungeonGenerator after one of its generate_* methods)."""
+    adjacency = generator.adjacency()
+    room_types = [room_type for _, room_type, _ in generator.iter_rooms()]
+    start, end = generator.start_index, generator.end_index
+    count = len(adjacency)
+    if not count:
+        return {"rooms": 0}
+
+    degrees = [len(neighbors) for neighbors in adjacency]
+    distance, parent = bfs(adjacency, start)
+    points, bridges = critical_rooms(adjacency)
+    edges = sum(degrees) // 2
+    components = _components(adjacency)
+
+    # Tree from the start: every room except the start has one parent, the others are its children
+    children = [0] * count
+    for room in range(count):
+        if parent[room] >= 0:
+            children[parent[room]] += 1
+    parents = [c for c in children if c]
+
+    max_depth = max(distance)
+    rooms_by_depth = [0] * (max_depth + 1)
+    dead_ends_by_depth = [0] * (max_depth + 1)
+    treasures_by_depth = [0] * (max_depth + 1)
+    for room, depth in enumerate(distance):
+        if depth < 0:
+            continue
+        rooms_by_depth[depth] += 1
+        if degrees[room] == 1 and room != start:
+            dead_ends_by_depth[depth] += 1
+        if room_types[room] == "treasure":
+            treasures_by_depth[depth] += 1
+
+    path_bridges = 0
+    if end >= 0 and distance[end] >= 0:
+        bridge_set = {frozenset(bridge) for bridge in bridges}
+        path = path_to(parent, end)
+        path_bridges = sum(frozenset(pair) in bridge_set for pair in zip(path, path[1:]))
+
+    types: dict[str, int] = {}
+    for room_type in room_types:
+        types[room_type] = types.get(room_type, 0) + 1
+
+    # Constrained generation: attempts and time spent for this layout
+    report = {"attempts": generator.report["attempts"], "generationMs": generator.report["ms"]} if generator.report else {}
+
+    return {
+        "rooms": count,
+        "connections": edges,
+        "components": components,
+        "cycles": edges - count + components,  # independent loops, 0 for a tree
+        "reachable": sum(d >= 0 for d in distance),
+        "startToEnd": distance[end] if end >= 0 else -1,
+        "maxDepth": max_depth,
+        "diameter": diameter(adjacency, start, exact_diameter),
+        "deadEnds": sum(dead_ends_by_depth),
+        "branchingFactor": round(sum(parents) / len(parents), 3) if parents else 0.0,
+        "avgConnections": round(sum(degrees) / count, 3),
+        "articulationPoints": len(points),
+        "bridges": len(bridges),
+        "criticalPathBridges": path_bridges,  # connections every start -> end path has to take
+        "roomTypes": types,
+        "roomsByDepth": rooms_by_depth,
+        "deadEndsByDepth": dead_ends_by_depth,
+        "treasuresByDepth": treasures_by_depth,
+        **report,
+    }
+
+
+def _components(adjacency: list[list[int]]) -> int:
+    seen = [False] * len(adjacency)
+    components = 0
+    for root in range(len(adjacency)):
+        if seen[root]:
+            continue
+        components += 1
+        seen[root] = True
+        stack = [root]
+        while stack:
+            for neighbor in adjacency[stack.pop()]:
+                if not seen[neighbor]:
+                    seen[neighbor] = True
+                    stack.append(neighbor)
+    return components
+
+
+def _add_curve(total: list, curve: list):
+    if len(total) < len(curve):
+        total.extend([0] * (len(curve) - len(total)))
+    for depth, value in enumerate(curve):
+        total[depth] += value
+
+
+def summarize(metrics: list[dict]) -> dict:
+    """Mean/min/max of the numeric metrics and the mean per-depth curves of many layouts."""
+    metrics = [m for m in metrics if m.get("rooms")]
+    if not metrics:
+        return {"layouts": 0}
+    summary: dict = {"layouts": len(metrics)}
+    for key, value in metrics[0].items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            values = [m[key] for m in metrics]
+            summary[key] = {"mean": round(sum(values) / len(values), 3), "min": min(values), "max": max(values)}
+
+    for key in ("roomsByDepth", "deadEndsByDepth", "treasuresByDepth"):
+        total: list = []
+        for m in metrics:
+            _add_curve(total, m[key])
+        summary[key] = [round(value / len(metrics), 3) for value in total]
+    # Share of the rooms at each depth that are dead ends / treasures (difficulty per depth)
+    summary["deadEndRateByDepth"] = [round(d / r, 3) if r else 0.0 for d, r in zip(summary["deadEndsByDepth"], summary["roomsByDepth"])]
+    summary["treasureRateByDepth"] = [round(t / r, 3) if r else 0.0 for t, r in zip(summary["treasuresByDepth"], summary["roomsByDepth"])]
+    return summary
+
+
+# --- Batch over generated layouts ---
+
+def _metrics_task(task) -> dict:
+    mode, seed, options = task
+    return analyze(generate_layout(mode, seed, **options))
+
+
+def batch_metrics(mode: str, seeds, workers: int = 1, **options) -> list[dict]:
+    """analyze() of the layout of every seed (same seed, same layout), over workers processes."""
+    tasks = [(mode, seed, options) for seed in seeds]
+    if workers <= 1:
+        return [_metrics_task(task) for task in tasks]
+    import multiprocessing
+    with multiprocessing.Pool(workers) as pool:
+        return pool.map(_metrics_task, tasks, chunksize=max(1, len(tasks) // (workers * 8)))
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import os
+    import time
+
+    parser = argparse.ArgumentParser(description="Dungeon layout metrics")
+    parser.add_argument("--mode", choices=list(MODES), default="2d")
+    parser.add_argument("--count", type=int, default=1000, help="layouts to generate")
+    parser.add_argument("--seed", type=int, default=0, help="layout i uses seed + i")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--option", action="append", default=[], metavar="NAME=VALUE",
+                        help="generation option, e.g. min_rooms=40 (repeatable)")
+    parser.add_argument("--out", default=None, help="write the summary to this JSON file")
+    args = parser.parse_args()
+    options = {name: json.loads(value) for name, value in (option.split("=", 1) for option in args.option)}
+
+    start = time.perf_counter()
+    summary = summarize(batch_metrics(args.mode, range(args.seed, args.seed + args.count), args.workers, **options))
+    elapsed = time.perf_counter() - start
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    print(json.dumps({key: value for key, value in summary.items() if not isinstance(value, list)}, indent=2))
+    print(f"{args.count} {args.mode} layouts analyzed in {elapsed:.2f}s")
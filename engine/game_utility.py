@@ -11,7 +11,7 @@ __creation__ = "09-03-2025"
 # L​ic​e​n​s​e​d​ ​u​nd​e​r​ ​C​C​-​BY​-​N​C​ ​4​.​0
 
 
-from sys import path, stdout, getwindowsversion # Not importing the whole liv sys as it's not needed
+from sys import path, stdout # Not importing the whole liv sys as it's not needed
 import os # need the whole os lib for msvcrt in the func: `timed_input_pattern`. For security, simlply press ctrl + f and os. to see where is it used and how.
 import time
 import random
@@ -95,7 +95,10 @@ def maximize_terminal():
       - is so nice it crash the terminal graphics:
         - cant select, cant move the terminal, cursor disapear, shortcut don't work (exept for alt+f4) and so on...
         - to fix it you have to minimize every windows (display desktop or 3 finger donw with a laptop  pad) and maximise them back to refresh everyting (reboot graphics driver don't work (ctrl+maj+win+b))"""
-    if platform.system() == "Windows" and getwindowsversion().build >= 230000: # Check if it's windows 10
+    if platform.system() != "Windows":
+        return
+    from sys import getwindowsversion # Only exists on Windows
+    if getwindowsversion().build >= 230000: # Check if it's windows 10
         from ctypes import windll # Use C to call windows API throught dll (used only to get and maximize the window terminal in the func `maximize_terminal()`)
         # Get console window handle
         hwnd = windll.kernel32.GetConsoleWindow()
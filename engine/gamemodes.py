@@ -13,8 +13,10 @@ from interface.colors import Colors
 from engine.game_utility import (clear_screen, game_over, choose_difficulty,
                                  handle_error, interactive_bar, loading,
                                  move_cursor, get_input)
-from engine.dungeon import Room, Dungeon, generate_dungeon 
+from engine.dungeon import Room, Dungeon, generate_dungeon, prefetch_layout
 from engine.logger import logger
+from engine.save_system import SaveManager
+from engine import analytics, telemetry
 from core.entity import Player
 from data import get_random_names, quests_dict
 from config import agent_is_enabled, get_agent
@@ -58,7 +60,8 @@ class DungeonMode(BaseGameMode):
     Contains all logic for exploration, inventory, resting, combat, and dungeon progression.
     """
     
-    def __init__(self, continue_game: bool = False, loaded_player: Optional[Player] = None, dev_mode: bool = False, debug: int = 0) -> None:
+    def __init__(self, continue_game: bool = False, loaded_player: Optional[Player] = None, dev_mode: bool = False, debug: int = 0,
+                 loaded_dungeon: Optional[Dungeon] = None) -> None:
         """
         Initialize the DungeonMode.
         
@@ -67,6 +70,7 @@ class DungeonMode(BaseGameMode):
             loaded_player: The loaded player object if continuing
             dev_mode: Developer mode flag
             debug: Debug level
+            loaded_dungeon: Rooms left restored from the save (save_system.restore_dungeon)
         """
         # Initialize player - ensure it's always a Player instance
         if continue_game and loaded_player is not None:
@@ -95,9 +99,16 @@ class DungeonMode(BaseGameMode):
         self.end: bool = False
         self.player_survived: bool = True
         
-        # Initialize dungeon
-        self.dungeon: Dungeon = Dungeon()
-        self.dungeon.extend(generate_dungeon(player=self.player))
+        # Initialize dungeon (the saved one when continuing a run)
+        if continue_game and loaded_dungeon is not None:
+            self.dungeon: Dungeon = loaded_dungeon
+            prefetch_layout(self.player) # next puzzle level generated while this one is played
+        else:
+            self.dungeon: Dungeon = Dungeon()
+            self.dungeon.extend(generate_dungeon(player=self.player))
+
+        # Delta autosave after every room, written by the background save thread
+        self.save_manager = SaveManager(background=True)
     
     def run(self):
         """Main gameplay loop for DungeonMode."""
@@ -123,7 +134,7 @@ class DungeonMode(BaseGameMode):
             
             # Use get_input instead of input to allow agent control if enabled
             choice = get_input(f"{Colors.CYAN}Your choice: {Colors.RESET}", options=["1","2","3"], player=self.player, use_agent=agent_is_enabled())
-            logger.info(f"Player choice: {choice}")
+            logger.info("Player choice: %s", choice)
             
             if choice == "1":  # Explore a new room
                 self._handle_exploration()
@@ -168,7 +179,14 @@ class DungeonMode(BaseGameMode):
     def cleanup(self):
         """Cleanup and save state when exiting DungeonMode."""
         try:
-            self.player.save_player("auto_save")
+            self.player.save_player("auto_save", self.dungeon, "auto")
+            analytics.emit_player(self.player, "session_end")
+            analytics.flush(timeout=5)
+            analytics.publish()  # analytics_user files (+ upload if the player agreed), once the events are on disk
+            telemetry.flush()
+            # Flush barrier: the room autosaves still queued must reach the disk before leaving
+            if not self.save_manager.flush(timeout=10):
+                logger.warning("DungeonMode cleanup: background saves still pending after 10s.")
             agent = get_agent()
             if agent:
                 agent.save_q_table("ai/q_table.json")
@@ -186,7 +204,10 @@ class DungeonMode(BaseGameMode):
                 return
             
             print(f"\n{Colors.GREEN}{Colors.BOLD}Congratulations! You've cleared dungeon level {self.player.dungeon_level}!{Colors.RESET}")
-            logger.info(f"Player cleared dungeon level {self.player.dungeon_level}")
+            logger.info("Player cleared dungeon level %s", self.player.dungeon_level)
+            analytics.emit("level_cleared", self.player, dungeon_level=self.player.dungeon_level,
+                           level=self.player.level, difficulty=str(self.player.difficulty))
+            analytics.emit_player(self.player, "level_cleared")
             self.player.dungeon_level += 1
 
             # After finishing level 10 dungeon for the first time
@@ -244,7 +265,8 @@ class DungeonMode(BaseGameMode):
         else:
             if self.debug >= 1:
                 print(f"{Colors.CYAN}DEBUG: Dungeon size before exploration: {len(self.dungeon)}{Colors.RESET}")
-            room = self.dungeon.pop(0)
+            room = self.dungeon.next_room(self.player)
+            telemetry.record(telemetry.ROOM_ENTERED, self.player, self.player.stats.hp, room.room_type)
             self.player_survived = room.enter(self.player)
             self.player.current_room_number += 1
             self.player.total_rooms_explored += 1
@@ -268,10 +290,21 @@ class DungeonMode(BaseGameMode):
                         
                         self.player.quests.remove(quest)
                         self.player.completed_quests.append(quest)
+
+            analytics.emit("room", self.player, room_type=room.room_type, dungeon_level=self.player.dungeon_level,
+                           room_number=self.player.current_room_number, survived=bool(self.player_survived and self.player.is_alive()),
+                           hp=self.player.stats.hp, gold=self.player.gold)
+
+            if self.player_survived and self.player.is_alive():
+                try:
+                    self.save_manager.journal_autosave(self.player, self.dungeon)
+                except Exception as e:
+                    logger.warning(f"Room autosave failed: {e}")
             
             if not self.player_survived or not self.player.is_alive() and self.end == False:
                 # Instead of game over and stopping the game, reset the player and dungeon to respawn
                 game_over("died in battle")
+                analytics.emit_player(self.player, "death")
                 print(f"\n{Colors.RED}You have died! Respawning...{Colors.RESET}")
                 self.player.reset_player()
                 self.dungeon = Dungeon()
@@ -353,7 +386,7 @@ class DungeonMode(BaseGameMode):
         """Handle game saving and analytics."""
         # Ask the save name:
         save_name = get_input(f"\n{Colors.YELLOW}Enter a save name: {Colors.RESET}")
-        self.player.save_player(save_name)
+        self.player.save_player(save_name, self.dungeon)
         # Save agent Q-table if agent is enabled
         agent = get_agent()
         if agent:
@@ -403,7 +436,7 @@ class DungeonMode(BaseGameMode):
                 confirm = get_input(f"{Colors.RED}Are you sure you want to quit? (y/n): {Colors.RESET}").lower()
                 if confirm == "y":
                     try:
-                        self.player.save_player("auto_save")
+                        self.player.save_player("auto_save", self.dungeon, "auto")
                         # Save agent Q-table if agent is enabled
                         agent = get_agent()
                         if agent:
@@ -0,0 +1,108 @@
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+
+"""
+Layouts of engine.dungeon_generator generated ahead of time.
+
+A layout only depends on its seed (and mode/options), so the seed of the
+next puzzle level is drawn one level ahead (Player.next_layout_seed) and
+prefetch() hands it to a background thread while the player is still in the
+current level. take() returns the pooled layout, or generates it right away
+when it is not ready: the result is the same either way, the pool only moves
+the work out of the level transition.
+
+A layout is (rooms, path): the (coords, room_type) of its rooms in generation
+order, and the indexes of the rooms of the start -> end path.
+"""
+
+import threading
+from collections import OrderedDict, deque
+
+from engine.dungeon_generator import generate_layout
+from engine.logger import logger
+
+
+POOL_CAPACITY = 8
+
+
+def build_layout(mode: str, seed: int, options: tuple) -> tuple[list[tuple[tuple, str]], list[int]]:
+    generator = generate_layout(mode, seed, **dict(options))
+    return [(coords, room_type) for coords, room_type, _ in generator.iter_rooms()], generator.path()
+
+
+class LayoutPool:
+    """Background generation of layouts, kept by (mode, seed, options) up to capacity."""
+
+    def __init__(self, capacity: int = POOL_CAPACITY):
+        self.capacity = capacity
+        self._ready: OrderedDict[tuple, tuple] = OrderedDict()
+        self._queue: deque[tuple] = deque()
+        self._running: tuple | None = None
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(mode: str, seed: int, options: dict) -> tuple:
+        return (mode, seed, tuple(sorted(options.items())))
+
+    def prefetch(self, seed: int, mode: str = "2d", **options):
+        """Queues the layout for the background thread (no-op if it is already ready or queued)."""
+        key = self._key(mode, seed, options)
+        with self._cond:
+            if key in self._ready or key in self._queue or key == self._running:
+                return
+            self._queue.append(key)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="LayoutPool", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def take(self, seed: int, mode: str = "2d", **options) -> tuple[list[tuple[tuple, str]], list[int]]:
+        """The layout of seed: from the pool if ready (or being generated), else generated now."""
+        key = self._key(mode, seed, options)
+        with self._cond:
+            if key in self._queue:
+                self._queue.remove(key)  # not started yet: generating it here is faster than waiting
+            self._cond.wait_for(lambda: self._running != key)
+            layout = self._ready.pop(key, None)
+
+        if layout is not None:
+            self.hits += 1
+            return layout
+        self.misses += 1
+        return build_layout(*key)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue)
+                key = self._running = self._queue.popleft()
+            try:
+                layout = build_layout(*key)
+            except Exception as e:
+                logger.warning("Layout pre-generation failed for %s: %s", key, e)
+                layout = None
+            with self._cond:
+                if layout is not None:
+                    self._ready[key] = layout
+                    while len(self._ready) > self.capacity:
+                        self._ready.popitem(last=False)
+                self._running = None
+                self._cond.notify_all()
+
+
+_pool: LayoutPool | None = None
+
+
+def get_pool() -> LayoutPool:
+    """Shared pool of the game."""
+    global _pool
+    if _pool is None:
+        _pool = LayoutPool()
+    return _pool
@@ -3,9 +3,22 @@
 
 __creation__ = "12-05-2025"
 
+"""
+Logger du jeu: logs/session_<date>.log
+
+The game thread only puts the records in a queue (QueueHandler), a
+QueueListener thread formats them and writes the file, so a log call never
+waits for the disk. Level INFO by default, DUNGEON_HUNTER_LOG_LEVEL=DEBUG
+(or set_log_level) for the detailed generation/combat logs. Hot paths use
+%-style arguments: nothing is formatted for the records below the level.
+"""
+
+import atexit
 import logging
 import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 # Dossier des logs
 if not os.path.exists("logs"):
@@ -22,12 +35,42 @@ else: # Clean up old logs < 100KB
 # Nom unique basé sur la date/heure
 log_filename = datetime.now().strftime("logs/session_%Y-%m-%d_%H-%M-%S.log")
 
+DEFAULT_LEVEL = os.environ.get("DUNGEON_HUNTER_LOG_LEVEL", "INFO").upper()
+
 # Configuration du logger
-logging.basicConfig(
-    filename=log_filename,
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s"
-)
+_file_handler = logging.FileHandler(log_filename, delay=True)
+_file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s"))
+_queue_handler = QueueHandler(queue.SimpleQueue())
+_listener: QueueListener | None = None
 
 logger = logging.getLogger()
+logger.addHandler(_queue_handler)
+logger.setLevel(DEFAULT_LEVEL if isinstance(logging.getLevelName(DEFAULT_LEVEL), int) else logging.INFO)
+
+
+def _start_listener():
+    """(Re)starts the writer thread on a new queue, also used in forked processes (the thread is not copied)."""
+    global _listener
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(_queue_handler.queue, _file_handler)
+    _listener.start()
+
+
+def stop_listener():
+    """Writes the queued records and stops the writer thread (at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    _file_handler.close()
+
+
+def set_log_level(level: int | str):
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+
+
+_start_listener()
+atexit.register(stop_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_start_listener)
 
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.entity import Player
+
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+
+"""
+Per-run random number generator.
+
+A run owns one RunRNG (player.rng) built from a run seed that is stored in the
+saves. Each subsystem draws from its own stream (player.rng.stream("combat")...)
+forked from that seed, so a combat roll never shifts the dungeon generation and
+two runs with the same seed play out the same way, in any process.
+
+to_dict() also stores the Mersenne Twister state of the generator and of its
+streams (625 words packed little-endian in base64), so a restored run goes on
+with the exact draws it would have made.
+
+Every draw of random.Random consumes whole 32-bit words, so a state is also
+"the previous state + n words": count_draws() finds n, advance() replays it.
+The autosave journal stores these counts instead of the packed states.
+"""
+
+import base64
+import hashlib
+import os
+import random
+import struct
+
+
+MT_STATE = struct.Struct("<625I")  # 624 words + position of random.Random's state
+
+
+def pack_state(rng: random.Random) -> dict:
+    version, internal, gauss_next = rng.getstate()
+    return {"mt": base64.b64encode(MT_STATE.pack(*internal)).decode("ascii"), "gauss": gauss_next, "version": version}
+
+
+def unpack_state(rng: random.Random, data: dict):
+    internal = MT_STATE.unpack(base64.b64decode(data["mt"]))
+    rng.setstate((data.get("version", 3), internal, data.get("gauss")))
+
+
+def advance(rng: random.Random, words: int):
+    """Draws words 32-bit words: same state as any mix of random()/randint()... that consumed them."""
+    if words:
+        rng.getrandbits(32 * words)
+
+
+def count_draws(cursor: random.Random, target: random.Random, max_words: int = 1 << 18) -> int | None:
+    """
+    32-bit words drawn to go from the state of cursor to the one of target (cursor is
+    advanced to it), or None if target is not ahead of cursor by at most max_words.
+    Only the states with the same position in the 624-word block are compared.
+    """
+    _, goal, gauss = target.getstate()
+    _, current, cursor_gauss = cursor.getstate()
+    if gauss != cursor_gauss:
+        return None
+    step = (goal[-1] - current[-1]) % 624
+    words = 0
+    while words + step <= max_words:
+        advance(cursor, step)
+        words += step
+        if cursor.getstate()[1] == goal:
+            return words
+        step = 624
+    return None
+
+
+# Stream names
+GENERATION = "generation"   # rooms, enemies, dungeon layouts
+COMBAT = "combat"           # hits, crits, dodges, escapes, drops
+LOOT = "loot"               # items and rarities
+TRAPS = "traps"
+
+
+class RunRNG(random.Random):
+    """random.Random with a known seed that can be forked into independent named streams."""
+
+    def __init__(self, seed: int | None = None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "big")
+        self.run_seed = int(seed)
+        self._streams: dict[str, RunRNG] = {}
+        super().__init__(self.run_seed)
+
+    def fork(self, name: str) -> RunRNG:
+        """New generator whose seed only depends on this seed and name (stable across processes, unlike hash())."""
+        digest = hashlib.sha256(f"{self.run_seed}:{name}".encode()).digest()
+        return RunRNG(int.from_bytes(digest[:8], "big"))
+
+    def stream(self, name: str) -> RunRNG:
+        """The forked stream for a subsystem, created on first use."""
+        if name not in self._streams:
+            self._streams[name] = self.fork(name)
+        return self._streams[name]
+
+    def to_dict(self):
+        """Seed, state of this generator and state of its streams."""
+        return {
+            "seed": self.run_seed,
+            "state": pack_state(self),
+            "streams": {name: pack_state(stream) for name, stream in self._streams.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = data or {}
+        rng = cls(data.get("seed"))
+        if "state" in data:
+            unpack_state(rng, data["state"])
+        for name, state in data.get("streams", {}).items():
+            unpack_state(rng.stream(name), state)
+        return rng
+
+    def __reduce__(self):
+        return (self.__class__, (self.run_seed,), {"state": self.getstate(), "streams": self._streams})
+
+    def __setstate__(self, data):
+        self.setstate(data["state"])
+        self._streams = data["streams"]
+
+    def __repr__(self):
+        return f"RunRNG(seed={self.run_seed})"
+
+
+def rng_for(player: Player | None, stream: str):
+    """The player's stream, or the global random module when there is no run RNG (tools, old objects)."""
+    rng = getattr(player, "rng", None)
+    if rng is None:
+        return random
+    return rng.stream(stream)
@@ -0,0 +1,161 @@
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+
+"""
+Write-ahead journal of the delta autosaves (SaveManager.journal_autosave).
+
+A journal slot is a full snapshot (a normal save) plus "<snapshot>.journal",
+one line per autosave:
+
+    <crc32 hex> {"journal": "<id>", "seq": 3, "meta": {...}, "ops": {...}}
+
+ops only holds the top-level keys of player_data that changed since the
+previous line:
+
+    ["set", value]                       replaced value
+    ["del"]                              removed key
+    ["splice", start, count, items]      list edit (inventory adds/removes...)
+
+A line also holds the changes of the dungeon_state (same ops, "dungeon")
+and the RNG words drawn since the previous line ("rng_draws", see
+engine.rng.count_draws); the full dungeon_state is only in the snapshot.
+
+The snapshot meta stores the journal id and the last seq folded into it
+(journal_id, journal_seq). On load the lines of the same journal with a
+higher seq are replayed in order, and replay stops at the first line whose
+CRC or JSON is wrong (a write cut by a crash), so a crash loses at most the
+last room, never the slot.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, List
+
+
+JOURNAL_SUFFIX = ".journal"
+
+SCALARS = (int, float, str, bool, type(None))
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode  # one encoder for every value
+_MISSING = object()
+
+
+def _splice(old: List[str], new: List[str], values: list) -> list:
+    """Smallest single splice turning the old encoded list into the new one."""
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[len(old) - 1 - end] == new[len(new) - 1 - end]:
+        end += 1
+    return ["splice", start, len(old) - start - end, values[start:len(values) - end]]
+
+
+class DeltaTracker:
+    """
+    Encoded copy of the last player_data written to a slot, to compute the next delta.
+    Scalars (most of the keys) are kept and compared as values, only the containers
+    are encoded (kept as a 1-tuple, so an encoded list never equals a str value).
+    """
+
+    __slots__ = ("_encoded", "_lists")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.reset(data)
+
+    def reset(self, data: Dict[str, Any]):
+        self._encoded = {key: value if type(value) in SCALARS else (_encode(value),) for key, value in data.items()}
+        self._lists = {key: [_encode(item) for item in value] for key, value in data.items() if isinstance(value, list)}
+
+    def diff(self, data: Dict[str, Any]) -> Dict[str, list]:
+        """Ops turning the previous player_data into data (the tracker then follows data)."""
+        ops = {}
+        encoded = {}
+        previous = self._encoded
+        for key, value in data.items():
+            if type(value) in SCALARS:
+                encoded[key] = value
+                old = previous.get(key, _MISSING)
+                # type() too: 1 == True == 1.0, but they are not the same JSON
+                if type(old) is type(value) and old == value:
+                    continue
+                ops[key] = ["set", value]
+                self._lists.pop(key, None)
+                continue
+            encoded[key] = text = (_encode(value),)
+            if previous.get(key) == text:
+                continue
+            if isinstance(value, list):
+                items = [_encode(item) for item in value]
+                ops[key] = _splice(self._lists[key], items, value) if key in self._lists else ["set", value]
+                self._lists[key] = items
+            else:
+                ops[key] = ["set", value]
+                self._lists.pop(key, None)
+
+        for key in self._encoded.keys() - data.keys():
+            ops[key] = ["del"]
+            self._lists.pop(key, None)
+
+        self._encoded = encoded
+        return ops
+
+
+def apply_delta(data: Dict[str, Any], ops: Dict[str, list]):
+    """Applies the ops of a journal line to player_data, in place."""
+    for key, op in ops.items():
+        if op[0] == "set":
+            data[key] = op[1]
+        elif op[0] == "del":
+            data.pop(key, None)
+        elif op[0] == "splice":
+            _, start, count, items = op
+            data.setdefault(key, [])[start:start + count] = items
+        else:
+            raise ValueError(f"Unknown journal op: {op[0]}")
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    payload = _encode(record).encode('utf-8')
+    return b"%08x " % zlib.crc32(payload) + payload + b"\n"
+
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    """Valid lines of a journal, up to the first damaged one."""
+    records = []
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n") or len(line) < 10:
+                    break
+                checksum, payload = line[:8], line[9:-1]
+                try:
+                    if int(checksum, 16) != zlib.crc32(payload):
+                        break
+                    records.append(json.loads(payload))
+                except ValueError:
+                    break
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def pending_records(path: str, journal_id: str | None, after_seq: int) -> List[Dict[str, Any]]:
+    """Lines to replay on a snapshot: same journal, consecutive seqs after the one folded into it."""
+    if not journal_id:
+        return []
+    pending = []
+    expected = after_seq + 1
+    for record in read_records(path):
+        if record.get("journal") != journal_id or record.get("seq", 0) < expected:
+            continue
+        if record["seq"] != expected:
+            break
+        pending.append(record)
+        expected += 1
+    return pending
@@ -6,7 +6,7 @@ if TYPE_CHECKING:
     from engine.dungeon import Dungeon
 
 
-__version__ = "34.0"
+__version__ = "38.0"
 __creation__ = "08-03-2026"
 
 
@@ -25,10 +25,19 @@ Each save will be stored as a JSON file with the following structure:
   },
 
   "player_data": {...},
-  "dungeon_state": {...},
+  "dungeon_state": {
+    "version": 1,
+    "dungeon_level": 5,
+    "current_room_number": 3,
+    "rooms": [{"room_type": "combat", "seed": ..., ...}, ...],  (RoomPlan.to_dict of the rooms left)
+    "rng": {"seed": ..., "state": {...}, "streams": {...}}      (RunRNG.to_dict)
+  },
   "inventory": {...}
 }
 
+restore_dungeon() turns dungeon_state back into the Dungeon of plans and the
+player's RNG, the level is not generated again.
+
 ---
 
 Saves' display format in the load menu to make it more user-friendly:
@@ -47,52 +56,470 @@ autosave_3 deleted
 autosave_2 → autosave_3
 autosave_1 → autosave_2
 new → autosave_1
+
+---
+
+Save index (saves/saves.index) so the load menu does not parse every save:
+{
+  "version": 1,
+  "saves": {
+    "manual-Dragondefer(lv12)-42.json": {"meta": {...}, "size": 18234, "mtime_ns": ..., "checksum": "sha256..."}
+  }
+}
+
+list_saves() only stats the files (os.scandir) and re-reads the saves whose
+size or mtime changed since the index was written (saves written by
+Player.save_player, copied by hand...). create_save, delete_save and autosave
+keep it up to date. The index is written to a temp file then os.replace'd,
+a crash never leaves it half written (worst case it is rebuilt).
+
+---
+
+Compact binary format (SaveManager(save_format="binary"), *.dhsave files):
+
+    header  struct "<4sBII"  magic b"DHSV", format version, meta length, body length
+    meta    compact UTF-8 JSON of "meta", readable without touching the body
+    body    zlib-compressed compact JSON of the rest (player_data, dungeon_state, inventory)
+
+load_save() detects the format from the first bytes, JSON saves keep working.
+
+---
+
+Delta autosave (journal_autosave, after each room): the first call writes a
+full "journal-<player_id>" snapshot, the next ones only append the changed
+keys of player_data to "<snapshot>.journal" (see engine.save_journal). Every
+compact_every rooms the journal is folded into a new snapshot. load_save()
+replays the journal on top of the snapshot.
+The full dungeon_state is only written in the snapshots: a line holds the
+changes of the rooms left and the number of RNG words drawn since the previous
+line (engine.rng.count_draws), not the packed Mersenne Twister states.
+
+---
+
+Writes: a save is written to "<file>.tmp", fsync'd, then os.replace'd, a
+crash leaves either the old save or the new one, never a truncated file.
+SaveManager(background=True) hands the writes to the shared SaveWriter thread:
+the game thread only serializes, back-to-back writes of the same file are
+coalesced (only the newest one hits the disk) and flush() waits for the queue
+to be empty (DungeonMode.cleanup, and at exit).
 """
 
 
+import atexit
+import hashlib
 import json
 import os
+import struct
+import threading
+import uuid
+import zlib
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from engine.game_utility import strip_ansi
+from engine.logger import logger
+from engine.save_journal import (JOURNAL_SUFFIX, DeltaTracker, apply_delta,
+                                 encode_record, pending_records)
+
+
+INDEX_FILENAME = "saves.index"
+INDEX_VERSION = 1
+
+SAVE_FORMATS = {"json": ".json", "binary": ".dhsave"}  # format -> extension
+SAVE_EXTENSIONS = tuple(SAVE_FORMATS.values())
+
+BINARY_MAGIC = b"DHSV"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sBII")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def encode_binary_save(save_data: Dict[str, Any]) -> bytes:
+    """Binary save: fixed header + meta JSON + zlib-compressed body."""
+    meta = json.dumps(save_data.get("meta", {}), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    body = {key: value for key, value in save_data.items() if key != "meta"}
+    body = zlib.compress(json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 6)
+    return BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(meta), len(body)) + meta + body
+
+
+def _unpack_header(header: bytes) -> tuple[int, int]:
+    """(meta length, body length) of a binary save header, ValueError if it is not one."""
+    if len(header) < BINARY_HEADER.size:
+        raise ValueError("Truncated binary save header")
+    magic, version, meta_len, body_len = BINARY_HEADER.unpack_from(header)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not a binary save")
+    if version > BINARY_VERSION:
+        raise ValueError(f"Binary save version {version} is newer than this game ({BINARY_VERSION})")
+    return meta_len, body_len
+
+
+def is_binary_save(raw: bytes) -> bool:
+    return raw[:len(BINARY_MAGIC)] == BINARY_MAGIC
+
+
+def read_save_meta(raw: bytes) -> Dict[str, Any]:
+    """Meta of a save, a binary save body is not decompressed."""
+    if is_binary_save(raw):
+        meta_len, _ = _unpack_header(raw)
+        return json.loads(raw[BINARY_HEADER.size:BINARY_HEADER.size + meta_len])
+    data = json.loads(raw)
+    return data['meta'] if 'meta' in data else legacy_meta(data)
+
+
+def read_save_header(filepath: str) -> Optional[Dict[str, Any]]:
+    """Meta of a binary save read from the file header only (None for a JSON save)."""
+    with open(filepath, 'rb') as f:
+        header = f.read(BINARY_HEADER.size)
+        if not is_binary_save(header):
+            return None
+        meta_len, _ = _unpack_header(header)
+        return json.loads(f.read(meta_len))
+
+
+def _load_binary_file(f) -> Dict[str, Any]:
+    """Reads a binary save from an open file, the body is decompressed chunk by chunk."""
+    meta_len, body_len = _unpack_header(f.read(BINARY_HEADER.size))
+    meta = json.loads(f.read(meta_len))
+    decompressor = zlib.decompressobj()
+    body = bytearray()
+    remaining = body_len
+    while remaining > 0:
+        chunk = f.read(min(STREAM_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise ValueError("Truncated binary save body")
+        remaining -= len(chunk)
+        body += decompressor.decompress(chunk)
+    body += decompressor.flush()
+    return {"meta": meta, **json.loads(body)}
+
+
+DUNGEON_STATE_VERSION = 1
+
+
+def dungeon_plans(player: 'Player', dungeon: 'Dungeon') -> Dict[str, Any]:
+    """dungeon_state without the RNG state (the part the journal lines diff)."""
+    return {
+        "version": DUNGEON_STATE_VERSION,
+        "dungeon_level": player.dungeon_level,
+        "current_room_number": player.current_room_number,
+        "rooms": dungeon.to_dict(),
+    }
+
+
+def dungeon_state(player: 'Player', dungeon: 'Dungeon') -> Dict[str, Any]:
+    """Rooms left (as plans) and RNG state of the run."""
+    return {**dungeon_plans(player, dungeon), "rng": player.rng.to_dict()}
+
+
+def journal_draws(cursor, rng) -> Optional[Dict[str, Any]]:
+    """
+    Words drawn by the run RNG and each of its streams since cursor (a copy of the RNG
+    at the previous journal line, moved to rng's state): {"run": n, "streams": {name: n}},
+    without the zeros. None when a state cannot be reached from cursor (then the full state is written).
+    """
+    from engine.rng import count_draws
+
+    if cursor.run_seed != rng.run_seed:
+        return None
+    run = count_draws(cursor, rng)
+    if run is None:
+        return None
+    streams = {}
+    for name, stream in rng._streams.items():
+        words = count_draws(cursor.stream(name), stream)
+        if words is None:
+            return None
+        if words:
+            streams[name] = words
+    return {"run": run, "streams": streams}
+
+
+def replay_draws(state: Dict[str, Any], draws: Dict[str, Any]) -> Dict[str, Any]:
+    """RunRNG.to_dict() state advanced by the summed draws of journal lines."""
+    from engine.rng import RunRNG, advance
+
+    rng = RunRNG.from_dict(state)
+    advance(rng, draws.get("run", 0))
+    for name, words in draws.get("streams", {}).items():
+        advance(rng.stream(name), words)
+    return rng.to_dict()
+
+
+def restore_dungeon(save_data: Dict[str, Any], player: 'Player') -> Optional['Dungeon']:
+    """
+    Dungeon saved with the player (and restores player.rng), or None when the save
+    has no dungeon state for the player's level (old saves): the level is generated again.
+    """
+    from engine.dungeon import Dungeon
+    from engine.rng import RunRNG
+
+    state = save_data.get("dungeon_state") or {}
+    if state.get("version") != DUNGEON_STATE_VERSION or state.get("dungeon_level") != player.dungeon_level:
+        return None
+    if state.get("rng"):
+        player.rng = RunRNG.from_dict(state["rng"])
+    player.current_room_number = state.get("current_room_number", player.current_room_number)
+    return Dungeon.from_dict(state["rooms"])
+
+
+def legacy_meta(player_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Meta of an old save (just the player dict)."""
+    difficulty = player_data.get('difficulty', 'Normal')
+    if isinstance(difficulty, dict):
+        difficulty = difficulty.get('name', 'Normal')
+    return {
+        "player_name": strip_ansi(player_data.get('name') or 'Unknown'),
+        "level": player_data.get('level', 1),
+        "difficulty": str(difficulty).strip(),
+        "location": f"Dungeon Floor {player_data.get('dungeon_level', 1)}",
+        "playtime": player_data.get('playtime_seconds', 0),
+        "last_save": "Unknown",
+        "save_type": "manual"
+    }
+
+
+def atomic_write(path: str, data: bytes, fsync: bool = True):
+    """Writes data to path through a temp file + os.replace (+ fsync of the file and its directory)."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # The rename itself is only durable once the directory is synced (POSIX only)
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+def write_file(path: str, data: bytes, mode: str = "replace"):
+    """replace: atomic_write, append: adds data at the end, truncate: empties the file."""
+    if mode == "replace":
+        atomic_write(path, data)
+    elif mode == "append":
+        with open(path, 'ab') as f:
+            f.write(data)
+    elif mode == "truncate":
+        open(path, 'wb').close()
+    else:
+        raise ValueError(f"Unknown write mode: {mode}")
+
+
+class SaveWriter:
+    """
+    Background thread writing the saves in submission order.
+    A "replace" of a file still waiting in the queue is swapped for the new data.
+    """
+
+    def __init__(self):
+        self._queue = deque()  # [path, data, mode, on_done]
+        self._pending: Dict[str, list] = {}  # path -> queued replace not started yet
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, path: str, data: bytes, mode: str = "replace", on_done: Optional[Callable[[], None]] = None):
+        with self._cond:
+            queued = self._pending.get(path) if mode == "replace" else None
+            if queued is not None:
+                queued[1], queued[3] = data, on_done
+            else:
+                request = [path, data, mode, on_done]
+                self._queue.append(request)
+                if mode == "replace":
+                    self._pending[path] = request
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every submitted write is on disk. False if the timeout expired first."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue)
+                path, data, mode, on_done = request = self._queue.popleft()
+                if self._pending.get(path) is request:
+                    del self._pending[path]
+                self._busy = True
+            try:
+                write_file(path, data, mode)
+                if on_done:
+                    on_done()
+            except Exception as e:
+                logger.error(f"Background save of {path} failed: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+_writer: Optional[SaveWriter] = None
+_index_lock = threading.RLock()
+
+
+def get_save_writer() -> SaveWriter:
+    """Shared background writer, flushed at exit."""
+    global _writer
+    if _writer is None:
+        _writer = SaveWriter()
+        atexit.register(_writer.flush)
+    return _writer
 
 
 class SaveManager:
 
-    def __init__(self, save_dir: str = "./saves"):
+    def __init__(self, save_dir: str = "./saves", save_format: str = "json", compact_every: int = 20,
+                 background: bool = False):
+        if save_format not in SAVE_FORMATS:
+            raise ValueError(f"Unknown save format: {save_format} (expected one of {', '.join(SAVE_FORMATS)})")
         self.save_dir = save_dir
+        self.save_format = save_format
+        self.compact_every = compact_every
+        self.writer = get_save_writer() if background else None
+        self._journals: Dict[str, Dict[str, Any]] = {}  # snapshot filename -> journal state of this session
+        self.index_path = os.path.join(save_dir, INDEX_FILENAME)
         os.makedirs(self.save_dir, exist_ok=True)
 
+    # --- Save index ---
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION and isinstance(index.get("saves"), dict):
+                return index
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"version": INDEX_VERSION, "saves": {}}
+
+    def _write_index(self, index: Dict[str, Any]):
+        """Atomic write: temp file then os.replace (no fsync, a lost index is rebuilt)."""
+        try:
+            atomic_write(self.index_path, json.dumps(index, ensure_ascii=False).encode('utf-8'), fsync=False)
+        except OSError:
+            # The index is only a cache, list_saves rebuilds it next time
+            pass
+
+    def _index_entry(self, raw: bytes, stat: os.stat_result) -> Dict[str, Any]:
+        """Index entry of a save from its content (meta is None for an unreadable save)."""
+        try:
+            meta = read_save_meta(raw)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            meta = None
+        return {
+            "meta": meta,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "checksum": hashlib.sha256(raw).hexdigest(),
+        }
+
+    def refresh_index(self) -> Dict[str, Any]:
+        """Checks the index against the save directory and re-reads only the new or modified saves."""
+        self.flush()
+        with _index_lock:
+            return self._refresh_index()
+
+    def _refresh_index(self) -> Dict[str, Any]:
+        index = self._load_index()
+        entries = index["saves"]
+        changed = False
+        found = set()
+        journals = {}
+
+        with os.scandir(self.save_dir) as it:
+            for dir_entry in it:
+                if dir_entry.name.endswith(JOURNAL_SUFFIX):
+                    journals[dir_entry.name] = dir_entry.stat()
+                    continue
+                if not dir_entry.name.endswith(SAVE_EXTENSIONS) or not dir_entry.is_file():
+                    continue
+                found.add(dir_entry.name)
+                stat = dir_entry.stat()
+                cached = entries.get(dir_entry.name)
+                if cached and cached.get("size") == stat.st_size and cached.get("mtime_ns") == stat.st_mtime_ns:
+                    continue
+                try:
+                    with open(dir_entry.path, 'rb') as f:
+                        raw = f.read()
+                except OSError:
+                    continue
+                entries[dir_entry.name] = self._index_entry(raw, stat)
+                changed = True
+
+        for filename in set(entries) - found:
+            del entries[filename]
+            changed = True
+
+        # Meta of the last valid journal line, shown instead of the snapshot's one
+        for filename, entry in entries.items():
+            stat = journals.get(filename + JOURNAL_SUFFIX)
+            cached = entry.get("journal")
+            if stat is None:
+                if cached is not None:
+                    del entry["journal"]
+                    changed = True
+            elif not cached or cached["size"] != stat.st_size or cached["mtime_ns"] != stat.st_mtime_ns:
+                meta = entry.get("meta") or {}
+                records = pending_records(os.path.join(self.save_dir, filename + JOURNAL_SUFFIX),
+                                          meta.get("journal_id"), meta.get("journal_seq", 0))
+                entry["journal"] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                    "meta": records[-1]["meta"] if records else None}
+                changed = True
+
+        if changed:
+            self._write_index(index)
+        return index
+
+    def _update_index(self, add: Optional[Dict[str, Dict[str, Any]]] = None,
+                      remove: tuple = (), rename: tuple = ()):
+        """Applies a change made by this manager to the index without re-reading the saves."""
+        with _index_lock:
+            index = self._load_index()
+            entries = index["saves"]
+            for filename in remove:
+                entries.pop(filename, None)
+            # A rename keeps mtime and size, only the name changes
+            for old, new in rename:
+                if old in entries:
+                    entries[new] = entries.pop(old)
+            entries.update(add or {})
+            self._write_index(index)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Flush barrier: returns once the background writes are on disk (always True without background)."""
+        return self.writer.flush(timeout) if self.writer else True
+
+    def _write_file(self, path: str, data: bytes, mode: str = "replace", on_done: Optional[Callable[[], None]] = None):
+        if self.writer:
+            self.writer.submit(path, data, mode, on_done)
+            return
+        write_file(path, data, mode)
+        if on_done:
+            on_done()
+
     def list_saves(self) -> List[Dict[str, Any]]:
         """Returns a list of available saves with their metadata."""
         saves = []
-        for filename in os.listdir(self.save_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(self.save_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    if 'meta' in data:
-                        meta = data['meta']
-                    else:
-                        # Old save format
-                        player_data = data
-                        difficulty = player_data.get('difficulty', 'Normal')
-                        if isinstance(difficulty, dict):
-                            difficulty = difficulty.get('name', 'Normal')
-                        meta = {
-                            "player_name": strip_ansi(player_data.get('name') or 'Unknown'),
-                            "level": player_data.get('level', 1),
-                            "difficulty": str(difficulty).strip(),
-                            "location": f"Dungeon Floor {player_data.get('dungeon_level', 1)}",
-                            "playtime": player_data.get('playtime_seconds', 0),
-                            "last_save": "Unknown",
-                            "save_type": "manual"
-                        }
-                    meta['filename'] = filename
-                    saves.append(meta)
-                except (json.JSONDecodeError, KeyError):
-                    continue
+        for filename, entry in self.refresh_index()["saves"].items():
+            if entry.get("meta") is None:
+                continue
+            meta = dict((entry.get("journal") or {}).get("meta") or entry["meta"])
+            meta['filename'] = filename
+            saves.append(meta)
         # Sort by last_save descending
         saves.sort(key=lambda x: x.get('last_save', ''), reverse=True)
         return saves
@@ -100,65 +527,78 @@ class SaveManager:
     def load_save(self, save_id: str) -> Optional[Dict[str, Any]]:
         """Loads a save by its ID and returns the data."""
         filepath = os.path.join(self.save_dir, save_id)
+        self.flush()
         if not os.path.exists(filepath):
             return None
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                if is_binary_save(f.read(len(BINARY_MAGIC))):
+                    f.seek(0)
+                    data = _load_binary_file(f)
+                else:
+                    f.seek(0)
+                    data = json.load(f)
             # Handle old saves that are just player dict
             if 'meta' not in data:
                 # Old save format
                 player_data = data
-                difficulty = player_data.get('difficulty', 'Normal')
-                if isinstance(difficulty, dict):
-                    difficulty = difficulty.get('name', 'Normal')
-                meta = {
-                    "player_name": strip_ansi(player_data.get('name') or 'Unknown'),
-                    "level": player_data.get('level', 1),
-                    "difficulty": str(difficulty).strip(),
-                    "location": f"Dungeon Floor {player_data.get('dungeon_level', 1)}",
-                    "playtime": player_data.get('playtime_seconds', 0),
-                    "last_save": "Unknown",
-                    "save_type": "manual"
-                }
                 data = {
-                    "meta": meta,
+                    "meta": legacy_meta(player_data),
                     "player_data": player_data,
                     "dungeon_state": {},
                     "inventory": {}
                 }
+            self._replay_journal(filepath, data)
             return data
-        except json.JSONDecodeError:
+        except (ValueError, zlib.error):
             return None
 
-    def create_save(self, player: 'Player', dungeon: Optional['Dungeon'] = None, save_type: str = "manual") -> str:
-        """Creates a new save with the current player and dungeon state."""
-        from core.entity import Player  # Import here to avoid circular import
+    def _build_meta(self, player: 'Player', save_type: str) -> Dict[str, Any]:
+        return {
+            "player_name": player.name,
+            "level": player.level,
+            "difficulty": str(player.difficulty),
+            "location": f"Dungeon Floor {player.dungeon_level}",
+            "playtime": int(player.get_playtime()),
+            "last_save": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "save_type": save_type
+        }
 
-        try:
-            meta = {
-                "player_name": player.name,
-                "level": player.level,
-                "difficulty": str(player.difficulty),
-                "location": f"Dungeon Floor {player.dungeon_level}",
-                "playtime": int(player.get_playtime()),
-                "last_save": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                "save_type": save_type
-            }
-
-            save_data = {
-                "meta": meta,
-                "player_data": player.to_dict(),
-                "dungeon_state": {},  # TODO: implement dungeon serialization
-                "inventory": {}  # Inventory is part of player_data
-            }
-
-            filename = f"{save_type}-{player.name}(lv{player.level})-{player.player_id}.json"
-            filepath = os.path.join(self.save_dir, filename)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=4, ensure_ascii=False)
+    def _build_save_data(self, player: 'Player', dungeon: Optional['Dungeon'], save_type: str) -> Dict[str, Any]:
+        return {
+            "meta": self._build_meta(player, save_type),
+            "player_data": player.to_dict(),
+            "dungeon_state": dungeon_state(player, dungeon) if dungeon is not None else {},
+            "inventory": {}  # Inventory is part of player_data
+        }
+
+    def _write_save(self, filename: str, save_data: Dict[str, Any]):
+        """Writes a save in the manager's format (atomic_write) and indexes it."""
+        filepath = os.path.join(self.save_dir, filename)
+        if self.save_format == "binary":
+            raw = encode_binary_save(save_data)
+        else:
+            raw = json.dumps(save_data, indent=4, ensure_ascii=False).encode('utf-8')
+
+        def index_save():
+            self._update_index(add={filename: self._index_entry(raw, os.stat(filepath))})
 
+        self._write_file(filepath, raw, "replace", index_save)
+
+    def create_save(self, player: 'Player', dungeon: Optional['Dungeon'] = None, save_type: str = "manual",
+                    name: Optional[str] = None) -> str:
+        """
+        Creates a new save with the current player and dungeon state.
+        name: file name (without extension), "<save_type>-<player>(lv<level>)-<player_id>" by default.
+        """
+        try:
+            save_data = self._build_save_data(player, dungeon, save_type)
+            if name is None:
+                name = f"{save_type}-{player.name}(lv{player.level})-{player.player_id}"
+            elif name.endswith(SAVE_EXTENSIONS):
+                name = os.path.splitext(name)[0]
+            filename = name + SAVE_FORMATS[self.save_format]
+            self._write_save(filename, save_data)
             return filename
         except Exception as e:
             from engine.game_utility import handle_error
@@ -169,41 +609,137 @@ class SaveManager:
     def delete_save(self, save_id: str) -> bool:
         """Deletes a save by its ID."""
         filepath = os.path.join(self.save_dir, save_id)
+        self.flush()
         if os.path.exists(filepath):
             os.remove(filepath)
+            if os.path.exists(filepath + JOURNAL_SUFFIX):
+                os.remove(filepath + JOURNAL_SUFFIX)
+            self._journals.pop(save_id, None)
+            self._update_index(remove=(save_id,))
             return True
         return False
 
+    # --- Delta autosave ---
+
+    def _replay_journal(self, filepath: str, data: Dict[str, Any]):
+        """Applies the journal lines written after the snapshot (stops at a damaged line)."""
+        meta = data["meta"]
+        records = pending_records(filepath + JOURNAL_SUFFIX, meta.get("journal_id"), meta.get("journal_seq", 0))
+        draws: Dict[str, Any] = {"run": 0, "streams": {}}  # summed, applied once at the end
+        for record in records:
+            apply_delta(data["player_data"], record["ops"])
+            if "dungeon_state" in record:  # lines written before the draw counts
+                data["dungeon_state"] = record["dungeon_state"]
+                draws = {"run": 0, "streams": {}}
+            if "dungeon" in record:
+                data["dungeon_state"] = data.get("dungeon_state") or {}
+                apply_delta(data["dungeon_state"], record["dungeon"])
+            if "rng_state" in record:
+                data["dungeon_state"]["rng"] = record["rng_state"]
+                draws = {"run": 0, "streams": {}}
+            if "rng_draws" in record:
+                draws["run"] += record["rng_draws"]["run"]
+                for name, words in record["rng_draws"]["streams"].items():
+                    draws["streams"][name] = draws["streams"].get(name, 0) + words
+            meta.update(record["meta"])
+            meta["journal_seq"] = record["seq"]
+        if (draws["run"] or draws["streams"]) and (data.get("dungeon_state") or {}).get("rng"):
+            data["dungeon_state"]["rng"] = replay_draws(data["dungeon_state"]["rng"], draws)
+
+    def _compact_journal(self, filename: str, save_data: Dict[str, Any]):
+        """Writes a full snapshot and starts a new journal."""
+        state = self._journals.get(filename)
+        if state is None:
+            # New session: a new journal id, the lines of an older journal are never replayed
+            state = self._journals[filename] = {"id": uuid.uuid4().hex, "seq": 0, "records": 0, "tracker": None}
+
+        save_data["meta"]["journal_id"] = state["id"]
+        save_data["meta"]["journal_seq"] = state["seq"]
+        self._write_save(filename, save_data)
+
+        # The snapshot is written first: a crash here only leaves lines it ignores (seq <= journal_seq)
+        self._write_file(os.path.join(self.save_dir, filename + JOURNAL_SUFFIX), b"", "truncate")
+        state["records"] = 0
+        if state["tracker"] is None:
+            state["tracker"] = DeltaTracker(save_data["player_data"])
+        else:
+            state["tracker"].reset(save_data["player_data"])
+        # Rooms left: diffed like player_data. RNG: a copy at the last line, to count the draws since
+        snapshot = save_data["dungeon_state"]
+        state["dungeon"] = DeltaTracker({key: value for key, value in snapshot.items() if key != "rng"})
+        state["rng"] = self._rng_cursor(snapshot.get("rng"))
+
+    @staticmethod
+    def _rng_cursor(rng_state: Optional[Dict[str, Any]]):
+        from engine.rng import RunRNG
+        return RunRNG.from_dict(rng_state) if rng_state else None
+
+    def journal_autosave(self, player: 'Player', dungeon: Optional['Dungeon'] = None) -> str:
+        """
+        Autosave meant to run after every room: appends the changed keys to the
+        journal and only rewrites the full snapshot every compact_every calls.
+        """
+        filename = f"journal-{player.player_id}{SAVE_FORMATS[self.save_format]}"
+        state = self._journals.get(filename)
+
+        if state is None or state["records"] >= self.compact_every:
+            self._compact_journal(filename, self._build_save_data(player, dungeon, "auto"))
+            return filename
+
+        ops = state["tracker"].diff(player.to_dict())
+        state["seq"] += 1
+        state["records"] += 1
+        record = {"journal": state["id"], "seq": state["seq"], "meta": self._build_meta(player, "auto"), "ops": ops}
+
+        dungeon_ops = state["dungeon"].diff(dungeon_plans(player, dungeon) if dungeon is not None else {})
+        if dungeon_ops:
+            record["dungeon"] = dungeon_ops
+        if dungeon is not None:
+            # Draw counts, a few bytes, instead of the ~17 KB of packed generator states
+            draws = journal_draws(state["rng"], player.rng) if state["rng"] is not None else None
+            if draws is None:
+                record["rng_state"] = player.rng.to_dict()
+                state["rng"] = self._rng_cursor(record["rng_state"])
+            elif draws["run"] or draws["streams"]:
+                record["rng_draws"] = draws
+        self._write_file(os.path.join(self.save_dir, filename + JOURNAL_SUFFIX), encode_record(record), "append")
+        return filename
+
     def autosave(self, player: 'Player', dungeon: Optional['Dungeon'] = None):
         """Automatically saves the current state at regular intervals."""
         try:
-            # Rotate autosaves
-            autosave_files = [f for f in os.listdir(self.save_dir) if f.startswith('autosave_') and f.endswith('.json')]
+            # Rotate autosaves (once the previous autosave is on disk)
+            self.flush()
+            removed, renamed = [], []
+            autosave_files = [f for f in os.listdir(self.save_dir) if f.startswith('autosave_') and f.endswith(SAVE_EXTENSIONS)]
             autosave_files.sort(reverse=True)
 
             # Delete autosave_3 if exists
             for f in autosave_files:
                 if 'autosave_3' in f:
                     os.remove(os.path.join(self.save_dir, f))
+                    removed.append(f)
                     break
 
             # Rename autosave_2 to autosave_3
             for f in autosave_files:
                 if 'autosave_2' in f:
                     os.rename(os.path.join(self.save_dir, f), os.path.join(self.save_dir, f.replace('autosave_2', 'autosave_3')))
+                    renamed.append((f, f.replace('autosave_2', 'autosave_3')))
                     break
 
             # Rename autosave_1 to autosave_2
             for f in autosave_files:
                 if 'autosave_1' in f:
                     os.rename(os.path.join(self.save_dir, f), os.path.join(self.save_dir, f.replace('autosave_1', 'autosave_2')))
+                    renamed.append((f, f.replace('autosave_1', 'autosave_2')))
                     break
 
-            # Create new autosave_1
-            filename = self.create_save(player, dungeon, "auto")
-            new_path = os.path.join(self.save_dir, filename)
-            autosave_1_path = os.path.join(self.save_dir, filename.replace('auto-', 'autosave_1-'))
-            os.rename(new_path, autosave_1_path)
+            self._update_index(remove=removed, rename=renamed)
+
+            # Create new autosave_1, written in place so it can go through the background writer
+            filename = f"autosave_1-{player.name}(lv{player.level})-{player.player_id}{SAVE_FORMATS[self.save_format]}"
+            self._write_save(filename, self._build_save_data(player, dungeon, "auto"))
         except Exception as e:
             from engine.game_utility import handle_error
             handle_error()
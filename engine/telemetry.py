@@ -0,0 +1,277 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.entity import Player
+
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+
+"""
+Columnar telemetry of the rooms and fights.
+
+record() appends one row to typed in-memory columns (array.array), no
+string formatting, no I/O. Every CHUNK_ROWS rows (and on flush()) the
+columns are written as one chunk file by the background save writer:
+
+    analytics_saves/telemetry/<session>_<seq>.dhcol
+
+    header   struct "<4sBII": magic b"DHTC", version, rows, meta length
+    meta     JSON: session, byteorder, strings table, [name, typecode, nbytes] of each column
+    columns  raw bytes of each column, in the meta order
+
+Columns (one row = one event):
+    ts          d   time.time()
+    kind        B   ROOM_ENTERED, FIGHT_START, FIGHT_END, DAMAGE_DEALT, DAMAGE_TAKEN, DROP, DEATH
+    player      H   index in the strings table (player_id)
+    difficulty  H   index in the strings table (difficulty name)
+    level       H   dungeon level
+    room        H   room number in the level (same numbering as deaths_per_room)
+    value       f   damage, hp left or gold depending on the kind
+    target      H   index in the strings table (room type, enemy, item, fight result)
+    flag        b   critical hit, boss fight...
+
+The analysis side (load_columns() and the queries below) maps the columns
+to numpy arrays, so deathsByRoomPerDifficulty or the survival per room are
+a few vectorized operations over all the sessions. numpy is only imported
+by these functions, never by the game.
+"""
+
+import atexit
+import json
+import os
+import struct
+import sys
+import time
+import uuid
+from array import array
+
+from engine.logger import logger
+
+
+TELEMETRY_DIR = os.path.join("analytics_saves", "telemetry")
+CHUNK_SUFFIX = ".dhcol"
+CHUNK_ROWS = 4096
+
+CHUNK_MAGIC = b"DHTC"
+CHUNK_VERSION = 1
+CHUNK_HEADER = struct.Struct("<4sBII")
+
+ROOM_ENTERED = 1
+FIGHT_START = 2
+FIGHT_END = 3
+DAMAGE_DEALT = 4
+DAMAGE_TAKEN = 5
+DROP = 6
+DEATH = 7
+
+COLUMNS = (("ts", "d"), ("kind", "B"), ("player", "H"), ("difficulty", "H"), ("level", "H"),
+           ("room", "H"), ("value", "f"), ("target", "H"), ("flag", "b"))
+STRING_COLUMNS = ("player", "difficulty", "target")
+
+
+class TelemetryBuffer:
+    """In-memory columns of the current chunk, written out every chunk_rows rows."""
+
+    def __init__(self, directory: str = TELEMETRY_DIR, chunk_rows: int = CHUNK_ROWS):
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.session = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self._reset()
+
+    def _reset(self):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS}
+        self.strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self.rows = 0
+
+    def _intern(self, value) -> int:
+        value = "" if value is None else str(value)
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def record(self, kind: int, player: Player, value: float = 0.0, target=None, flag: int = 0, room: int | None = None):
+        difficulty = getattr(player.difficulty, "name", player.difficulty)
+        columns = self.columns
+        columns["ts"].append(time.time())
+        columns["kind"].append(kind)
+        columns["player"].append(self._intern(getattr(player, "player_id", None)))
+        columns["difficulty"].append(self._intern(difficulty))
+        columns["level"].append(min(player.dungeon_level, 0xFFFF))
+        columns["room"].append(min(player.current_room_number if room is None else room, 0xFFFF))
+        columns["value"].append(value or 0.0)
+        columns["target"].append(self._intern(target))
+        columns["flag"].append(flag)
+        self.rows += 1
+        if self.rows >= self.chunk_rows:
+            self.flush()
+
+    def encode_chunk(self) -> bytes:
+        meta = {"session": self.session, "byteorder": sys.byteorder, "strings": self.strings,
+                "columns": [[name, typecode, len(self.columns[name]) * self.columns[name].itemsize]
+                            for name, typecode in COLUMNS]}
+        meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+        parts = [CHUNK_HEADER.pack(CHUNK_MAGIC, CHUNK_VERSION, self.rows, len(meta_bytes)), meta_bytes]
+        parts.extend(self.columns[name].tobytes() for name, _ in COLUMNS)
+        return b"".join(parts)
+
+    def flush(self, wait: float | None = 0):
+        """
+        Hands the current chunk (if any) to the background writer, then waits up to wait
+        seconds (None: no limit) for every chunk submitted so far to be on disk.
+        """
+        from engine.save_system import get_save_writer
+
+        if self.rows:
+            data = self.encode_chunk()
+            path = os.path.join(self.directory, f"{self.session}_{self.seq:05d}{CHUNK_SUFFIX}")
+            self.seq += 1
+            self._reset()
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                get_save_writer().submit(path, data)
+            except Exception as e:
+                logger.warning("Telemetry chunk %s dropped: %s", path, e)
+
+        # Also when this chunk was empty: the earlier chunks may still be queued
+        if wait != 0 and self.seq:
+            if not get_save_writer().flush(wait):
+                logger.warning("Telemetry chunks still pending after %ss", wait)
+
+
+_buffer: TelemetryBuffer | None = None
+
+
+def get_buffer() -> TelemetryBuffer:
+    """Shared buffer, flushed at exit."""
+    global _buffer
+    if _buffer is None:
+        _buffer = TelemetryBuffer()
+        atexit.register(_buffer.flush, 5)
+    return _buffer
+
+
+def record(kind: int, player: Player, value: float = 0.0, target=None, flag: int = 0, room: int | None = None):
+    """Appends one event row (never raises)."""
+    try:
+        get_buffer().record(kind, player, value, target, flag, room)
+    except Exception as e:
+        logger.warning(f"Telemetry event {kind} dropped: {e}")
+
+
+def flush(wait: float | None = 0):
+    if _buffer is not None:
+        _buffer.flush(wait)
+
+
+# --- Analysis side ---
+
+def read_chunk(filepath: str) -> tuple[dict, dict[str, array]]:
+    """(meta, {column: array}) of a chunk file."""
+    with open(filepath, "rb") as f:
+        data = f.read()
+    magic, version, rows, meta_length = CHUNK_HEADER.unpack_from(data)
+    if magic != CHUNK_MAGIC or version > CHUNK_VERSION:
+        raise ValueError(f"{filepath} is not a telemetry chunk")
+    offset = CHUNK_HEADER.size
+    meta = json.loads(data[offset:offset + meta_length])
+    offset += meta_length
+
+    columns = {}
+    for name, typecode, nbytes in meta["columns"]:
+        column = array(typecode)
+        column.frombytes(data[offset:offset + nbytes])
+        if meta["byteorder"] != sys.byteorder:
+            column.byteswap()
+        columns[name] = column
+        offset += nbytes
+    if any(len(column) != rows for column in columns.values()):
+        raise ValueError(f"{filepath} is truncated")
+    return meta, columns
+
+
+def iter_chunks(directory: str = TELEMETRY_DIR):
+    """(meta, columns) of every readable chunk, in file name order. Damaged chunks are skipped."""
+    if not os.path.isdir(directory):
+        return
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(CHUNK_SUFFIX):
+            continue
+        try:
+            yield read_chunk(os.path.join(directory, name))
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Telemetry chunk {name} skipped: {e}")
+
+
+def load_columns(directory: str = TELEMETRY_DIR):
+    """
+    All the chunks as ({column: numpy array}, strings). The string columns of
+    every chunk are remapped to indexes in the shared strings list.
+    """
+    import numpy as np
+
+    strings: list[str] = []
+    string_ids: dict[str, int] = {}
+    parts: dict[str, list] = {name: [] for name, _ in COLUMNS}
+    for meta, columns in iter_chunks(directory):
+        remap = []
+        for value in meta["strings"]:
+            if value not in string_ids:
+                string_ids[value] = len(strings)
+                strings.append(value)
+            remap.append(string_ids[value])
+        remap = np.array(remap or [0], dtype=np.uint32)
+        for name, typecode in COLUMNS:
+            values = np.frombuffer(columns[name], dtype=np.dtype(typecode)) if name in columns else np.zeros(0, dtype=typecode)
+            parts[name].append(remap[values] if name in STRING_COLUMNS else values)
+
+    table = {name: np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint32 if name in STRING_COLUMNS else typecode)
+             for (name, typecode), chunks in zip(COLUMNS, parts.values())}
+    return table, strings
+
+
+def _count_by_room(table: dict, strings: list[str], mask) -> dict[str, dict[int, int]]:
+    import numpy as np
+
+    pairs, counts = np.unique(np.stack([table["difficulty"][mask], table["room"][mask]]), axis=1, return_counts=True)
+    result: dict[str, dict[int, int]] = {}
+    for (difficulty, room), count in zip(pairs.T.tolist(), counts.tolist()):
+        result.setdefault(strings[difficulty], {})[room] = count
+    return result
+
+
+def deaths_by_room_per_difficulty(table: dict, strings: list[str]) -> dict[str, dict[int, int]]:
+    """{difficulty: {room: deaths}}, the deathsByRoomPerDifficulty of the analytics."""
+    return _count_by_room(table, strings, table["kind"] == DEATH)
+
+
+def survival_by_room_per_difficulty(table: dict, strings: list[str]) -> dict[str, dict[int, float]]:
+    """{difficulty: {room: % of the room entries survived}}."""
+    entries = _count_by_room(table, strings, table["kind"] == ROOM_ENTERED)
+    deaths = deaths_by_room_per_difficulty(table, strings)
+    return {difficulty: {room: round(100 * (1 - deaths.get(difficulty, {}).get(room, 0) / count), 2)
+                         for room, count in sorted(rooms.items())}
+            for difficulty, rooms in entries.items()}
+
+
+def survival_rate(table: dict) -> float:
+    """% of the fights that did not end with the player's death."""
+    fights = int((table["kind"] == FIGHT_END).sum())
+    deaths = int((table["kind"] == DEATH).sum())
+    return round(100 * (1 - deaths / fights), 2) if fights else 100.0
+
+
+if __name__ == "__main__":
+    table, strings = load_columns()
+    print(f"{len(table['kind'])} events")
+    print("Deaths by room:", json.dumps(deaths_by_room_per_difficulty(table, strings)))
+    print("Survival by room:", json.dumps(survival_by_room_per_difficulty(table, strings)))
+    print(f"Fight survival rate: {survival_rate(table)}%")
@@ -0,0 +1,425 @@
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+"""
+Builds analytics/global_stats.json from the analytics records.
+
+Records are the player summaries of engine.analytics.player_summary():
+    - events.jsonl files, "player" events with reason "session_end"
+    - analytics_user_<id>.json files (one record per file)
+
+The analytics_user files are built from the events (python -m engine.analytics),
+so a directory is read from one source only: its events when it has some, else
+its analytics_user files.
+
+A summary holds the lifetime counters of the player, not the ones of the
+session: only the latest summary of each player (player_id, else user_id) is
+folded, and gamesPlayed counts the sessions. The players are split into shards
+by a hash of their key, so all the records of a player land in the same shard:
+each shard task streams the files, keeps the latest summary of its own players,
+folds them into a StatsAggregate (running sums and counters, bounded histograms
+and a fixed-size reservoir sample for the raw series) and returns it; the parent
+merges the aggregates. A task holds the players of its shard, not the sessions:
+memory grows with players / shards. Every task scans every file, but only the
+session_end lines of its players are decoded.
+
+Usage:
+    python generate_global_stats.py analytics_saves/
+    python generate_global_stats.py /data/sessions --workers 16 --out analytics/global_stats.json
+"""
+
+from sys import path as sys_path
+from os.path import abspath, dirname
+
+project_root = abspath(dirname(__file__))
+if project_root not in sys_path:
+    sys_path.insert(0, project_root)
+
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import random
+import time
+import zlib
+
+from interface.colors import Colors
+
+
+RESERVOIR_SIZE = 1000      # sessions kept for the raw* lists
+HISTOGRAM_ROOMS = 16       # deathsByRoomPerDifficulty always has rooms 1..16, more if needed
+
+# difficulty name -> label of difficultyDistribution / of deathsByRoomPerDifficulty
+DIFFICULTY_LABELS = {"normal": "Normal", "realistic": "Realistic", "soul_enjoyer": "Souls Enjoyer",
+                     "puzzle": "Puzzle", "hardcore": "Hardcore"}
+DEATHS_LABELS = {"normal": "Normal", "realistic": "Realistic", "soul_enjoyer": "SoulsEnjoyer",
+                 "puzzle": "Puzzle", "hardcore": "Hardcore"}
+
+SESSION_BUCKETS = (("0-15min", 15 * 60), ("15-30min", 30 * 60), ("30-60min", 60 * 60),
+                   ("1-2hrs", 2 * 3600), ("2-4hrs", 4 * 3600), ("4+hrs", None))
+
+# Sums of the record blocks: (block, key) -> output
+SUMMED = {
+    ("overview", "totalPlayers"): ("overview", "totalPlayers"),
+    ("combat", "totalDamageDealt"): ("combat", "totalDamageDealt"),
+    ("combat", "totalDamageTaken"): ("combat", "totalDamageTaken"),
+    ("combat", "enemiesDefeated"): ("combat", "enemiesDefeated"),
+    ("combat", "critical_count"): ("combat", "critical_count"),
+    ("combat", "attack_count"): ("combat", "attack_count"),
+    ("exploration", "roomsExplored"): ("exploration", "roomsExplored"),
+    ("exploration", "treasuresFound"): ("exploration", "treasuresFound"),
+    ("exploration", "puzzlesSolved"): ("exploration", "puzzlesSolved"),
+    ("exploration", "trapsTriggered"): ("exploration", "trapsTriggered"),
+    ("economy", "totalGoldSpent"): ("economy", "totalGoldSpent"),
+    ("economy", "itemsPurchased"): ("economy", "itemsPurchased"),
+    ("progression", "achievementsEarned"): ("progression", "achievementsEarned"),
+}
+# Averages over the sessions (sum / sessions)
+AVERAGED = {
+    ("overview", "avgRoomsExplored"),
+    ("overview", "survivalRate"),
+    ("economy", "shopUtilization"),
+    ("progression", "avgLevel"),
+}
+# Nested {name: number} counters summed across sessions (record key -> output key)
+COUNTERS = {
+    "mostDeadlyEnemies": "mostDeadlyEnemies",
+    "combatSuccessByLevel": "combatSuccessByLevel",
+    "skillsUsageFrequency": "skillsUsageFrequency",
+    "roomTypePreferences": "roomTypePreferences",
+    "explorationDepthByDifficulty": "explorationDepthByDifficulty",
+    "bossEncounterOutcomes": "bossEncounterOutcomes",
+    "purchased_items": "mostPopularItems",
+    "equipmentUsageByType": "equipmentUsageByType",
+    "shopVisitFrequency": "shopVisitFrequency",
+    "levelDistribution": "levelDistribution",
+    "classSpecializationChoices": "classSpecializationChoices",
+}
+# Per-session values kept in the reservoir, written as raw<Name> lists
+RAW_FIELDS = ("skillsUsageFrequency", "roomTypePreferences", "explorationDepthByDifficulty",
+              "puzzleSuccessRateOverTime", "bossEncounterOutcomes", "purchased_items", "goldSpendingPatterns",
+              "equipmentUsageByType", "shopVisitFrequency", "levelDistribution", "classSpecializationChoices",
+              "xpGainOverTime", "achievementCompletionRates")
+RAW_NAMES = {"purchased_items": "MostPopularItems"}
+SERIES_FIELDS = ("puzzleSuccessRateOverTime", "goldSpendingPatterns", "xpGainOverTime")
+
+
+def _number(value) -> float:
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def _add_counts(target: dict, source):
+    """target += source for nested {key: number} dicts (other values are ignored)."""
+    if not isinstance(source, dict):
+        return
+    for key, value in source.items():
+        key = str(key)
+        if isinstance(value, dict):
+            _add_counts(target.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            target[key] = target.get(key, 0) + value
+
+
+class StatsAggregate:
+    """Mergeable partial aggregate of session records."""
+
+    def __init__(self, seed=None):
+        self.sessions = 0          # records folded (one per player)
+        self.games = 0             # sessions those records stand for
+        self.sums: dict[tuple, float] = {}
+        self.averaged: dict[tuple, float] = {}
+        self.counters: dict[str, dict] = {name: {} for name in COUNTERS.values()}
+        self.deaths: dict[str, dict] = {}
+        self.difficulties: dict[str, int] = {}
+        self.weekdays = [0] * 7
+        self.session_lengths = {name: 0 for name, _ in SESSION_BUCKETS}
+        self.ng_plus_sessions = 0
+        self.tutorial_sum = 0.0
+        self.reservoir: list[dict] = []
+        self._rng = random.Random(seed)
+
+    def add(self, record: dict, sessions: int = 1):
+        """Folds the latest summary of a player, who played sessions sessions."""
+        self.sessions += 1
+        self.games += sessions
+        for (block, key), out in SUMMED.items():
+            self.sums[out] = self.sums.get(out, 0) + _number(record.get(block, {}).get(key))
+        for block, key in AVERAGED:
+            self.averaged[(block, key)] = self.averaged.get((block, key), 0) + _number(record.get(block, {}).get(key))
+        for key, out in COUNTERS.items():
+            _add_counts(self.counters[out], record.get(key))
+
+        progression = record.get("progression", {})
+        self.tutorial_sum += _number(progression.get("tutorialCompletion"))
+        self.ng_plus_sessions += 1 if _number(progression.get("ngPlusPlayers")) > 0 else 0
+
+        for difficulty, rooms in (record.get("deathsByRoomPerDifficulty") or {}).items():
+            _add_counts(self.deaths.setdefault(DEATHS_LABELS.get(difficulty, difficulty), {}), rooms)
+
+        difficulty = record.get("difficulty")
+        if difficulty:
+            label = DIFFICULTY_LABELS.get(difficulty, difficulty)
+            self.difficulties[label] = self.difficulties.get(label, 0) + 1
+
+        try:
+            self.weekdays[datetime.datetime.fromisoformat(record["timestamp"]).weekday()] += 1
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        playtime = record.get("playtimeSeconds")
+        if isinstance(playtime, (int, float)):
+            for name, limit in SESSION_BUCKETS:
+                if limit is None or playtime < limit:
+                    self.session_lengths[name] += 1
+                    break
+
+        # Reservoir sampling (algorithm R) of the raw per-session values
+        sample = {field: record.get(field) for field in RAW_FIELDS}
+        sample["damage"] = {"x": _number(record.get("damageDealt")), "y": _number(record.get("damageTaken"))}
+        if len(self.reservoir) < RESERVOIR_SIZE:
+            self.reservoir.append(sample)
+        else:
+            slot = self._rng.randrange(self.sessions)
+            if slot < RESERVOIR_SIZE:
+                self.reservoir[slot] = sample
+
+    def merge(self, other: "StatsAggregate"):
+        """Folds another partial aggregate into this one."""
+        for key, value in other.sums.items():
+            self.sums[key] = self.sums.get(key, 0) + value
+        for key, value in other.averaged.items():
+            self.averaged[key] = self.averaged.get(key, 0) + value
+        for name, counts in other.counters.items():
+            _add_counts(self.counters.setdefault(name, {}), counts)
+        for label, rooms in other.deaths.items():
+            _add_counts(self.deaths.setdefault(label, {}), rooms)
+        _add_counts(self.difficulties, other.difficulties)
+        self.weekdays = [a + b for a, b in zip(self.weekdays, other.weekdays)]
+        _add_counts(self.session_lengths, other.session_lengths)
+        self.ng_plus_sessions += other.ng_plus_sessions
+        self.tutorial_sum += other.tutorial_sum
+        self.games += other.games
+
+        # Each merged slot comes from one side with a probability proportional to the sessions it stands for
+        mine, theirs = list(self.reservoir), list(other.reservoir)
+        weight_mine, weight_theirs = self.sessions, other.sessions
+        merged = []
+        while len(merged) < RESERVOIR_SIZE and (mine or theirs):
+            take_mine = bool(mine) and (not theirs or self._rng.random() < weight_mine / (weight_mine + weight_theirs))
+            source = mine if take_mine else theirs
+            merged.append(source.pop(self._rng.randrange(len(source))))
+        self.reservoir = merged
+        self.sessions += other.sessions
+
+    def to_json(self) -> dict:
+        """Same shape as analytics/global_stats.json (plus the "charts" block read by analytics.html)."""
+        n = self.sessions or 1
+        sums, avg = self.sums, self.averaged
+        players = sums.get(("overview", "totalPlayers"), 0) or self.sessions
+
+        deaths = {}
+        for label in ("Normal", "Realistic", "SoulsEnjoyer", *sorted(set(self.deaths) - {"Normal", "Realistic", "SoulsEnjoyer"})):
+            rooms = self.deaths.get(label, {})
+            last = max([HISTOGRAM_ROOMS] + [int(r) for r in rooms if str(r).isdigit()])
+            deaths[label] = {str(room): rooms.get(str(room), 0) for room in range(1, last + 1)}
+
+        difficulty_distribution = {label: self.difficulties.get(label, 0) for label in ("Normal", "Realistic", "Souls Enjoyer", "Puzzle")}
+        difficulty_distribution.update({label: count for label, count in self.difficulties.items() if label not in difficulty_distribution})
+
+        series = {field: [value for sample in self.reservoir for value in (sample.get(field) or [])][:RESERVOIR_SIZE]
+                  for field in SERIES_FIELDS}
+        damage_points = [sample["damage"] for sample in self.reservoir]
+        attacks = sums.get(("combat", "attack_count"), 0)
+
+        stats = {
+            "overview": {
+                "totalPlayers": players,
+                "gamesPlayed": self.games,
+                "avgRoomsExplored": round(avg.get(("overview", "avgRoomsExplored"), 0) / n, 2),
+                "survivalRate": round(avg.get(("overview", "survivalRate"), 0) / n, 2),
+            },
+            "combat": {
+                "totalDamageDealt": sums.get(("combat", "totalDamageDealt"), 0),
+                "totalDamageTaken": sums.get(("combat", "totalDamageTaken"), 0),
+                "enemiesDefeated": sums.get(("combat", "enemiesDefeated"), 0),
+                "criticalHitRate": round(100 * sums.get(("combat", "critical_count"), 0) / attacks, 2) if attacks else 0.0,
+            },
+            "exploration": {key: sums.get(("exploration", key), 0)
+                            for key in ("roomsExplored", "treasuresFound", "puzzlesSolved", "trapsTriggered")},
+            "economy": {
+                "totalGoldSpent": sums.get(("economy", "totalGoldSpent"), 0),
+                "itemsPurchased": sums.get(("economy", "itemsPurchased"), 0),
+                "avgGoldPerPlayer": round(sums.get(("economy", "totalGoldSpent"), 0) / (players or 1), 2),
+                "shopUtilization": round(avg.get(("economy", "shopUtilization"), 0) / n, 2),
+            },
+            "progression": {
+                "avgLevel": round(avg.get(("progression", "avgLevel"), 0) / n, 2),
+                "tutorialCompletion": round(100 * self.tutorial_sum / n, 2),
+                "ngPlusPlayers": round(100 * self.ng_plus_sessions / n, 2),
+                "achievementsEarned": sums.get(("progression", "achievementsEarned"), 0),
+            },
+            "deathsByRoomPerDifficulty": deaths,
+            "difficultyDistribution": difficulty_distribution,
+            "dailyPlayers": list(self.weekdays),
+            "sessionLengthDistribution": dict(self.session_lengths),
+            "damageDealtVsTaken": damage_points,
+            **{name: counts for name, counts in self.counters.items()},
+            **series,
+            "achievementCompletionRates": {},
+            "rawDamageDealtVsTaken": damage_points,
+        }
+        for field in RAW_FIELDS:
+            name = RAW_NAMES.get(field, field[0].upper() + field[1:])
+            stats[f"raw{name}"] = [sample.get(field) for sample in self.reservoir]
+
+        stats["charts"] = {
+            "difficultyDistribution": list(difficulty_distribution.values()),
+            "dailyPlayers": list(self.weekdays),
+            "deathsByRoom": [sum(deaths[label][str(room)] for label in deaths if str(room) in deaths[label])
+                             for room in range(1, max(len(rooms) for rooms in deaths.values()) + 1)],
+        }
+        return stats
+
+
+def _is_events_file(name: str) -> bool:
+    return name.startswith("events.jsonl")
+
+
+def _is_user_file(name: str) -> bool:
+    return name.startswith("analytics_user_") and name.endswith(".json")
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """Shard of a player key, stable across processes and runs (unlike hash())."""
+    return zlib.crc32(key.encode("utf-8")) % shard_count
+
+
+def iter_records(filepath: str, shard: int = 0, shard_count: int = 1):
+    """
+    (player key, timestamp, summary) of one file, streamed: the session_end events of a
+    .jsonl (key "player:<player_id>", else "user:<user_id>"), the summary of an
+    analytics_user_<user_id>.json (key "user:<user_id>"). Records without id get a key of their own.
+    Only the records of the players of shard are yielded.
+    """
+    name = os.path.basename(filepath)
+    if _is_events_file(name) or filepath.endswith(".jsonl"):
+        with open(filepath, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f):
+                if "session_end" not in line:  # skips the decoding of the other events
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                data = event.get("data") or {}
+                if event.get("type") == "player" and data.get("reason") == "session_end" and isinstance(data.get("summary"), dict):
+                    summary = data["summary"]
+                    if event.get("player_id"):
+                        key = f"player:{event['player_id']}"
+                    elif event.get("user_id"):
+                        key = f"user:{event['user_id']}"
+                    else:
+                        key = f"{filepath}:{line_number}"
+                    if shard_of(key, shard_count) == shard:
+                        yield key, str(summary.get("timestamp") or event.get("ts") or ""), summary
+        return
+
+    key = f"user:{name[len('analytics_user_'):-len('.json')]}" if _is_user_file(name) else filepath
+    if shard_of(key, shard_count) != shard:
+        return
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return
+    if isinstance(record, dict) and "overview" in record:
+        yield key, str(record.get("timestamp") or ""), record
+
+
+def find_inputs(paths: list[str]) -> list[str]:
+    """Input files of the paths: per directory its events files, or its analytics_user files if it has no events."""
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for root, _, names in os.walk(path):
+            events = [name for name in names if _is_events_file(name)]
+            files.extend(os.path.join(root, name) for name in events or [name for name in names if _is_user_file(name)])
+    return sorted(files)
+
+
+def aggregate_shard(task: tuple) -> StatsAggregate:
+    """
+    Aggregate of the players of one shard, task = (files, shard, shard_count, seed):
+    keeps {player key: [timestamp, latest summary, sessions]} for the shard, then folds it.
+    """
+    files, shard, shard_count, seed = task
+    latest: dict = {}
+    for filepath in files:
+        for key, timestamp, record in iter_records(filepath, shard, shard_count):
+            current = latest.get(key)
+            if current is None:
+                latest[key] = [timestamp, record, 1]
+                continue
+            if timestamp >= current[0]:
+                current[0], current[1] = timestamp, record
+            current[2] += 1
+
+    aggregate = StatsAggregate(seed)
+    for key in sorted(latest):  # same order whatever the files order: same reservoir for a seed
+        _, record, sessions = latest.pop(key)
+        aggregate.add(record, sessions)
+    aggregate._rng = None  # sampling of the shard is done: merge() draws with the parent's generator
+    return aggregate
+
+
+def aggregate_files(files: list[str], workers: int = 1, seed: int = 0, shards: int | None = None) -> StatsAggregate:
+    """
+    Splits the players into shards (default: one per worker), aggregates each shard
+    over workers processes and merges the aggregates in shard order. The result for
+    a seed depends on the shard count, not on the worker count.
+    """
+    shard_count = max(1, shards or workers)
+    tasks = [(files, shard, shard_count, seed + shard) for shard in range(shard_count)]
+
+    total = StatsAggregate(seed)
+    if workers <= 1 or shard_count == 1:
+        partials = map(aggregate_shard, tasks)
+        for partial in partials:
+            total.merge(partial)
+    else:
+        with multiprocessing.Pool(min(workers, shard_count)) as pool:
+            for partial in pool.imap(aggregate_shard, tasks):
+                total.merge(partial)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dungeon Hunter global stats aggregator")
+    parser.add_argument("inputs", nargs="*", default=["analytics_saves"], help="session files or directories")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, default=None, help="player shards (default: one per worker)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the reservoir sampling")
+    parser.add_argument("--out", default="analytics/global_stats.json")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    files = find_inputs(args.inputs)
+    aggregate = aggregate_files(files, args.workers, args.seed, args.shards)
+    stats = aggregate.to_json()
+
+    os.makedirs(dirname(abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+
+    elapsed = time.perf_counter() - start
+    print(f"{Colors.GREEN}{aggregate.sessions} players ({aggregate.games} sessions) from {len(files)} files in {elapsed:.1f}s -> {args.out}{Colors.RESET}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,14 @@ __creation__ = "09-03-2025"
 # Dungeon Hunter - (c) DragonDeFer 2025
 # Licensed under CC BY-NC 4.0
 
+import logging
 import random
+from types import MappingProxyType
 
 from interface.colors import Colors
 from engine.game_utility import clear_screen
 from engine.logger import logger
+from engine.rng import rng_for, LOOT
 from core.spells import Spell
 from items.resources import Resource, generate_random_resource
 
@@ -203,7 +206,7 @@ class Equipment:
 
         # Équipe le nouvel objet
         self.slots[slot] = item
-        logger.info(f"Equipping {item.name} in {slot}")
+        logger.info("Equipping %s in %s", item.name, slot)
         print(f"\n{Colors.GREEN}Equipping{Colors.RESET} {item.name} {Colors.GREEN}in {slot}.{Colors.RESET}")
         if debug >= 1:
             print(f"DEBUG: Item info:\n{item}")
@@ -219,7 +222,7 @@ class Equipment:
             removed_item = self.slots[slot]
             if removed_item:  # Check if there was an item to remove
                 self.slots[slot] = None
-                logger.info(f"Unequipped {removed_item.name} from {slot}")
+                logger.info("Unequipped %s from %s", removed_item.name, slot)
                 print(f"{Colors.YELLOW}Unequipped {removed_item.name} from {slot}.{Colors.RESET}")
                 player.stats.update_total_stats()
                 return removed_item
@@ -261,7 +264,8 @@ class Weapon(Gear):
         # attacks is now a list of WeaponAttack instances
         self.attacks: list[WeaponAttack] = attacks or []  # List[WeaponAttack]
         self.upgrade_level: int = upgrade_level
-        logger.debug(f"Weapon created: {self.name} with damage {self.damage} and special attacks {[str(a) for a in self.attacks]} at upgrade level {self.upgrade_level}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Weapon created: %s with damage %s and special attacks %s at upgrade level %s", self.name, self.damage, [str(a) for a in self.attacks], self.upgrade_level)
     
     def __str__(self):
         attacks_str = ", ".join([attack.name for attack in self.attacks]) if self.attacks else "None"
@@ -362,7 +366,7 @@ class Armor(Gear):
         super().__init__(name, description, value, {"defense": defense})
         self.defense = defense
         self.armor_type = armor_type  # "helmet", "chestplate", "leggings", etc.
-        logger.debug(f"Armor created: {self.name} with defense {defense}")
+        logger.debug("Armor created: %s with defense %s", self.name, defense)
 
     def to_dict(self):
         data = super().to_dict()
@@ -376,7 +380,7 @@ class Shield(Gear):
     def __init__(self, name, description, value, defense, block_chance):
         super().__init__(name, description, value, {"defense": defense})
         self.block_chance = block_chance  # Chance de bloquer une attaque (ex: 20%)
-        logger.debug(f"Shield created: {self.name} with block chance {block_chance}")
+        logger.debug("Shield created: %s with block chance %s", self.name, block_chance)
 
     def to_dict(self):
         data = super().to_dict()
@@ -389,7 +393,7 @@ class Gauntlets(Gear):
     """Represents an equippable gauntlet that increases strength and defense."""
     def __init__(self, name, description, value, defense, strength_boost, effect=None):
         super().__init__(name, description, value, {"defense": defense, "strength": strength_boost})
-        logger.debug(f"Gauntlets created: {self.name} with defense {defense} and strength boost {strength_boost}")
+        logger.debug("Gauntlets created: %s with defense %s and strength boost %s", self.name, defense, strength_boost)
         self.defense = defense
         self.strength_boost = strength_boost
         self.effects = effect if effect else {}
@@ -398,7 +402,7 @@ class Gauntlets(Gear):
     def apply_effect(self, player):
         """Applique les effets des gants au joueur."""
         for stat, bonus in self.effects.items():
-            player.stats.__dict__[stat] += bonus
+            player.stats.modify_stat(stat, bonus, "equipment")
     
     def __str__(self):
         return f"{self.name} - {self.description} (Defense: +{self.defense}, Effects: {self.effects}, Value: {self.value} gold)"
@@ -412,21 +416,21 @@ class Amulet(Gear):
     """Represents an equippable amulet with magical bonuses."""
     def __init__(self, name, description, value, effects):
         super().__init__(name, description, value, effects)
-        logger.debug(f"Amulet created: {self.name} with effects {effects}")
+        logger.debug("Amulet created: %s with effects %s", self.name, effects)
 
 #̶̼͝ B̵̕͜ë̵͕́ẅ̷̙́ä̷̪́r̷͍̈́ë̵͕́:̴̨͝ R̷̞͝i̴̊͜n̸̻̈́g̸̻̿s̸̱̅ m̴̛̠ä̷̪́ÿ̸̡́ c̴̱͝ä̷̪́r̷͍̈́r̷͍̈́ÿ̸̡́ c̴̱͝ŭ̵͇r̷͍̈́s̸̱̅ë̵͕́s̸̱̅ ẗ̴̗́h̵̤͒ä̷̪́ẗ̴̗́ ẗ̴̗́ẅ̷̙́i̴̊͜s̸̱̅ẗ̴̗́ f̷̠͑ä̷̪́ẗ̴̗́ë̵͕́.̵͇̆
 class Ring(Gear):
     """Represents an equippable ring that grants magical or stat bonuses."""
     def __init__(self, name, description, value, effects):
         super().__init__(name, description, value, effects)
-        logger.debug(f"Ring created: {self.name} with effects {effects}")
+        logger.debug("Ring created: %s with effects %s", self.name, effects)
 
 #̶̼͝ B̵̕͜ë̵͕́ẅ̷̙́ä̷̪́r̷͍̈́ë̵͕́:̴̨͝ B̵̕͜ë̵͕́l̷̫̈́ẗ̴̗́s̸̱̅ m̴̛̠ä̷̪́ÿ̸̡́ ẗ̴̗́i̴̊͜g̸̻̿h̵̤͒ẗ̴̗́ë̵͕́n̸̻̈́ ẅ̷̙́i̴̊͜ẗ̴̗́h̵̤͒ ä̷̪́ ẅ̷̙́i̴̊͜l̷̫̈́l̷̫̈́ o̶͙͝f̷̠͑ ẗ̴̗́h̵̤͒ë̵͕́i̴̊͜r̷͍̈́ o̶͙͝ẅ̷̙́n̸̻̈́.̵͇̆
 class Belt(Gear):
     """Represents an equippable belt that boosts stamina or defense."""
     def __init__(self, name, description, value, effects):
         super().__init__(name, description, value, effects)
-        logger.debug(f"Belt created: {self.name} with effects {effects}")
+        logger.debug("Belt created: %s with effects %s", self.name, effects)
 
 
 
@@ -480,7 +484,7 @@ class Potion(Item):
                 else:
                     # Fallback healing logic if effect class not found
                     player.heal(self.effect_value)
-                logger.info(f"Player used a healing potion: {self.name}")
+                logger.info("Player used a healing potion: %s", self.name)
                 print(f"{Colors.GREEN}You drink the {self.name} and recover {self.effect_value} HP!{Colors.RESET}")
             else:
                 # For other effects, create with duration = effect_value
@@ -489,7 +493,7 @@ class Potion(Item):
                     effect.apply(player)
                 else:
                     print(f"{Colors.RED}Effect type {effect_class_name} not found in EFFECT_MAP!{Colors.RESET}")
-                logger.info(f"Player used a {self.effect_type} potion: {self.name}")
+                logger.info("Player used a %s potion: %s", self.effect_type, self.name)
                 print(f"{Colors.CYAN}You drink the {self.name} and gain {self.effect_type.replace('_', ' ')} for {self.effect_value} turns!{Colors.RESET}")
 
         # Remove from inventory after use
@@ -665,42 +669,20 @@ def get_available_rarities(player, difficulty, level, rarity=None):
     
     return available_rarities
 
-def calculate_rarity(available_rarities, rarity_boost, rarity=None):
-    """Calculate item rarity based on available rarities and boost factor."""
-    if rarity:
-        return rarity
-        
-    # Adjust rarity weights based on rarity_boost
-    rarity_weights = {
-        "common": 0.485 / rarity_boost,
-        "uncommon": 0.2 / rarity_boost,
-        "rare": 0.15 * rarity_boost,
-        "epic": 0.1 * rarity_boost,
-        "legendary": 0.05 * rarity_boost,
-        "divine": 0.01 * rarity_boost,
-        "???": 0.005,
-    }
-
-    # Normalize probabilities to sum to 1
-    total_weight = sum(rarity_weights.values())
-    normalized_weights = {key: value / total_weight for key, value in rarity_weights.items()}
-
-    # Filter available rarities that exist in normalized weights
-    valid_rarities = [r for r in available_rarities if r in normalized_weights]
-
-    # Check if valid rarities list is not empty
-    if not valid_rarities:
-        return "common"
-    
-    # Select a rarity with adjusted probabilities
-    return random.choices(
-        valid_rarities, 
-        weights=[normalized_weights[r] for r in valid_rarities]
-    )[0]
-
-def get_rarity_data():
-    """Return multipliers and color coding for each rarity."""
-    multipliers = {
+# Poids de base de chaque rareté, ajustés par rarity_boost
+RARITY_WEIGHTS = MappingProxyType({
+    "common": (0.485, -1),   # (poids, exposant de rarity_boost)
+    "uncommon": (0.2, -1),
+    "rare": (0.15, 1),
+    "epic": (0.1, 1),
+    "legendary": (0.05, 1),
+    "divine": (0.01, 1),
+    "???": (0.005, 0),
+})
+
+# Registre figé des raretés (créé une seule fois, partagé par tous les objets générés)
+RARITY_DATA = MappingProxyType({
+    "multipliers": MappingProxyType({
         "common": 1,
         "uncommon": 1.5,
         "rare": 2,
@@ -708,9 +690,8 @@ def get_rarity_data():
         "legendary": 5,
         "divine": 10,
         "???": 100
-    }
-    
-    colors = {
+    }),
+    "colors": MappingProxyType({
         "common": Colors.WHITE,
         "uncommon": Colors.GREEN,
         "rare": Colors.BLUE,
@@ -718,23 +699,71 @@ def get_rarity_data():
         "legendary": Colors.YELLOW,
         "divine": Colors.rainbow_text,
         "???": lambda text: Colors.gradient_text(text, (0, 0, 0), (255, 0, 0))
-    }
-    
-    prefixes = {
-        "common": ["Common", "Basic", "Standard", "Ordinary", "Usual", "Normal"],
-        "uncommon": ["Uncommon", "Sharp", "Sturdy", "Reliable", "Balanced"],
-        "rare": ["Rare", "Advanced", "Superior"],
-        "epic": ["Epic", "Exceptional", "Impressive", "Masterwork"],
-        "legendary": ["Legendary", "Ancient", "Mythical", "Enchanted"],
-        "divine": ["Divine", "Holy", "Sacred", "Blessed", "Miraculous", "Supernatural", "Celestial"],
-        "???": ["Unknown"]
-    }
-    
-    return {
-        "multipliers": multipliers,
-        "colors": colors,
-        "prefixes": prefixes
-    }
+    }),
+    "prefixes": MappingProxyType({
+        "common": ("Common", "Basic", "Standard", "Ordinary", "Usual", "Normal"),
+        "uncommon": ("Uncommon", "Sharp", "Sturdy", "Reliable", "Balanced"),
+        "rare": ("Rare", "Advanced", "Superior"),
+        "epic": ("Epic", "Exceptional", "Impressive", "Masterwork"),
+        "legendary": ("Legendary", "Ancient", "Mythical", "Enchanted"),
+        "divine": ("Divine", "Holy", "Sacred", "Blessed", "Miraculous", "Supernatural", "Celestial"),
+        "???": ("Unknown",)
+    }),
+})
+
+
+class RaritySampler:
+    """
+    Tire une rareté parmi available_rarities en O(1) avec une table d'alias (méthode de Vose).
+    Mêmes probabilités que l'ancien random.choices sur les poids normalisés.
+    """
+    __slots__ = ("rarities", "prob", "alias")
+
+    def __init__(self, available_rarities, rarity_boost):
+        self.rarities = tuple(r for r in available_rarities if r in RARITY_WEIGHTS)
+        weights = [RARITY_WEIGHTS[r][0] * rarity_boost ** RARITY_WEIGHTS[r][1] for r in self.rarities]
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, w in enumerate(scaled) if w < 1]
+        large = [i for i, w in enumerate(scaled) if w >= 1]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+
+    def sample(self, rng=random) -> str:
+        if not self.rarities:
+            return "common"
+        u = rng.random() * len(self.rarities)
+        i = int(u)
+        return self.rarities[i] if u - i < self.prob[i] else self.rarities[self.alias[i]]
+
+
+_rarity_samplers: dict[tuple, RaritySampler] = {}
+
+def get_rarity_sampler(available_rarities, rarity_boost) -> RaritySampler:
+    """Table d'alias mise en cache par (available_rarities, rarity_boost)."""
+    key = (tuple(available_rarities), rarity_boost)
+    sampler = _rarity_samplers.get(key)
+    if sampler is None:
+        sampler = _rarity_samplers[key] = RaritySampler(*key)
+    return sampler
+
+def calculate_rarity(available_rarities, rarity_boost, rarity=None, rng=random):
+    """Calculate item rarity based on available rarities and boost factor."""
+    if rarity:
+        return rarity
+    return get_rarity_sampler(available_rarities, rarity_boost).sample(rng)
+
+def get_rarity_data():
+    """Return multipliers and color coding for each rarity (read-only, shared)."""
+    return RARITY_DATA
 
 def get_enemy_set_info(enemy_type):
     """Get armor and weapon set info for a specific enemy type."""
@@ -850,7 +879,7 @@ def create_accessory(level, rarity, prefix, item_type, value_base, rarity_data):
 # D‌u​n‍g​e​o​n​ ‌H​u​n‌t‍e​r​ ‌-​ ‌(c)‌ ‌D​rag‍o​n​d‌e‍f​e‍r ​2‍02​5
 # L‍i‍c​en​s​e‍d​ ‌u‌n‍d‍e‌r‌ ‌C​C-​BY-​N​C ​4​.0
 
-def create_potion(level, rarity, prefix, item_name, value_base, rarity_data):
+def create_potion(level, rarity, prefix, item_name, value_base, rarity_data, rng=random):
     """Create a potion item."""
     multipliers = rarity_data["multipliers"]
     colors = rarity_data["colors"]
@@ -864,7 +893,7 @@ def create_potion(level, rarity, prefix, item_name, value_base, rarity_data):
         "Dragon's Breath Potion": {"effect_type": "fire_resistance",   "effect_value": int(2 * multipliers[rarity])}
     }
     
-    potion_name = item_name if item_name in potion_types else random.choice(list(potion_types.keys()))
+    potion_name = item_name if item_name in potion_types else rng.choice(list(potion_types.keys()))
     potion = potion_types[potion_name]
     
     name = f"{prefix} {potion_name}"
@@ -911,8 +940,7 @@ def generate_items_and_resources(player: Player, include_resources: bool = False
     result = []
     
     # Generate items
-    for _ in range(num_items):
-        result.append(generate_random_item(player=player, **kwargs))
+    result.extend(generate_random_items(player, num_items, **kwargs))
     
     # Generate resources if requested
     if include_resources:
@@ -922,13 +950,19 @@ def generate_items_and_resources(player: Player, include_resources: bool = False
     return result
 
 
-def generate_random_item(player:Player, enemy=None, item_type=None, rarity=None, item_name=None, rarity_boost=None, available_rarities=None, level_boost=0, enemy_type=None):
+def generate_random_item(player:Player, enemy=None, item_type=None, rarity=None, item_name=None, rarity_boost=None, available_rarities=None, level_boost=0, enemy_type=None, rng=None):
     """Generate a specific or random item with customizable attributes."""
+    return generate_random_items(player, 1, enemy, item_type, rarity, item_name, rarity_boost, available_rarities, level_boost, enemy_type, rng)[0]
+
+
+def generate_random_items(player:Player, n:int, enemy=None, item_type=None, rarity=None, item_name=None, rarity_boost=None, available_rarities=None, level_boost=0, enemy_type=None, rng=None) -> list:
+    """Generate n items with the same attributes as generate_random_item, the rarity tables are only looked up once."""
     global debug
     debug = 0
 
     level = (player.dungeon_level + level_boost)
     difficulty = player.difficulty
+    rng = rng or rng_for(player, LOOT)
     
     # Determine enemy type
     if not enemy_type and enemy:
@@ -943,26 +977,30 @@ def generate_random_item(player:Player, enemy=None, item_type=None, rarity=None,
     if available_rarities is None:
         available_rarities = get_available_rarities(player, difficulty, level, rarity)
 
-    # Calculate item rarity
-    rarity = calculate_rarity(available_rarities, rarity_boost, rarity)
-    
-    # Get rarity-related data (multipliers, colors, prefixes)
+    # Rarity sampler (alias table) and rarity-related data (multipliers, colors, prefixes)
+    sampler = None if rarity else get_rarity_sampler(available_rarities, rarity_boost)
     rarity_data = get_rarity_data()
     
+    # Get enemy-specific set info
+    enemy_set_info = get_enemy_set_info(enemy_type)
+
+    return [_create_random_item(level, rarity or sampler.sample(rng), rarity_data, enemy_set_info, enemy_type, item_type, item_name, rng) for _ in range(n)]
+
+
+def _create_random_item(level, rarity, rarity_data, enemy_set_info, enemy_type, item_type, item_name, rng):
+    """Create one item of the given rarity (see generate_random_items)."""
     # L​i​ce​n​s​e​d​ u​n​de​r​ ​C​C-​B​Y​-N​C​ ​4​.​0
     # Get a random prefix based on rarity
-    prefix = random.choice(rarity_data["prefixes"].get(rarity, [""]))
+    prefix = rng.choice(rarity_data["prefixes"].get(rarity, [""]))
     
-    # Get enemy-specific set info
-    enemy_set_info = get_enemy_set_info(enemy_type)
     armor_set_type = enemy_set_info["armor"]
     weapon_set_type = enemy_set_info["weapon"]
     
     # Determine item type if not specified
     if enemy_type:
-        item_type = random.choice(["armor", "weapon"])
+        item_type = rng.choice(["armor", "weapon"])
     elif item_type is None:
-        item_type = random.choice(["weapon", "armor", "potion", "ring", "amulet", "belt"])
+        item_type = rng.choice(["weapon", "armor", "potion", "ring", "amulet", "belt"])
     
     # Base value scaling with level and rarity
     value_base = int(50 * level * rarity_data["multipliers"][rarity])
@@ -976,20 +1014,20 @@ def generate_random_item(player:Player, enemy=None, item_type=None, rarity=None,
             from data import weapon_special_attacks
             special_attacks = weapon_special_attacks.get(weapon_type, None)
         else:
-            weapon_type = item_name if item_name in weapon_types else random.choice(weapon_types)
+            weapon_type = item_name if item_name in weapon_types else rng.choice(weapon_types)
             special_attacks = None
         return create_weapon(level, rarity, prefix, weapon_type, value_base, rarity_data, special_attacks=special_attacks)
         
     elif item_type == "armor":
         armor_types = ["Helmet", "Chestplate", "Gauntlets", "Leggings", "Boots", "Shield"]
-        armor_type = item_name if item_name in armor_types else random.choice(armor_types)
+        armor_type = item_name if item_name in armor_types else rng.choice(armor_types)
         return create_armor(level, rarity, prefix, armor_type, value_base, rarity_data, armor_set_type)
         
     elif item_type in ["ring", "amulet", "belt"]:
         return create_accessory(level, rarity, prefix, item_type, value_base, rarity_data)
         
     elif item_type == "potion":
-        return create_potion(level, rarity, prefix, item_name, value_base, rarity_data)
+        return create_potion(level, rarity, prefix, item_name, value_base, rarity_data, rng)
         
     else:
         raise ValueError(f"Invalid item type: {item_type}")
@@ -9,6 +9,8 @@ project_root = abspath(dirname(__file__))
 if project_root not in sys_path:
     sys_path.insert(0, project_root)
 
+import startup_profile # Must stay the first import: times the startup phases (python main.py --profile-startup)
+
 __version__ = "856.0"
 __creation__ = "09-03-2025"
 
@@ -20,7 +22,8 @@ from engine.game_utility import (clear_screen, collect_feedback, maximize_termin
 from engine.logger import logger
 from core.entity import continue_game
 from core.story import display_title
-from engine.save_system import SaveManager
+from engine.save_system import SaveManager, restore_dungeon
+startup_profile.checkpoint("imports")
 
 
 # Note: You need to be at least beta tester to get the dev tools (as it can easley break everything and also spoil)
@@ -38,8 +41,10 @@ except Exception as e:
     debug_menu = lambda *args, **kwargs: None
 
 dev_mode = is_dev_mode()
+startup_profile.checkpoint("dev tools")
 
 maximize_terminal()
+startup_profile.checkpoint("terminal maximize")
 
 logger.info(f"dev_mode: {dev_mode}")
 debug = 0
@@ -64,19 +69,26 @@ try:
         logger.info("AI agent disabled because ai file not found.")
 except Exception as e:
     logger.warning(f"Error while trying to import AI agent: {e}")
+startup_profile.checkpoint("AI setup")
 
-def main(continue_game=False, loaded_player=None):
+def main(continue_game=False, loaded_player=None, loaded_dungeon=None):
     """Main entry point for the game. Instantiates and runs DungeonMode."""
     from engine.gamemodes import DungeonMode
     
     clear_screen()
-    game_mode = DungeonMode(continue_game=continue_game, loaded_player=loaded_player, dev_mode=dev_mode, debug=debug)
+    game_mode = DungeonMode(continue_game=continue_game, loaded_player=loaded_player, dev_mode=dev_mode, debug=debug, loaded_dungeon=loaded_dungeon)
     game_mode.run()
 
 # Du​ng​e​o​n​ ​H​u​n​t​e​r​ ​-​ ​(​c​)​ ​Drag​o​nd​efer​ 2​025
 # Lic​e​ns​ed​ ​un​der​ ​C​C ​B​Y​-​N​C​ 4​.​0
 
 if __name__ == '__main__':
+    import sys
+    if startup_profile.requested(sys.argv):
+        SaveManager().list_saves()
+        startup_profile.checkpoint("save listing")
+        sys.exit(startup_profile.report(sys.argv[1:]))
+
     input()
     player = None
     def main_menu():
@@ -211,7 +223,8 @@ if __name__ == '__main__':
                                             from core.entity import Player
                                             player = Player.from_dict(save_data['player_data'])
                                             if player:
-                                                main(continue_game=True, loaded_player=player)
+                                                dungeon = restore_dungeon(save_data, player)
+                                                main(continue_game=True, loaded_player=player, loaded_dungeon=dungeon)
                                             else:
                                                 print(f"{Colors.RED}Failed to load save.{Colors.RESET}")
                                                 time.sleep(2)
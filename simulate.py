@@ -0,0 +1,396 @@
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+"""
+Monte-Carlo balance runner.
+
+Plays N automatic runs per difficulty with the real generation and combat rules
+(engine.dungeon.generate_dungeon + engine.combat.resolve_combat) over a
+multiprocessing pool and writes survival curves, gold/XP per dungeon level and
+death room histograms in the same shape as analytics/global_stats.json.
+
+Usage:
+    python simulate.py --runs 10000 --max-level 10 --workers 16
+    python simulate.py --difficulties normal realistic --out analytics/simulation_stats.json
+    python simulate.py --duels 20000    # 1 vs 1 win rates per level (engine.combat_kernel)
+    python simulate.py --duels 2000 --validate    # kernel vs resolve_combat on the same duels
+
+The automatic player attacks every turn, drinks a healing potion under 30% HP
+(engine.combat.basic_policy) and equips loot into free slots. Shops, puzzles
+and inter-level rooms are skipped.
+"""
+
+from sys import path as sys_path
+from os.path import abspath, dirname
+
+project_root = abspath(dirname(__file__))
+if project_root not in sys_path:
+    sys_path.insert(0, project_root)
+
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import config
+from interface.colors import Colors
+from engine.logger import logger
+from engine.difficulty import (NormalDifficulty, HardcoreDifficulty, SoulsDifficulty,
+                               RealisticDifficulty, PuzzleDifficulty)
+from engine.combat import resolve_combat, basic_policy, ATTACK
+from engine.combat_kernel import level_sweep, resolve_duels, PlayerArrays, EnemyArrays
+from engine.dungeon import Room, generate_dungeon
+from engine.rng import rng_for, GENERATION
+from core.entity import Player, generate_enemies
+from items.items import Weapon, Armor, Ring, Amulet, Belt
+
+
+# name -> (class, label used in global_stats.json)
+DIFFICULTIES = {
+    "normal": (NormalDifficulty, "Normal"),
+    "hardcore": (HardcoreDifficulty, "Hardcore"),
+    "soul_enjoyer": (SoulsDifficulty, "SoulsEnjoyer"),
+    "realistic": (RealisticDifficulty, "Realistic"),
+    "puzzle": (PuzzleDifficulty, "Puzzle"),
+}
+
+# Same mapping as Player.equip_item
+ARMOR_SLOTS = {"Helmet": "helmet", "Chestplate": "chest", "Gauntlets": "gauntlets",
+               "Leggings": "leggings", "Boots": "boots", "Shield": "shield"}
+
+HISTOGRAM_ROOMS = 16 # Same buckets as deathsByRoomPerDifficulty, more are added if needed
+
+# --validate: largest accepted gap between the kernel and resolve_combat on the same duels
+WIN_RATE_TOLERANCE = 0.03  # absolute, on the win rate
+MEAN_TOLERANCE = 0.05      # relative, on the average turns / damage dealt / damage taken
+MEAN_FLOOR = 1.0           # averages under this are compared in absolute (a 0.2 vs 0.3 damage gap is noise)
+
+
+def _init_worker():
+    """Silences the game in the worker processes: no output, no waiting, only warnings in the logs."""
+    # File descriptor 1 itself: engine.game_utility writes through the stdout it imported from sys
+    sys.stdout.flush()
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    sys.stdout = open(os.devnull, "w")
+    config.set_game_speed_multiplier(0)
+    logger.setLevel(logging.WARNING)
+
+
+def _new_player(difficulty_name: str, seed: int) -> Player:
+    player = Player("Simulated", seed=seed)
+    player.difficulty = DIFFICULTIES[difficulty_name][0]()
+    player.tutorial_completed = True
+    for room_type in ("combat", "treasure", "shop", "puzzle", "rest", "boss"):
+        player.tutorial_rooms_shown[f"{room_type}_tutorial"] = True
+    return player
+
+
+def _free_slot(player: Player, item) -> str | None:
+    if isinstance(item, Weapon):
+        if not player.equipment.main_hand:
+            return "main_hand"
+        return None if player.equipment.off_hand else "off_hand"
+    if isinstance(item, (Ring, Amulet, Belt)):
+        slot = item.__class__.__name__.lower()
+    elif isinstance(item, Armor):
+        slot = ARMOR_SLOTS.get(item.armor_type)
+    else:
+        return None
+    return slot if slot in player.equipment.slots and not player.equipment.slots[slot] else None
+
+
+def _auto_equip(player: Player):
+    """Equips inventory items into empty slots only, so equip_item never asks anything."""
+    for item in list(player.inventory):
+        if _free_slot(player, item):
+            player.equip_item(item)
+
+
+def _play_room(room: Room, player: Player) -> int:
+    """Plays one room without any input. Returns the XP gained in the room."""
+    if room.trap and not room.trap["triggered"]:
+        room.trigger_trap(player)
+        if not player.is_alive():
+            return 0
+
+    if room.room_type in ("combat", "boss"):
+        player.combat_encounters += 1
+        outcome = resolve_combat(player, room.enemies, basic_policy, is_boss_room=room.room_type == "boss")
+        if outcome.drops:
+            _auto_equip(player)
+        return outcome.xp_gained
+
+    if room.room_type == "treasure":
+        player.treasures_found += 1
+        player.inventory.extend(item for item in room.items if item)
+        room.items.clear()
+        _auto_equip(player)
+
+    elif room.room_type == "rest":
+        player.rest_rooms_visited += 1
+        rng = rng_for(player, GENERATION)
+        player.heal(int(player.stats.max_hp * rng.uniform(0.3, 0.5)))
+        player.rest_stamina(int(player.stats.max_stamina * rng.uniform(0.2, 0.6)))
+        player.regen_mana(int(player.stats.max_mana * rng.uniform(0.2, 0.4)))
+
+    return 0
+
+
+def simulate_run(difficulty_name: str, max_level: int, seed: int) -> dict:
+    """Plays one full run, from dungeon level 1 to max_level or death."""
+    random.seed(seed) # For the code paths that do not use the run RNG yet
+    player = _new_player(difficulty_name, seed)
+    levels = []
+
+    for dungeon_level in range(1, max_level + 1):
+        player.dungeon_level = dungeon_level
+        player.current_room_number = 0
+        gold_before = player.gold
+        xp_gained = 0
+
+        for plan in generate_dungeon(player=player):
+            xp_gained += _play_room(plan.materialize(player), player)
+            if not player.is_alive():
+                levels.append({"gold": player.gold - gold_before, "xp": xp_gained})
+                return {
+                    "difficulty": difficulty_name,
+                    "survived": False,
+                    "death_level": dungeon_level,
+                    "death_room": player.current_room_number,
+                    "player_level": player.level,
+                    "levels": levels,
+                }
+            player.current_room_number += 1
+            player.total_rooms_explored += 1
+
+        # Same reward as DungeonMode when a level is cleared
+        level_reward = (dungeon_level + 1) * 50
+        player.heal(player.stats.max_hp // 4)
+        player.rest_stamina(100)
+        player.regen_mana(25)
+        player.gold += level_reward
+        player.gain_xp(level_reward, silent=True)
+        xp_gained += level_reward
+        levels.append({"gold": player.gold - gold_before, "xp": xp_gained})
+
+    return {
+        "difficulty": difficulty_name,
+        "survived": True,
+        "death_level": None,
+        "death_room": None,
+        "player_level": player.level,
+        "levels": levels,
+    }
+
+
+def duel_sweep(difficulty_names: list[str], max_level: int, duels: int, seed: int) -> dict:
+    """Win rates of a naked player of level N against the enemies of dungeon level N, without playing full runs."""
+    stats = {"duelsPerDifficulty": {}}
+    for name in difficulty_names:
+        players = {level: _duel_player(name, level, seed) for level in range(1, max_level + 1)}
+        report = level_sweep(players, range(1, max_level + 1), n=duels, seed=seed)
+        stats["duelsPerDifficulty"][DIFFICULTIES[name][1]] = {str(level): data for level, data in report.items()}
+    return stats
+
+
+def _duel_player(difficulty_name: str, level: int, seed: int) -> Player:
+    """Naked player of level level, as used by the duel sweep."""
+    player = _new_player(difficulty_name, seed)
+    for _ in range(level - 1):
+        player.level_up(silent=True)
+    return player
+
+
+def _attack_policy(player, enemy, outcome):
+    """Attack-only policy, the one modelled by engine.combat_kernel."""
+    return (ATTACK,)
+
+
+def validate_duels(difficulty_names: list[str], max_level: int, duels: int, seed: int) -> dict:
+    """
+    Plays the same duels (same player, same seeded enemies) with engine.combat_kernel and with
+    engine.combat.resolve_combat, and compares win rate, turns and damage within the tolerances above.
+    {label: {level: {"kernel": {...}, "engine": {...}, "ok": bool}}}
+    """
+    config.set_game_speed_multiplier(0)
+    report = {}
+    for name in difficulty_names:
+        levels = {}
+        for level in range(1, max_level + 1):
+            player = _duel_player(name, level, seed)
+            player.achievements = []  # nothing to unlock during the check
+            enemies = generate_enemies(level, duels, False, player, random.Random(seed))
+
+            kernel = resolve_duels(PlayerArrays.from_player(player, duels), EnemyArrays.from_enemies(enemies), seed=seed)
+            kernel_means = {
+                "winRate": kernel.win_rate,
+                "avgTurns": float(kernel.turns.mean()),
+                "avgDamageDealt": float(kernel.damage_dealt.mean()),
+                "avgDamageTaken": float(kernel.damage_taken.mean()),
+            }
+
+            # Each duel starts from the same player (save round trip), the kernel already copied the enemies
+            snapshot = player.to_dict()
+            rng = random.Random(seed)
+            wins = turns = dealt = taken = 0
+            for enemy in enemies:
+                fighter = Player.from_dict(snapshot)
+                fighter.achievements = []
+                outcome = resolve_combat(fighter, [enemy], _attack_policy, drops=False, max_turns=1000, rng=rng)
+                wins += outcome.result == "victory"
+                turns += outcome.turns
+                dealt += outcome.damage_dealt
+                taken += outcome.damage_taken
+            engine_means = {"winRate": wins / duels, "avgTurns": turns / duels,
+                            "avgDamageDealt": dealt / duels, "avgDamageTaken": taken / duels}
+
+            gaps = {}
+            for key, value in engine_means.items():
+                gap = abs(kernel_means[key] - value)
+                if key == "winRate":
+                    gaps[key] = gap <= WIN_RATE_TOLERANCE
+                else:
+                    gaps[key] = gap <= max(MEAN_FLOOR, MEAN_TOLERANCE * abs(value))
+            levels[str(level)] = {
+                "kernel": {key: round(value, 4) for key, value in kernel_means.items()},
+                "engine": {key: round(value, 4) for key, value in engine_means.items()},
+                "ok": all(gaps.values()),
+                "failed": [key for key, ok in gaps.items() if not ok],
+            }
+        report[DIFFICULTIES[name][1]] = levels
+    return report
+
+
+def _run_task(task):
+    return simulate_run(*task)
+
+
+def aggregate(results: list[dict], difficulty_names: list[str], max_level: int) -> dict:
+    """Builds the report: survival curve, average gold/XP per level and deaths by room."""
+    stats = {
+        "overview": {},
+        "survivalCurvePerDifficulty": {},
+        "goldPerLevelPerDifficulty": {},
+        "xpPerLevelPerDifficulty": {},
+        "deathsByRoomPerDifficulty": {},
+    }
+
+    for name in difficulty_names:
+        label = DIFFICULTIES[name][1]
+        runs = [r for r in results if r["difficulty"] == name]
+        total = len(runs) or 1
+
+        deaths_by_room = {str(i): 0 for i in range(1, HISTOGRAM_ROOMS + 1)}
+        deaths_at_level = [0] * (max_level + 1)
+        gold_sum = [0] * (max_level + 1)
+        xp_sum = [0] * (max_level + 1)
+        reached = [0] * (max_level + 1)
+
+        for run in runs:
+            if not run["survived"]:
+                room_key = str(run["death_room"])
+                deaths_by_room[room_key] = deaths_by_room.get(room_key, 0) + 1
+                deaths_at_level[run["death_level"]] += 1
+            for level, data in enumerate(run["levels"], 1):
+                reached[level] += 1
+                gold_sum[level] += data["gold"]
+                xp_sum[level] += data["xp"]
+
+        # Part of the runs still alive at the start of each level
+        alive = len(runs)
+        survival = {}
+        for level in range(1, max_level + 1):
+            survival[str(level)] = round(alive / total, 4)
+            alive -= deaths_at_level[level]
+        survival["cleared"] = round(alive / total, 4)
+
+        stats["overview"][label] = {
+            "runs": len(runs),
+            "survivalRate": round(100 * alive / total, 2),
+            "avgPlayerLevel": round(sum(r["player_level"] for r in runs) / total, 2),
+        }
+        stats["survivalCurvePerDifficulty"][label] = survival
+        stats["goldPerLevelPerDifficulty"][label] = {str(l): round(gold_sum[l] / reached[l], 2) for l in range(1, max_level + 1) if reached[l]}
+        stats["xpPerLevelPerDifficulty"][label] = {str(l): round(xp_sum[l] / reached[l], 2) for l in range(1, max_level + 1) if reached[l]}
+        stats["deathsByRoomPerDifficulty"][label] = deaths_by_room
+
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dungeon Hunter Monte-Carlo balance runner")
+    parser.add_argument("--runs", type=int, default=1000, help="runs per difficulty")
+    parser.add_argument("--max-level", type=int, default=10, help="last dungeon level of a run")
+    parser.add_argument("--difficulties", nargs="+", choices=list(DIFFICULTIES), default=list(DIFFICULTIES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0, help="base seed, run i uses seed + i (same seed, same run)")
+    parser.add_argument("--out", default="analytics/simulation_stats.json")
+    parser.add_argument("--duels", type=int, default=0, help="vectorized 1 vs 1 duels per level instead of full runs")
+    parser.add_argument("--validate", action="store_true",
+                        help="with --duels: check the kernel against resolve_combat on the same duels (exit code 1 on a gap)")
+    args = parser.parse_args(argv)
+
+    if args.duels and args.validate:
+        start = time.perf_counter()
+        report = validate_duels(args.difficulties, args.max_level, args.duels, args.seed)
+        elapsed = time.perf_counter() - start
+        failures = 0
+        for label, levels in report.items():
+            for level, data in levels.items():
+                kernel, engine = data["kernel"], data["engine"]
+                color = Colors.GREEN if data["ok"] else Colors.RED
+                failures += not data["ok"]
+                print(f"{color}{label:<13} level {level:>2}{Colors.RESET}  "
+                      f"win {kernel['winRate']:.3f}/{engine['winRate']:.3f}  "
+                      f"turns {kernel['avgTurns']:.2f}/{engine['avgTurns']:.2f}  "
+                      f"dealt {kernel['avgDamageDealt']:.1f}/{engine['avgDamageDealt']:.1f}  "
+                      f"taken {kernel['avgDamageTaken']:.1f}/{engine['avgDamageTaken']:.1f}"
+                      + (f"  {Colors.RED}{', '.join(data['failed'])}{Colors.RESET}" if data["failed"] else ""))
+        print(f"{Colors.GREEN if not failures else Colors.RED}kernel/engine: {failures} level(s) out of tolerance "
+              f"(win rate ±{WIN_RATE_TOLERANCE}, means ±{MEAN_TOLERANCE:.0%}) in {elapsed:.1f}s{Colors.RESET}")
+        return 1 if failures else 0
+
+    if args.duels:
+        start = time.perf_counter()
+        stats = duel_sweep(args.difficulties, args.max_level, args.duels, args.seed)
+        elapsed = time.perf_counter() - start
+        os.makedirs(dirname(abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+        print(f"{Colors.GREEN}{args.duels} duels per level in {elapsed:.2f}s -> {args.out}{Colors.RESET}")
+        for label, report in stats["duelsPerDifficulty"].items():
+            rates = " ".join(f"{data['winRate']:.2f}" for data in report.values())
+            print(f"{Colors.CYAN}{label:<13}{Colors.RESET} win rate by level {rates}")
+        return
+
+    tasks = [(name, args.max_level, args.seed + i)
+             for name in args.difficulties
+             for i in range(args.runs)]
+
+    start = time.perf_counter()
+    chunksize = max(1, len(tasks) // (args.workers * 8))
+    with multiprocessing.Pool(args.workers, initializer=_init_worker) as pool:
+        results = list(pool.imap_unordered(_run_task, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    stats = aggregate(results, args.difficulties, args.max_level)
+    os.makedirs(dirname(abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+
+    print(f"{Colors.GREEN}{len(tasks)} runs in {elapsed:.1f}s ({args.workers} workers) -> {args.out}{Colors.RESET}")
+    for label, overview in stats["overview"].items():
+        print(f"{Colors.CYAN}{label:<13}{Colors.RESET} survival {overview['survivalRate']:>6}%  avg level {overview['avgPlayerLevel']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
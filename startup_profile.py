@@ -0,0 +1,133 @@
+# Dungeon Hunter - (c) Dragondefer 2025
+# Licensed under CC BY-NC 4.0
+
+"""
+Startup profiling: python main.py --profile-startup
+
+main.py imports this module first (standard library only) and calls
+checkpoint() after each init phase. With --profile-startup the game stops
+right before the first prompt and writes a JSON report:
+
+    phases          time of each init phase of main.py (imports, terminal maximize, save listing...)
+    importPhases    import cost of the heavy packages (data build, logger setup, config/AI probe)
+    modules         slowest modules from `python -X importtime`
+    timeToFirstPromptMs
+
+Options (after --profile-startup):
+    --out PATH          report file (default analytics/startup_profile.json)
+    --baseline PATH     baseline to compare with (default analytics/startup_baseline.json)
+    --tolerance 0.2     allowed regression (20%) before failing (exit code 1)
+                        a missing baseline fails too (exit code 2): the check would prove nothing
+    --update-baseline   store this run as the new baseline
+"""
+
+__version__ = "1.0"
+__creation__ = "18-10-2026"
+
+import time
+
+START = time.perf_counter()
+_last = START
+phases: dict[str, float] = {}
+
+# Packages built at import time, reported with their cumulative import cost
+IMPORT_PHASES = {
+    "data build": "data",
+    "logger setup": "engine.logger",
+    "config/AI probe": "config",
+    "entities": "core.entity",
+    "save system": "engine.save_system",
+}
+
+
+def checkpoint(name: str):
+    """Records the time spent since the previous checkpoint (or the start) under name."""
+    global _last
+    now = time.perf_counter()
+    phases[name] = phases.get(name, 0) + (now - _last) * 1000
+    _last = now
+
+
+def requested(argv: list[str]) -> bool:
+    return "--profile-startup" in argv
+
+
+def _parse_args(argv: list[str]):
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py --profile-startup")
+    parser.add_argument("--profile-startup", action="store_true")
+    parser.add_argument("--out", default="analytics/startup_profile.json")
+    parser.add_argument("--baseline", default="analytics/startup_baseline.json")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--top", type=int, default=25)
+    return parser.parse_args(argv)
+
+
+def build_report(top: int = 25) -> dict:
+    from check_imports import measure_imports
+
+    timings = measure_imports()
+    cumulative = {name: cumulative_us / 1000 for name, _, cumulative_us in timings}
+    slowest = sorted(timings, key=lambda t: t[1], reverse=True)[:top]
+
+    return {
+        "timeToFirstPromptMs": round((_last - START) * 1000, 2),
+        "phases": {name: round(ms, 2) for name, ms in phases.items()},
+        "importTotalMs": round(sum(self_us for _, self_us, _ in timings) / 1000, 2),
+        "importPhases": {phase: round(cumulative[module], 2) for phase, module in IMPORT_PHASES.items() if module in cumulative},
+        "modules": [{"module": name, "selfMs": round(self_us / 1000, 2), "cumulativeMs": round(cumulative_us / 1000, 2)}
+                    for name, self_us, cumulative_us in slowest],
+        "moduleCount": len(timings),
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of the totals and phases compared to the baseline (empty list = ok)."""
+    regressions = []
+    checks = [("timeToFirstPromptMs", report["timeToFirstPromptMs"], baseline.get("timeToFirstPromptMs")),
+              ("importTotalMs", report["importTotalMs"], baseline.get("importTotalMs"))]
+    checks += [(f"phases.{name}", ms, baseline.get("phases", {}).get(name)) for name, ms in report["phases"].items()]
+
+    for name, value, reference in checks:
+        # Phases under a few ms are too noisy to compare
+        if reference is not None and reference >= 5 and value > reference * (1 + tolerance):
+            regressions.append(f"{name}: {value:.1f} ms (baseline {reference:.1f} ms, +{(value / reference - 1) * 100:.0f}%)")
+    return regressions
+
+
+def report(argv: list[str]) -> int:
+    """Writes the report and compares it with the baseline. Returns the exit code."""
+    import json
+    import os
+
+    args = _parse_args(argv)
+    data = build_report(args.top)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+    print(f"Time to first prompt: {data['timeToFirstPromptMs']:.1f} ms (imports {data['importTotalMs']:.1f} ms, {data['moduleCount']} modules)")
+    for name, ms in data["phases"].items():
+        print(f"  {ms:>8.1f} ms  {name}")
+    print(f"Report written to {args.out}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline found ({args.baseline}), run with --update-baseline to create it.")
+        return 2
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(data, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regression over the baseline (tolerance {args.tolerance:.0%}).")
+    return 1 if regressions else 0